@@ -1,3 +1,7 @@
+from array import array
+from bisect import bisect_left
+from itertools import chain
+
 class AdjacencyList:
     " Creates an adjacency list of all the intersections of the maze"
     def __init__(self):
@@ -47,4 +51,164 @@ class AdjacencyList:
         from_vertex = self.coord_to_verNum[_from]
         to_vertex = self.coord_to_verNum[_to]
         self.graph[from_vertex].append((to_vertex,_weight))
-        self.graph[to_vertex].append((from_vertex, _weight)) # done to make undirected graph
\ No newline at end of file
+        self.graph[to_vertex].append((from_vertex, _weight)) # done to make undirected graph
+
+    def finalize(self, cols: int) -> "CSRGraph":
+        '''
+        Packs the graph into a read-only `CSRGraph` for a maze `cols` wide. The solvers' graph is built packed
+        (`MazeGrid.build_corridor_graph`); this packs graphs built edge by edge, like the benchmarks' corridor walk.
+        Vertices are renumbered in flat cell order (row * cols + col) and repeated edges between two vertices
+        (every corridor is walked from both ends) collapse into one edge per direction with the shortest weight
+        '''
+        order = sorted(self.graph, key=self.verNum_to_coord.get) # (row, col) order == flat cell order
+        new_ids = {old_id: new_id for new_id, old_id in enumerate(order)}
+
+        offsets = array('I', [0])
+        targets = array('I')
+        weights = array('I')
+        steps = array('i')
+
+        cell_of = {vertex: row * cols + col for vertex, (row, col) in self.verNum_to_coord.items()}
+
+        for old_id in order:
+            vertex = new_ids[old_id]
+            shortest = {}
+
+            for connection, distance in self.graph[old_id]:
+                neighbor = new_ids[connection]
+                if neighbor != vertex and distance < shortest.get(neighbor, distance + 1):
+                    shortest[neighbor] = distance
+
+            for neighbor in sorted(shortest):
+                targets.append(neighbor)
+                weights.append(shortest[neighbor])
+                # Neighbors share a row or a column: the corridor runs along whichever it is
+                cell, neighbor_cell = cell_of[old_id], cell_of[order[neighbor]]
+                step = 1 if cell // cols == neighbor_cell // cols else cols
+                steps.append(step if neighbor_cell > cell else -step)
+            offsets.append(len(targets))
+
+        vertex_cells = array('I', map(cell_of.get, order))
+
+        return CSRGraph(offsets, targets, weights, steps, vertex_cells)
+
+class CSRGraph:
+    " Read-only corridor graph in compressed sparse row form, built by `MazeGrid.build_corridor_graph`"
+    def __init__(self, offsets: array, targets: array, weights: array, steps: array, vertex_cells: array):
+        '''
+        the edges of vertex v are targets[offsets[v]:offsets[v + 1]] with lengths weights[offsets[v]:offsets[v + 1]]
+        vertex_cells[v] is the flat cell index (row * cols + col) of vertex v; it is sorted, so looking a cell up
+        is a binary search and no coordinate dictionaries are kept.
+        Every edge is a straight corridor: steps[e] is the cell index offset of one step along it (+-1 along a row,
+        +-cols along a column), so its cells are the next weights[e] steps from its vertex's cell (see `spans`).
+        Memory is fixed at 8 bytes per vertex (offset + cell) and 12 bytes per directed edge (target + weight + step)
+        '''
+        self.offsets = offsets
+        self.targets = targets
+        self.weights = weights
+        self.steps = steps
+        self.vertex_cells = vertex_cells
+
+    def get_vertices(self):
+        """returns number of vertices"""
+        return len(self.vertex_cells)
+
+    def get_edges(self):
+        """returns number of undirected edges"""
+        return len(self.targets) // 2
+
+    def vertex_at(self, cell: int) -> int|None:
+        '''
+        Vertex number of the flat cell index `cell`, or None if that cell is not a graph point
+        '''
+        vertex = bisect_left(self.vertex_cells, cell)
+
+        if vertex < len(self.vertex_cells) and self.vertex_cells[vertex] == cell:
+            return vertex
+        return None
+
+    def nbytes(self):
+        """returns the bytes held by the CSR arrays"""
+        return sum(len(arr) * arr.itemsize for arr in (self.offsets, self.targets, self.weights, self.steps, self.vertex_cells))
+
+class SplicedGraph:
+    " A `CSRGraph` with temporary vertices and edges layered on top for one query; the packed graph is never modified"
+    def __init__(self, graph: CSRGraph):
+        '''
+        temporary vertices are numbered after the packed ones: vertex base_vertices + i lives at extra_cells[i].
+        extra_edges holds the temporary edges of both packed and temporary vertices, as (neighbor, distance) lists,
+        and extra_steps the step along each of them (like `CSRGraph.steps`) by (vertex, neighbor)
+        '''
+        self.graph = graph
+        self.base_vertices = graph.get_vertices()
+        self.extra_cells : list[int] = []
+        self.extra_edges : dict[int, list[tuple[int,int]]] = {}
+        self.extra_steps : dict[tuple[int,int], int] = {}
+
+    def get_vertices(self):
+        """returns number of vertices, temporary ones included"""
+        return self.base_vertices + len(self.extra_cells)
+
+    def add_vertex(self, cell: int) -> int:
+        '''
+        Adds a temporary vertex at the flat cell index `cell`, returning its vertex number
+        '''
+        self.extra_cells.append(cell)
+        return self.base_vertices + len(self.extra_cells) - 1
+
+    def add_connection(self, _from: int, _to: int, _weight: int, _step: int):
+        # The same corridor may be walked from both of its ends; keep one edge
+        if any(neighbor == _to for neighbor, _ in self.extra_edges.get(_from, ())):
+            return
+        self.extra_edges.setdefault(_from, []).append((_to, _weight))
+        self.extra_edges.setdefault(_to, []).append((_from, _weight)) # done to make undirected graph
+        self.extra_steps[(_from, _to)] = _step
+        self.extra_steps[(_to, _from)] = -_step
+
+    def vertex_at(self, cell: int) -> int|None:
+        '''
+        Vertex number of the flat cell index `cell`, or None if that cell is not a graph point
+        '''
+        vertex = self.graph.vertex_at(cell)
+
+        if vertex is None and cell in self.extra_cells:
+            vertex = self.base_vertices + self.extra_cells.index(cell)
+        return vertex
+
+    def cell(self, vertex: int) -> int:
+        """returns the flat cell index of `vertex`"""
+        if vertex < self.base_vertices:
+            return self.graph.vertex_cells[vertex]
+        return self.extra_cells[vertex - self.base_vertices]
+
+    def edges(self, vertex: int):
+        '''
+        Iterates the (neighbor, distance) pairs of `vertex`
+        '''
+        extra = self.extra_edges.get(vertex, ())
+
+        if vertex >= self.base_vertices:
+            return extra
+
+        first, last = self.graph.offsets[vertex], self.graph.offsets[vertex + 1]
+        packed = zip(self.graph.targets[first:last], self.graph.weights[first:last])
+
+        return chain(packed, extra) if extra else packed
+
+    def spans(self, vertex: int):
+        '''
+        Iterates the (neighbor, distance, step) triples of `vertex`: its edges with the step along their corridor,
+        which runs over the cells `vertex`'s cell + step * 1..distance
+        '''
+        extra = self.extra_edges.get(vertex)
+        if extra:
+            extra = [(neighbor, distance, self.extra_steps[(vertex, neighbor)]) for neighbor, distance in extra]
+
+        if vertex >= self.base_vertices:
+            return extra or ()
+
+        graph = self.graph
+        first, last = graph.offsets[vertex], graph.offsets[vertex + 1]
+        packed = zip(graph.targets[first:last], graph.weights[first:last], graph.steps[first:last])
+
+        return chain(packed, extra) if extra else packed
@@ -1,7 +1,10 @@
-from maze import Maze
-from block import BlockState
+from grid import MazeGrid, WALL, NEIGHBOR_RIGHT, NEIGHBOR_LEFT, NEIGHBOR_DOWN, NEIGHBOR_UP
+from landmarks import LandmarkIndex, heuristic as landmark_heuristic
+from search_stats import SearchStats
 from time import time
+from array import array
 import heapq
+import paths
 
 # A* Section
 def heuristic(source: tuple[int, int], goal: tuple[int, int]):
@@ -14,199 +17,750 @@ def heuristic(source: tuple[int, int], goal: tuple[int, int]):
 
     return (dx + dy)
 
-def grid_neighbors(grid: list[list], source: tuple[int, int]):
+# Largest g-score an `array('i')` can hold; marks cells that have not been reached yet
+UNREACHED = 2**31 - 1
+
+# Explored cells per batch yielded by the streaming solvers
+STREAM_BATCH = 4096
+
+def collect_stream(stream) -> tuple[array, array, float]:
+    '''
+    Runs a streaming solver (like `a_star_stream`) to the end and returns what the other solvers do:
+    (explored, final_path, solve_time)
     '''
-    Get the 4-directional neighbors of the given `source` node.
-    Returns (heuristic, (row, col))
+    explored = array('I')
+    while True:
+        try:
+            explored.extend(next(stream))
+        except StopIteration as done:
+            final_path, solve_time = done.value
+            return explored, final_path, solve_time
+
+def a_star(maze: MazeGrid, stats: SearchStats|None = None, corridors: bool = False):
+    '''
+    A* over flat cell indices (`row * cols + col`), see `a_star_stream`.
+    Fills `stats` if one is given.
+    Returns:
+        explored: array('I') of the cell indices popped, in order
+        final_path: array('I') of the cell indices in the shortest path, or its waypoints with `corridors` (see `paths`)
+        solve_time: time taken to solve
     '''
-    row, col = source[0], source[1]
+    return collect_stream(a_star_stream(maze, stats, corridors=corridors))
+
+def a_star_stream(maze: MazeGrid, stats: SearchStats|None = None, batch_size: int = STREAM_BATCH,
+                  corridors: bool = False):
+    '''
+    A* that yields the cell indices it pops, as `array('I')` batches of `batch_size`, while it searches, and returns
+    (final_path, solve_time) when done (the value of its StopIteration, as `yield from` hands it back). solve_time
+    only counts the search itself, not the time the caller spends between batches.
+    g-scores and parents live in preallocated arrays and each heap entry is a single int packing
+    `f_score * size + index`, so ties still break by (row, col) and the search loop builds no tuples or lists.
+    Fills `stats` if one is given
+    '''
+    solve_time = 0.0
+    resumed = time()
+
+    cells, rows, cols = maze.cells, maze.rows, maze.cols
+    size = rows * cols
+    end_row, end_col = maze.end_coord
+    start = maze.index(*maze.start_coord)
+    end = maze.index(end_row, end_col)
+
+    g_scores = array('i', [UNREACHED]) * size
+    parents = array('i', [-1]) * size
+    g_scores[start] = 0
+
+    # min heap of packed (f_score, index) entries
+    frontier = [heuristic(source=maze.start_coord, goal=maze.end_coord) * size + start]
+    explored = array('I')
+
+    endFound = False
+
+    heappush, heappop = heapq.heappush, heapq.heappop
 
-    above = (row-1, col)
-    below = (row+1, col)
-    left = (row, col-1)
-    right = (row, col+1)
+    # Counters; the frontier size is only watched when stats are collected
+    pops = stale = peak = 0
+    track = stats is not None
 
-    nbors = []
+    while frontier:
+        if track and len(frontier) > peak:
+            peak = len(frontier)
+
+        cur_f, cur = divmod(heappop(frontier), size)
+
+        # Add to the batch of explored blocks, handing it out once full
+        explored.append(cur)
+        if len(explored) == batch_size:
+            solve_time += time() - resumed
+            pops += batch_size
+            yield explored
+            explored = array('I')
+            resumed = time()
+
+        # First path to end will always be shortest; safe to break
+        if cur == end:
+            endFound = True
+            break
+
+        row, col = divmod(cur, cols)
+        row_h = abs(row - end_row)
+        col_h = abs(col - end_col)
+
+        # If this path is worse than the current best, skip it
+        n_g = g_scores[cur]
+        if cur_f > n_g + row_h + col_h:
+            stale += 1
+            continue
+        n_g += 1
+
+        # Relax neighbors: above, below, left, right (offsets -cols, +cols, -1, +1)
+        if row > 0:
+            neighbor = cur - cols
+            if cells[neighbor] != WALL and n_g < g_scores[neighbor]:
+                g_scores[neighbor] = n_g
+                parents[neighbor] = cur
+                heappush(frontier, (n_g + abs(row - 1 - end_row) + col_h) * size + neighbor)
+
+        if row < rows - 1:
+            neighbor = cur + cols
+            if cells[neighbor] != WALL and n_g < g_scores[neighbor]:
+                g_scores[neighbor] = n_g
+                parents[neighbor] = cur
+                heappush(frontier, (n_g + abs(row + 1 - end_row) + col_h) * size + neighbor)
+
+        if col > 0:
+            neighbor = cur - 1
+            if cells[neighbor] != WALL and n_g < g_scores[neighbor]:
+                g_scores[neighbor] = n_g
+                parents[neighbor] = cur
+                heappush(frontier, (n_g + row_h + abs(col - 1 - end_col)) * size + neighbor)
+
+        if col < cols - 1:
+            neighbor = cur + 1
+            if cells[neighbor] != WALL and n_g < g_scores[neighbor]:
+                g_scores[neighbor] = n_g
+                parents[neighbor] = cur
+                heappush(frontier, (n_g + row_h + abs(col + 1 - end_col)) * size + neighbor)
+
+    solve_time += time() - resumed
+    pops += len(explored)
+
+    if track:
+        stats.record_heap(seeds=1, pops=pops, stale=stale, queued=len(frontier), peak=peak)
+        stats.corridor_cells = stats.nodes_expanded
+        stats.search_time = solve_time
+
+    if explored:
+        yield explored
+
+    if not endFound:
+        return array('I'), solve_time
+
+    final_path = array('I', [end])
+
+    node = end
+    while parents[node] != -1:
+        node = parents[node]
+        final_path.append(node)
+    final_path.reverse()
 
-    if row > 0:
-        nbors.append(above)
-    if row < len(grid) - 1:
-        nbors.append(below)
-    if col > 0:
-        nbors.append(left)
-    if col < len(grid[0]) - 1:
-        nbors.append(right)
+    return paths.encode(final_path, cols) if corridors else final_path, solve_time
 
-    return nbors
+def a_star_landmarks(maze: MazeGrid, index: LandmarkIndex, stats: SearchStats|None = None, corridors: bool = False):
+    '''
+    A* over flat cell indices like `a_star`, guided by the landmark (ALT) heuristic of `index` instead of Manhattan
+    distance. Build the index once per maze with `landmarks.build_landmarks` (or load a saved one); it must match the
+    maze's walls. Fills `stats` if one is given and returns the same (explored, final_path, solve_time) triple as `a_star`
+    '''
+    if not index.matches(maze):
+        raise Exception("Landmark index was built for a different maze")
 
-def a_star(maze: Maze):
     start_time = time()
-    
-    maze_grid = maze.maze_array
-    start, end = maze.start_coord, maze.end_coord
 
-    # Dictionary initializer of format: `(coord.x, coord.y): -1`
-    g_scores = {(vertex.row, vertex.col): float('inf') for line in maze_grid for vertex in line}
-    g_scores[start] = 0
-    
-    # Start block parameters
-    start_h = heuristic(source=start, goal=end)
+    cells, rows, cols = maze.cells, maze.rows, maze.cols
+    size = rows * cols
+    start = maze.index(*maze.start_coord)
+    end = maze.index(*maze.end_coord)
+
+    bounds = index.goal_bounds(start, end)
 
-    # min heap for available routes, (f_score, grid indices)
-    frontier = [(start_h, start)]
+    g_scores = array('i', [UNREACHED]) * size
+    f_scores = array('i', [UNREACHED]) * size
+    parents = array('i', [-1]) * size
+    g_scores[start] = 0
+    f_scores[start] = landmark_heuristic(start, bounds)
 
-    predecessors = {}
-    explored = []
+    # min heap of packed (f_score, index) entries
+    frontier = [f_scores[start] * size + start]
+    explored = array('I')
 
     endFound = False
 
+    heappush, heappop = heapq.heappush, heapq.heappop
+
+    stale = peak = 0
+    track = stats is not None
+
     while frontier:
-        cur_f, cur_node = heapq.heappop(frontier)
+        if track and len(frontier) > peak:
+            peak = len(frontier)
+
+        cur_f, cur = divmod(heappop(frontier), size)
 
         # Add to the list of explored blocks
-        explored.append(cur_node)
+        explored.append(cur)
 
         # First path to end will always be shortest; safe to break
-        if cur_node == end:
+        if cur == end:
             endFound = True
             break
 
         # If this path is worse than the current best, skip it
-        prev_f = g_scores[cur_node] + heuristic(source=cur_node, goal=end)
-        if cur_f > prev_f:
+        if cur_f > f_scores[cur]:
+            stale += 1
             continue
+        n_g = g_scores[cur] + 1
 
-        # Relax neighbors
-        for neighbor in grid_neighbors(grid=maze_grid, source=cur_node):
-            n_row, n_col = neighbor
-            n_block = maze_grid[n_row][n_col]
-
-            if (n_block.state == BlockState.WALL): # Ignore walls
-                continue
-
-            n_g = g_scores[cur_node] + 1
-            if n_g < g_scores[neighbor]:
+        col = cur % cols
+        # Relax neighbors: above, below, left, right
+        for neighbor, inside in ((cur - cols, cur >= cols), (cur + cols, cur + cols < size),
+                                 (cur - 1, col > 0), (cur + 1, col < cols - 1)):
+            if inside and cells[neighbor] != WALL and n_g < g_scores[neighbor]:
                 g_scores[neighbor] = n_g
-                n_f = n_g + heuristic(source=neighbor,goal=end)
-                heapq.heappush(frontier, (n_f, neighbor))
-                predecessors[neighbor] = cur_node
-    
+                f_scores[neighbor] = n_f = n_g + landmark_heuristic(neighbor, bounds)
+                parents[neighbor] = cur
+                heappush(frontier, n_f * size + neighbor)
+
     solve_time = time() - start_time
 
+    if track:
+        stats.record_heap(seeds=1, pops=len(explored), stale=stale, queued=len(frontier), peak=peak)
+        stats.corridor_cells = stats.nodes_expanded
+        stats.search_time = solve_time
+
     if not endFound:
-        return explored, [], solve_time
-    
-    final_path = [end]
+        return explored, array('I'), solve_time
+
+    final_path = array('I', [end])
 
     node = end
-    while node in predecessors:
-        node = predecessors[node]
+    while parents[node] != -1:
+        node = parents[node]
         final_path.append(node)
-    
-    return explored, list(reversed(final_path)), solve_time
+    final_path.reverse()
 
-# Dijkstra section
-def expand_path(maze: Maze, node_a: tuple[int, int], node_b: tuple[int, int]) -> list[tuple[int, int]]:
-    """
-    Expands a straight corridor between two graph points into all intermediate coordinates
-    node_a, node_b are (row, col) tuples
-    """
-    expanded = [node_a]
-    r1, c1 = node_a
-    r2, c2 = node_b
-
-    dr = 0 if r1 == r2 else (1 if r2 > r1 else -1)
-    dc = 0 if c1 == c2 else (1 if c2 > c1 else -1)
-
-    r, c = r1, c1
-    while (r, c) != (r2, c2):
-        r += dr
-        c += dc
-        if maze.maze_array[r][c].state != BlockState.WALL:
-            expanded.append((r, c))
+    return explored, paths.encode(final_path, cols) if corridors else final_path, solve_time
+
+def a_star_bidirectional(maze: MazeGrid, stats: SearchStats|None = None, corridors: bool = False):
+    '''
+    Bidirectional A*: one search grows from the start and one from the end, always expanding the smaller frontier.
+    Both use the average potential (h_end(v) - h_start(v)) / 2 (doubled to stay in integers), which makes the two
+    heuristics consistent with each other. With it the search may stop as soon as the two frontier minimums add
+    up to at least twice the best meeting path found so far.
+    Fills `stats` if one is given and returns the same (explored, final_path, solve_time) triple as `a_star`;
+    explored holds both searches' pops in the order they happened
+    '''
+    start_time = time()
+
+    cells, rows, cols = maze.cells, maze.rows, maze.cols
+    size = rows * cols
+    start_row, start_col = maze.start_coord
+    end_row, end_col = maze.end_coord
+    start = maze.index(start_row, start_col)
+    end = maze.index(end_row, end_col)
+
+    if start == end:
+        return array('I', [start]), array('I', [start]), time() - start_time
+
+    g_forward = array('i', [UNREACHED]) * size
+    g_backward = array('i', [UNREACHED]) * size
+    parents_forward = array('i', [-1]) * size
+    parents_backward = array('i', [-1]) * size
+    g_forward[start] = 0
+    g_backward[end] = 0
+
+    # Heap entries pack (key, index) like `a_star`; keys may be negative, which divmod handles
+    start_h = heuristic(source=maze.start_coord, goal=maze.end_coord)
+    forward = [start_h * size + start]
+    backward = [start_h * size + end]
+
+    best = UNREACHED # Length of the shortest start -> end path seen so far
+    meet_forward = meet_backward = -1 # Path is start ~> meet_forward -> meet_backward ~> end
+
+    explored = array('I')
+
+    heappush, heappop = heapq.heappush, heapq.heappop
+
+    stale = peak = 0
+    track = stats is not None
+
+    while forward and backward:
+        if forward[0] // size + backward[0] // size >= 2 * best:
+            break
+
+        if track and len(forward) + len(backward) > peak:
+            peak = len(forward) + len(backward)
+
+        if len(forward) <= len(backward):
+            frontier, g_own, g_other, parents, sign = forward, g_forward, g_backward, parents_forward, 1
+        else:
+            frontier, g_own, g_other, parents, sign = backward, g_backward, g_forward, parents_backward, -1
+
+        key, cur = divmod(heappop(frontier), size)
+        row, col = divmod(cur, cols)
+        cur_g = g_own[cur]
+
+        # Skip entries left behind by a later improvement
+        if key > 2 * cur_g + sign * (abs(row - end_row) + abs(col - end_col) - abs(row - start_row) - abs(col - start_col)):
+            stale += 1
+            continue
+
+        explored.append(cur)
+
+        n_g = cur_g + 1
+        for neighbor in (cur - cols if row > 0 else -1, cur + cols if row < rows - 1 else -1,
+                         cur - 1 if col > 0 else -1, cur + 1 if col < cols - 1 else -1):
+            if neighbor < 0 or cells[neighbor] == WALL:
+                continue
+
+            # The other search already reached this neighbor: the two halves form a start -> end path
+            other_g = g_other[neighbor]
+            if other_g != UNREACHED and n_g + other_g < best:
+                best = n_g + other_g
+                meet_forward, meet_backward = (cur, neighbor) if sign == 1 else (neighbor, cur)
+
+            if n_g < g_own[neighbor]:
+                g_own[neighbor] = n_g
+                parents[neighbor] = cur
+                n_row, n_col = divmod(neighbor, cols)
+                n_key = 2 * n_g + sign * (abs(n_row - end_row) + abs(n_col - end_col) - abs(n_row - start_row) - abs(n_col - start_col))
+                heappush(frontier, n_key * size + neighbor)
+
+    solve_time = time() - start_time
+
+    if track:
+        stats.record_heap(seeds=2, pops=len(explored) + stale, stale=stale, queued=len(forward) + len(backward), peak=peak)
+        stats.corridor_cells = stats.nodes_expanded
+        stats.search_time = solve_time
+
+    if best == UNREACHED:
+        return explored, array('I'), solve_time
+
+    final_path = array('I')
+
+    node = meet_forward
+    while node != -1:
+        final_path.append(node)
+        node = parents_forward[node]
+    final_path.reverse()
+
+    node = meet_backward
+    while node != -1:
+        final_path.append(node)
+        node = parents_backward[node]
+
+    return explored, paths.encode(final_path, cols) if corridors else final_path, solve_time
+
+# Jump Point Search section
+def jump_point_search(maze: MazeGrid, stats: SearchStats|None = None, corridors: bool = False):
+    '''
+    Jump Point Search for the 4-connected, uniform-cost grid.
+    Instead of pushing every open neighbor, each expansion "jumps" in straight lines and only pushes the cells
+    where an optimal path may have to turn (jump points):
+        - moving horizontally, a cell is a jump point if the cell above/below it is open but the one diagonally
+          behind it is a wall (a forced neighbor)
+        - moving vertically, the same test is done for left/right, and a cell is also a jump point if a horizontal
+          jump from it finds a jump point
+    The scans do not test cell by cell: `MazeGrid.jump_tables` marks the cells each direction has to stop at, so a
+    scan skips to its next stop with one `bytes.find`, and a corridor costs the same however long it is.
+    Jump points are searched with A* (Manhattan heuristic) and consecutive jump points always share a row or column,
+    so corridors are expanded for visualization the same way `Dijkstra` expands graph edges, and the jump points are
+    the waypoints of the path with `corridors`.
+    Fills `stats` if one is given and returns the same (explored, final_path, solve_time) triple as `a_star`
+    '''
+    start_time = time()
+
+    cells, rows, cols = maze.cells, maze.rows, maze.cols
+    size = rows * cols
+    end_row, end_col = maze.end_coord
+    start = maze.index(*maze.start_coord)
+    end = maze.index(end_row, end_col)
+
+    open_sides, right_stops, left_stops, vertical_stops = maze.jump_tables()
+
+    def jump_horizontal(cur: int, step: int) -> int:
+        '''
+        Jumps from `cur` along its row in direction `step` (+1/-1). Returns the jump point found, or -1
+        '''
+        row_first = cur - cur % cols
+
+        if step == 1:
+            stop = right_stops.find(1, cur + 1, row_first + cols)
+            if cur < end <= (row_first + cols - 1 if stop == -1 else stop):
+                return end
         else:
-            raise RuntimeError(f"Wall encountered in expanded path at {(r, c)}")
+            stop = left_stops.rfind(1, row_first, cur)
+            if (row_first if stop == -1 else stop) <= end < cur:
+                return end
+
+        # A stop is a wall or a cell with a forced neighbor
+        return -1 if stop == -1 or cells[stop] == WALL else stop
+
+    def jump_vertical(cur: int, step: int) -> int:
+        '''
+        Jumps from `cur` along its column in direction `step` (+cols/-cols). Returns the jump point found, or -1
+        '''
+        row, col = divmod(cur, cols)
+        column_first = col * rows
+        in_end_column = col == end_col
+
+        while True:
+            # The next cell down / up the column that is a wall or has an open side
+            if step > 0:
+                stop = vertical_stops.find(1, column_first + row + 1, column_first + rows)
+                if in_end_column and row < end_row <= (rows - 1 if stop == -1 else stop - column_first):
+                    return end
+            else:
+                stop = vertical_stops.rfind(1, column_first, column_first + row)
+                if in_end_column and (0 if stop == -1 else stop - column_first) <= end_row < row:
+                    return end
+
+            if stop == -1:
+                return -1
+
+            row = stop - column_first
+            cur = row * cols + col
+            if cells[cur] == WALL:
+                return -1
+
+            if (col > 0 and cells[cur - 1] != WALL and cells[cur - 1 - step] == WALL) or \
+                    (col < cols - 1 and cells[cur + 1] != WALL and cells[cur + 1 - step] == WALL):
+                return cur
+
+            # Horizontal jump points reachable from here make this cell a turning point
+            sides = open_sides[cur]
+            if (sides & NEIGHBOR_RIGHT and jump_horizontal(cur, 1) != -1) or \
+                    (sides & NEIGHBOR_LEFT and jump_horizontal(cur, -1) != -1):
+                return cur
+
+    # (step, neighbor bit) of the directions to jump in: every direction from the start, otherwise both sides plus
+    # forward, by the step the jump point was arrived at with
+    up, down, left, right = (-cols, NEIGHBOR_UP), (cols, NEIGHBOR_DOWN), (-1, NEIGHBOR_LEFT), (1, NEIGHBOR_RIGHT)
+    all_directions = (up, down, left, right)
+    onward_directions = {1: (up, down, right), -1: (up, down, left), cols: (left, right, down), -cols: (left, right, up)}
+
+    g_scores = {start: 0}
+    parents = {}
+
+    # min heap of packed (f_score, index) entries, like `a_star`
+    frontier = [heuristic(source=maze.start_coord, goal=maze.end_coord) * size + start]
+    expanded = []
+
+    endFound = False
+
+    stale = peak = 0
+    track = stats is not None
+
+    while frontier:
+        if track and len(frontier) > peak:
+            peak = len(frontier)
+
+        cur_f, cur = divmod(heapq.heappop(frontier), size)
+        row, col = divmod(cur, cols)
+        cur_g = g_scores[cur]
+
+        if cur_f > cur_g + abs(row - end_row) + abs(col - end_col): # Stale entry
+            stale += 1
+            continue
+
+        expanded.append(cur)
+
+        if cur == end:
+            endFound = True
+            break
+
+        parent = parents.get(cur, -1)
+        if parent == -1:
+            directions = all_directions
+        elif parent // cols == row: # Arrived horizontally
+            directions = onward_directions[1 if cur > parent else -1]
+        else: # Arrived vertically
+            directions = onward_directions[cols if cur > parent else -cols]
+
+        sides = open_sides[cur]
+        for step, side in directions:
+            if not sides & side: # Walled off, nothing to jump to
+                continue
+
+            if step == 1 or step == -1:
+                jump_point = jump_horizontal(cur, step)
+            else:
+                jump_point = jump_vertical(cur, step)
+
+            if jump_point == -1:
+                continue
+
+            j_row, j_col = divmod(jump_point, cols)
+            n_g = cur_g + abs(j_row - row) + abs(j_col - col)
+
+            if n_g < g_scores.get(jump_point, UNREACHED):
+                g_scores[jump_point] = n_g
+                parents[jump_point] = cur
+                heapq.heappush(frontier, (n_g + abs(j_row - end_row) + abs(j_col - end_col)) * size + jump_point)
+
+    solve_time = time() - start_time
+
+    # Expand the jump from each expanded node's parent into the corridor it crossed
+    explored = array('I', [start])
+    for node in expanded[1:]:
+        explored.extend(paths.corridor(parents[node], node, cols)[1:])
+
+    if track:
+        stats.record_heap(seeds=1, pops=len(expanded) + stale, stale=stale, queued=len(frontier), peak=peak)
+        stats.corridor_cells = len(explored)
+        stats.search_time = solve_time
+
+    if not endFound:
+        return explored, array('I'), solve_time
 
-    return expanded
+    jump_points = array('I', [end])
+    while jump_points[-1] in parents:
+        jump_points.append(parents[jump_points[-1]])
+    jump_points.reverse()
 
-def Dijkstra(maze: Maze):
+    return explored, jump_points if corridors else paths.expand(jump_points, cols), solve_time
+
+# Dijkstra section
+def Dijkstra(maze: MazeGrid, stats: SearchStats|None = None, corridors: bool = False):
     """
-    Runs Dijkstra's shortest path algorithm on the maze's adjacency list,
-    but expands graph edges into full maze corridors for visualization.
+    Runs Dijkstra's shortest path algorithm on the maze's cached corridor graph, see `Dijkstra_stream`.
+    Fills `stats` if one is given.
     Returns:
-        explored: list of (row, col) coordinates visited in order
-        final_path: list of (row, col) coordinates in the shortest path
+        explored: array('I') of the cell indices visited, in order
+        final_path: array('I') of the cell indices in the shortest path, or its waypoints with `corridors` (see `paths`)
         solve_time: time taken to solve
     """
+    return collect_stream(Dijkstra_stream(maze, stats, corridors=corridors))
 
-    start_time = time()
+def Dijkstra_stream(maze: MazeGrid, stats: SearchStats|None = None, batch_size: int = STREAM_BATCH,
+                    corridors: bool = False):
+    """
+    Runs Dijkstra's shortest path algorithm on the maze's cached corridor graph,
+    but expands graph edges into full maze corridors for visualization.
+    Yields the visited cell indices in `array('I')` batches of at least `batch_size` (whole corridors) while it
+    searches and returns (final_path, solve_time) when done, like `a_star_stream`. The graph points of the path are
+    its waypoints with `corridors`.
+    Corridors are listed from the step each graph edge keeps (see `SplicedGraph.spans`), without reading the grid;
+    solve_time includes them and the path reconstruction.
+    Fills `stats` if one is given.
+    """
 
-    maze.create_graph()
-    graph = maze.graph_points.graph
-    coord_to_id = maze.graph_points.coord_to_verNum
-    id_to_coord = maze.graph_points.verNum_to_coord
+    solve_time = 0.0
+    resumed = time()
 
-    start_coord = maze.start_coord
-    end_coord = maze.end_coord
+    # Built here on first use; timed on its own so stats can tell it apart from the search
+    maze.corridor_graph()
+    graph_build_time = time() - resumed
 
-    start_id = coord_to_id.get(start_coord)
-    end_id = coord_to_id.get(end_coord)
+    # Cached corridor graph with the start/end points spliced in as temporary vertices
+    graph, start_id, end_id = maze.splice_terminals()
 
     if start_id is None or end_id is None:
-        print("Start or end not found in graph.")
-        return [], [], 0
+        raise Exception("Start or end not found in graph: place both points before solving")
 
-    dist = [float("inf") for v in graph]
+    vertices = graph.get_vertices()
+    dist = array('i', [UNREACHED]) * vertices
+    prev = array('i', [-1]) * vertices
+    prev_step = array('i', [0]) * vertices # step along the corridor from prev to the vertex
     dist[start_id] = 0
-    prev = {}
 
-    pq = [(0, start_id)]
-    explored = []
+    # min heap of packed (distance, vertex) entries, like `a_star`
+    pq = [start_id]
+    cols = maze.cols
+    explored = array('I')
+    explored_count = 0
+
+    pops = stale = peak = 0
+    track = stats is not None
 
     while pq:
-        cur_dist, cur_node = heapq.heappop(pq)
+        if track and len(pq) > peak:
+            peak = len(pq)
+
+        cur_dist, cur_node = divmod(heapq.heappop(pq), vertices)
+        pops += 1
 
         if cur_dist > dist[cur_node]: # Already processed better path; skip
+            stale += 1
             continue
 
         # Always expand path to current node
         if cur_node == start_id:
-            explored.append(id_to_coord[cur_node])
+            explored.append(graph.cell(cur_node))
         else:
             # Skip the starting node to remove redundance
-            expanded_corridor = expand_path(maze, id_to_coord[prev[cur_node]], id_to_coord[cur_node])
-            explored.extend(expanded_corridor[1:])
+            step = prev_step[cur_node]
+            explored.extend(range(graph.cell(prev[cur_node]) + step, graph.cell(cur_node) + step, step))
 
         if cur_node == end_id:
             break  # Now we break after marking the final segment
 
+        if len(explored) >= batch_size:
+            solve_time += time() - resumed
+            explored_count += len(explored)
+            yield explored
+            explored = array('I')
+            resumed = time()
+
         # Relax edges
-        for neighbor, w in graph[cur_node]:
-            new_dist = cur_dist + w
+        for neighbor, weight, step in graph.spans(cur_node):
+            new_dist = cur_dist + weight
 
             if new_dist < dist[neighbor]:
                 dist[neighbor] = new_dist
                 prev[neighbor] = cur_node
-                heapq.heappush(pq, (new_dist, neighbor))
+                prev_step[neighbor] = step
+                heapq.heappush(pq, new_dist * vertices + neighbor)
 
-    solve_time = time() - start_time
+    final_path = array('I')
+    if dist[end_id] != UNREACHED:
+        # Path reconstruction
+        path_nodes = array('I')
+        cur = end_id
+        while cur != -1:
+            path_nodes.append(graph.cell(cur))
+            cur = prev[cur]
+        path_nodes.reverse()
+
+        # Expand final path fully unless its corridors are asked for
+        final_path = path_nodes if corridors else paths.expand(path_nodes, cols)
+
+    solve_time += time() - resumed
+    explored_count += len(explored)
+
+    if track:
+        stats.record_heap(seeds=1, pops=pops, stale=stale, queued=len(pq), peak=peak)
+        stats.corridor_cells = explored_count
+        stats.graph_build_time = graph_build_time
+        stats.search_time = solve_time - graph_build_time
+
+    if explored:
+        yield explored
+
+    return final_path, solve_time
+
+def Dijkstra_bidirectional(maze: MazeGrid, stats: SearchStats|None = None, corridors: bool = False):
+    """
+    Bidirectional Dijkstra on the maze's corridor graph: searches grow from the start and end graph points,
+    expanding whichever frontier is smaller, and stop once the two frontier minimums add up to at least the
+    best meeting path. Corridors are expanded for visualization like `Dijkstra_stream`.
+    Fills `stats` if one is given and returns the same (explored, final_path, solve_time) triple; explored
+    interleaves both searches in pop order
+    """
+
+    start_time = time()
+
+    # Built here on first use; timed on its own so stats can tell it apart from the search
+    maze.corridor_graph()
+    graph_build_time = time() - start_time
 
-    # Path reconstruction
-    path_nodes = []
-    cur = end_id
-    while cur in prev:
-        path_nodes.append(id_to_coord[cur])
-        cur = prev[cur]
-    path_nodes.append(start_coord)
-    path_nodes.reverse()
-
-    # Expand final path fully
-    final_path = []
-    for i in range(len(path_nodes) - 1):
-        expanded_corridor = expand_path(maze, path_nodes[i], path_nodes[i + 1])
-        if final_path:
-            final_path.extend(expanded_corridor[1:])
+    # Cached corridor graph with the start/end points spliced in as temporary vertices
+    graph, start_id, end_id = maze.splice_terminals()
+
+    if start_id is None or end_id is None:
+        raise Exception("Start or end not found in graph: place both points before solving")
+
+    vertices = graph.get_vertices()
+    dist_forward = array('i', [UNREACHED]) * vertices
+    dist_backward = array('i', [UNREACHED]) * vertices
+    prev_forward = array('i', [-1]) * vertices
+    prev_backward = array('i', [-1]) * vertices
+    # Step along the corridor from each search's prev to the vertex
+    step_forward = array('i', [0]) * vertices
+    step_backward = array('i', [0]) * vertices
+    dist_forward[start_id] = 0
+    dist_backward[end_id] = 0
+
+    # min heaps of packed (distance, vertex) entries
+    pq_forward = [start_id]
+    pq_backward = [end_id]
+    cols = maze.cols
+    explored = array('I')
+
+    best = UNREACHED # Length of the shortest start -> end path seen so far
+    meet_forward = meet_backward = start_id # Path is start ~> meet_forward -> meet_backward ~> end
+    if start_id == end_id:
+        best = 0
+
+    pops = stale = peak = 0
+    track = stats is not None
+
+    while pq_forward and pq_backward:
+        if pq_forward[0] // vertices + pq_backward[0] // vertices >= best:
+            break
+
+        if track and len(pq_forward) + len(pq_backward) > peak:
+            peak = len(pq_forward) + len(pq_backward)
+
+        if len(pq_forward) <= len(pq_backward):
+            pq, dist, dist_other, prev, prev_step, forward = pq_forward, dist_forward, dist_backward, prev_forward, step_forward, True
+        else:
+            pq, dist, dist_other, prev, prev_step, forward = pq_backward, dist_backward, dist_forward, prev_backward, step_backward, False
+
+        cur_dist, cur_node = divmod(heapq.heappop(pq), vertices)
+        pops += 1
+
+        if cur_dist > dist[cur_node]: # Already processed better path; skip
+            stale += 1
+            continue
+
+        # Expand the corridor this search used to reach the node (skipping the node it came from)
+        if prev[cur_node] != -1:
+            step = prev_step[cur_node]
+            explored.extend(range(graph.cell(prev[cur_node]) + step, graph.cell(cur_node) + step, step))
         else:
-            final_path.extend(expanded_corridor)
+            explored.append(graph.cell(cur_node))
+
+        # Relax edges
+        for neighbor, weight, step in graph.spans(cur_node):
+            new_dist = cur_dist + weight
+
+            # The other search already reached this neighbor: the two halves form a start -> end path
+            other_dist = dist_other[neighbor]
+            if other_dist != UNREACHED and new_dist + other_dist < best:
+                best = new_dist + other_dist
+                meet_forward, meet_backward = (cur_node, neighbor) if forward else (neighbor, cur_node)
+
+            if new_dist < dist[neighbor]:
+                dist[neighbor] = new_dist
+                prev[neighbor] = cur_node
+                prev_step[neighbor] = step
+                heapq.heappush(pq, new_dist * vertices + neighbor)
+
+    final_path = array('I')
+    if best != UNREACHED:
+        # Path reconstruction: start ~> meet_forward, then meet_backward ~> end
+        path_nodes = array('I')
+        cur = meet_forward
+        while cur != -1:
+            path_nodes.append(graph.cell(cur))
+            cur = prev_forward[cur]
+        path_nodes.reverse()
+
+        cur = meet_backward if meet_backward != meet_forward else prev_backward[meet_forward]
+        while cur != -1:
+            path_nodes.append(graph.cell(cur))
+            cur = prev_backward[cur]
+
+        # Expand final path fully unless its corridors are asked for
+        final_path = path_nodes if corridors else paths.expand(path_nodes, cols)
+
+    solve_time = time() - start_time
+
+    if track:
+        stats.record_heap(seeds=2, pops=pops, stale=stale, queued=len(pq_forward) + len(pq_backward), peak=peak)
+        stats.corridor_cells = len(explored)
+        stats.graph_build_time = graph_build_time
+        stats.search_time = solve_time - graph_build_time
 
     return explored, final_path, solve_time
@@ -0,0 +1,96 @@
+import math
+import sys
+from time import perf_counter
+from constants import ANIMATION_SECONDS, ANIMATION_FRAME_RATE, ANIMATION_DRAW_SHARE
+
+'''
+Time-budgeted pacing of the progressive traversal drawing.
+The animation runs on its own clock, which advances with real time times the playback speed; each frame draws the
+cells the clock says are due, so a maze of any size takes about ANIMATION_SECONDS at normal speed. The draw cost per
+cell is measured as frames go, and a frame never takes on more cells than fit into its share of the frame time, so
+large mazes stay at the frame rate and run long instead of stuttering.
+Cells may also stream in while the animation runs (`streaming`): the total is then only an estimate that sets the
+pace, frames draw what has arrived of what is due, and `end_stream` gives the real total once everything arrived.
+'''
+
+# Playback speed limits; every speed_up / slow_down doubles / halves the speed
+MIN_SPEED = 1 / 8
+MAX_SPEED = 64
+# Longest step of the animation clock; a frame held up by something else (like a solve) does not make the next one
+# catch up all at once
+MAX_FRAME_STEP = 0.1
+# Weight of the newest frame in the running draw cost per cell
+COST_SMOOTHING = 0.2
+
+class AnimationScheduler:
+    def __init__(self, total_cells: int, duration: float = ANIMATION_SECONDS, frame_rate: int = ANIMATION_FRAME_RATE,
+                 streaming: bool = False):
+        self.total_cells = total_cells
+        self.streaming = streaming # total_cells is an estimate until `end_stream`
+        self.duration = duration
+        self.frame_budget = ANIMATION_DRAW_SHARE / frame_rate # seconds of each frame cells may be drawn in
+
+        self.speed = 1.0
+        self.skipping = False
+
+        self.clock = 0.0 # animation time, in seconds at normal speed
+        self.last_frame: float|None = None
+        self.drawn = 0
+        self.cost_per_cell: float|None = None # seconds, running average
+
+    def frame_cells(self) -> int:
+        '''
+        Number of cells to draw this frame (possibly 0 when the animation is ahead of its clock)
+        '''
+        if self.skipping or self.duration <= 0:
+            return sys.maxsize if self.streaming else self.total_cells - self.drawn
+
+        now = perf_counter()
+        if self.last_frame is not None:
+            self.clock += min(now - self.last_frame, MAX_FRAME_STEP) * self.speed
+        self.last_frame = now
+
+        due = math.ceil(self.total_cells * self.clock / self.duration)
+        if not self.streaming:
+            due = min(due, self.total_cells)
+        due -= self.drawn
+        if self.cost_per_cell:
+            due = min(due, max(int(self.frame_budget / self.cost_per_cell), 1))
+
+        return max(due, 0)
+
+    def record(self, cells: int, seconds: float):
+        '''
+        Tells the scheduler that `cells` cells were drawn this frame, taking `seconds`
+        '''
+        self.drawn += cells
+        if cells == 0:
+            return
+
+        cost = seconds / cells
+        if self.cost_per_cell is None:
+            self.cost_per_cell = cost
+        else:
+            self.cost_per_cell += (cost - self.cost_per_cell) * COST_SMOOTHING
+
+    def speed_up(self):
+        self.speed = min(self.speed * 2, MAX_SPEED)
+
+    def slow_down(self):
+        self.speed = max(self.speed / 2, MIN_SPEED)
+
+    def skip(self):
+        '''
+        Draws everything left on the next frame
+        '''
+        self.skipping = True
+
+    def end_stream(self, total_cells: int):
+        '''
+        Every cell has arrived: `total_cells` in all
+        '''
+        self.total_cells = total_cells
+        self.streaming = False
+
+    def finished(self) -> bool:
+        return not self.streaming and self.drawn >= self.total_cells
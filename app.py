@@ -3,12 +3,19 @@ from tkinter import filedialog, Tk
 import sys
 from threading import Thread
 import gui
-from maze import Maze
+from maze import Maze, EXPLORED, FINAL
+from grid import WALL
 from constants import *
-from block import Block, BlockState
 from enum import Enum
 import Algorithms
-from typing import Generator, Callable
+from solve_worker import SolveJob, PlannerWorker, PlannerJob
+import profiling
+import dirty_rects
+from typing import Generator
+from time import perf_counter
+from animation import AnimationScheduler
+from array import array
+import paths
 
 class AppState(Enum):
     MAZE_NOT_LOADED = 0
@@ -19,10 +26,53 @@ class Algorithm_Choice(Enum):
     NONE = 0
     A_STAR = 1
     DIJKSTRAS = 2
+    A_STAR_BIDIRECTIONAL = 3
+    DIJKSTRAS_BIDIRECTIONAL = 4
+    JUMP_POINT_SEARCH = 5
 class Traversal_Method(Enum):
     NONE = 0
     INSTANT = 1
     PROCEDUAL = 2
+
+# Solver run for each algorithm choice, and the name shown in the results panel for each solver
+ALGORITHM_SOLVERS = {
+    Algorithm_Choice.A_STAR: Algorithms.a_star,
+    Algorithm_Choice.DIJKSTRAS: Algorithms.Dijkstra,
+    Algorithm_Choice.A_STAR_BIDIRECTIONAL: Algorithms.a_star_bidirectional,
+    Algorithm_Choice.DIJKSTRAS_BIDIRECTIONAL: Algorithms.Dijkstra_bidirectional,
+    Algorithm_Choice.JUMP_POINT_SEARCH: Algorithms.jump_point_search,
+}
+ALGORITHM_NAMES = {
+    Algorithms.a_star: "A*",
+    Algorithms.Dijkstra: "Dijkstra's",
+    Algorithms.a_star_bidirectional: "Bidirectional A*",
+    Algorithms.Dijkstra_bidirectional: "Bidirectional Dijkstra's",
+    Algorithms.jump_point_search: "Jump Point Search",
+}
+# Streaming variants of the solvers, which the progressive drawing runs to draw blocks while the search goes on
+ALGORITHM_STREAMS = {
+    Algorithm_Choice.A_STAR: Algorithms.a_star_stream,
+    Algorithm_Choice.DIJKSTRAS: Algorithms.Dijkstra_stream,
+}
+# Algorithms the instant mode answers with the incremental planner, and whether it uses the A* heuristic
+INCREMENTAL_HEURISTICS = {
+    Algorithm_Choice.A_STAR: True,
+    Algorithm_Choice.DIJKSTRAS: False,
+}
+# Keys controlling a running traversal animation. Escape is not one of them: it cancels the solve
+ANIMATION_KEYS = {
+    pygame.K_RIGHT: AnimationScheduler.speed_up,
+    pygame.K_UP: AnimationScheduler.speed_up,
+    pygame.K_EQUALS: AnimationScheduler.speed_up,
+    pygame.K_PLUS: AnimationScheduler.speed_up,
+    pygame.K_KP_PLUS: AnimationScheduler.speed_up,
+    pygame.K_LEFT: AnimationScheduler.slow_down,
+    pygame.K_DOWN: AnimationScheduler.slow_down,
+    pygame.K_MINUS: AnimationScheduler.slow_down,
+    pygame.K_KP_MINUS: AnimationScheduler.slow_down,
+    pygame.K_SPACE: AnimationScheduler.skip,
+    pygame.K_RETURN: AnimationScheduler.skip,
+}
 '''
     Prompts the user's file system dialog box and returns the file data
 '''
@@ -41,86 +91,123 @@ def prompt_file():
     return file_info
 
 
-# render_maze logic:
-# sets the max frame rate given the dimensions of our maze (rowsxcols),
-# multiplies a speed factor to better control drawing speed.
-
 def render_maze(maze: Maze):
     maze.draw()
     app_state = AppState.MAZE_LOADED
-    max_frame_rate = len(maze.maze_array) * len(maze.maze_array[0]) * SPEED_FACTOR
-    pygame.display.flip()
+    dirty_rects.present()
 
-    return app_state, max_frame_rate
+    return app_state
 
-def execute_and_display_stats(maze: Maze, algorithm_used: Callable, algorithm_value: gui.Text, exec_time_value: gui.Text, blocks_traversed_value: gui.Text, 
-                              optimal_path_length_value: gui.Text):
-    explored_inds, optimal_path_inds, solve_time = algorithm_used(maze=maze)
+def start_solve(maze: Maze, algorithm: Algorithm_Choice, instant: bool, planner: PlannerWorker|None,
+                count: bool) -> tuple[SolveJob|PlannerJob, PlannerWorker|None]:
+    '''
+    Starts solving `maze` with `algorithm` in a worker process. Instant solutions of A*/Dijkstra's are solves of the
+    incremental planner once it runs for that algorithm (see `start_planner`), which repair its search from the
+    previous solve; a planner of the other algorithm is stopped. Other solves stream their explored blocks to be
+    drawn progressively.
+    Returns the job and the planner
+    '''
+    algorithm_selected = ALGORITHM_SOLVERS[algorithm]
+    algorithm_name = ALGORITHM_NAMES[algorithm_selected]
 
-    algorithm_value.text = "A*" if algorithm_used == Algorithms.a_star else "Dijkstra's"
-    if round(solve_time, 4) == 0.0:
-        exec_time_value.text = "<0.0001s"
-    else:
-        exec_time_value.text = f"{solve_time:.4f}s" # Formatting ensure 4 decimals
-    blocks_traversed_value.text = str(len(explored_inds))
-    optimal_path_length_value.text = str(len(optimal_path_inds) - 1) # -1 to exclude starting block
-    return explored_inds,optimal_path_inds
+    if not instant:
+        return SolveJob(maze, ALGORITHM_STREAMS.get(algorithm, algorithm_selected), algorithm_name, count, stream=True), planner
 
-def visualize_progressively(maze: Maze, explored_inds: list[tuple[int, int]], path_inds: list[tuple[int, int]]):
-    maze_grid = maze.maze_array
+    if algorithm in INCREMENTAL_HEURISTICS and planner is not None:
+        if planner.running() and planner.use_heuristic == INCREMENTAL_HEURISTICS[algorithm]:
+            return planner.solve(algorithm_name + " (D* Lite)", count), planner
 
-    blocks_per_frame = 1
+        planner.stop()
+        planner = None
 
-    # We will draw a ratio `percent_blocks_drawn` of the explored_inds path per frame
-    # For small graphs, this will be lower than 1. We need at least one block drawn per frame
-    blocks_per_frame = max(int(len(explored_inds) * PERCENT_BLOCKS_DRAW), 1)
+    return SolveJob(maze, algorithm_selected, algorithm_name, count), planner
 
-    # Logic for drawing mazes, yields if we are still drawing (draws between start and end)
-    for i in range(1, len(explored_inds), blocks_per_frame):
-        for j in range(blocks_per_frame):
-            ind = i + j
-            if ind >= len(explored_inds):
-                break
-            
-            if explored_inds[ind] == maze.end_coord:
-                continue
+def start_planner(maze: Maze, algorithm: Algorithm_Choice, planner: PlannerWorker|None) -> PlannerWorker:
+    '''
+    The incremental planner for instant solves of `algorithm` (A*/Dijkstra's), started after its first plain solve.
+    Searching from scratch it is slower than the plain solver, so it plans for the solved points in the background
+    and the solves after the start/end point moves are its repairs
+    '''
+    if planner is not None and planner.running() and planner.use_heuristic == INCREMENTAL_HEURISTICS[algorithm]:
+        return planner
 
-            row, col = explored_inds[ind]
-            block = maze_grid[row][col]
-            block.set_state(BlockState.EXPLORED)
-            block.draw()
-        
-        yield True
-    
-    for i in range(1, len(path_inds), blocks_per_frame):
-        for j in range(blocks_per_frame):
-            ind = i + j
-            if ind >= len(path_inds):
-                break
+    if planner is not None:
+        planner.stop()
+
+    return PlannerWorker(maze, use_heuristic=INCREMENTAL_HEURISTICS[algorithm])
+
+def animate_solve(maze: Maze, solve_job: SolveJob) -> tuple[AnimationScheduler, Generator[bool, None, None]]:
+    '''
+    Starts drawing the blocks `solve_job` streams. Their number is only known at the end, so the animation is paced
+    as if it covered every open block of the maze: the same number of blocks per second for every algorithm.
+    Returns the scheduler and the animator
+    '''
+    scheduler = AnimationScheduler(len(maze.cells) - maze.cells.count(WALL), streaming=True)
+
+    return scheduler, visualize_progressively(maze=maze, solve_job=solve_job, scheduler=scheduler)
+
+def display_stats(solve_output: tuple, cols: int, algorithm_name: str, algorithm_value: gui.Text, exec_time_value: gui.Text,
+                  blocks_traversed_value: gui.Text, optimal_path_length_value: gui.Text, counters_value: gui.Text):
+    explored_count, optimal_path, solve_time, stats = solve_output
+
+    algorithm_value.text = algorithm_name
+    if round(solve_time, 4) == 0.0:
+        exec_time_value.text = "<0.0001s"
+    else:
+        exec_time_value.text = f"{solve_time:.4f}s" # Formatting ensure 4 decimals
+    blocks_traversed_value.text = str(explored_count)
+    optimal_path_length_value.text = str(paths.cell_count(optimal_path, cols) - 1) # -1 to exclude starting block
+    counters_value.text = stats.summary() if stats else ""
 
-            if path_inds[ind] == maze.end_coord:
+def visualize_progressively(maze: Maze, solve_job: SolveJob, scheduler: AnimationScheduler):
+    '''
+    Draws the explored blocks of a streaming `solve_job` as they arrive and then its path, as many per frame as
+    `scheduler` allots (the start and end blocks are left as they are). Only the blocks received and not drawn yet
+    are held. Yields True after every frame while blocks are left, then False
+    '''
+    batch, position, state = array('I'), 0, EXPLORED
+    received = 0
+
+    while not scheduler.finished():
+        count = scheduler.frame_cells()
+
+        start = perf_counter()
+        painted = 0
+        while painted < count:
+            if position == len(batch):
+                next_batch = solve_job.next_batch() if state == EXPLORED else None
+
+                if next_batch is None:
+                    # Nothing more has arrived yet, or the path is drawn too
+                    if state == FINAL or not solve_job.streamed():
+                        break
+
+                    # Every explored block arrived: the path follows
+                    successful, output = solve_job.result()
+                    next_batch = paths.expand(output[1], maze.cols) if successful else array('I')
+                    state = FINAL
+                    scheduler.end_stream(received + len(next_batch))
+
+                batch, position = next_batch, 0
+                received += len(batch)
                 continue
 
-            row, col = path_inds[ind]
-            block = maze_grid[row][col]
-            block.set_state(BlockState.FINAL)
-            block.draw()
+            cells = batch[position:position + count - painted]
+            maze.paint_cells(cells, state)
+            position += len(cells)
+            painted += len(cells)
+        scheduler.record(painted, perf_counter() - start)
 
         yield True
 
     yield False
 
-def visualize_instantly(maze: Maze, path_inds: list[tuple[int, int]]):
-    for i in range(1, len(path_inds)):
-        if path_inds[i] == maze.end_coord:
-            continue
-
-        row, col = path_inds[i]
-        block = maze.maze_array[row][col]
-        block.set_state(BlockState.FINAL)
-        block.draw()
-
-    pygame.display.flip()
+def visualize_instantly(maze: Maze, path: array):
+    '''
+    Draws the path `path` encodes by its corridors (the start and end blocks are left as they are)
+    '''
+    with profiling.phase("render path"):
+        maze.paint_path(path, FINAL)
     
 
 def main():
@@ -146,29 +233,53 @@ def main():
     '''
     screen.fill(WHITE)
 
-    upload_button, preload_button, draw_progressively_button, draw_solution_instantly_button, unload_button, a_star_button, dijkstras_button = gui.create_buttons(screen)
+    upload_button, preload_button, draw_progressively_button, draw_solution_instantly_button, cancel_button, unload_button, a_star_button, dijkstras_button, \
+        a_star_bidirectional_button, dijkstras_bidirectional_button, jps_button, counters_button = gui.create_buttons(screen)
     algorithm_txt_value, exec_time_value, blocks_traversed_value, optimal_path_length_value = gui.create_results(screen=screen)
+    counters_value = gui.create_counters(screen=screen)
     # Storing in arrays makes it cleaner to print all visuals for that state
-    all_buttons = [upload_button, preload_button, draw_progressively_button, draw_solution_instantly_button, unload_button, a_star_button, dijkstras_button]
+    algorithm_buttons = {
+        Algorithm_Choice.A_STAR: a_star_button,
+        Algorithm_Choice.DIJKSTRAS: dijkstras_button,
+        Algorithm_Choice.A_STAR_BIDIRECTIONAL: a_star_bidirectional_button,
+        Algorithm_Choice.DIJKSTRAS_BIDIRECTIONAL: dijkstras_bidirectional_button,
+        Algorithm_Choice.JUMP_POINT_SEARCH: jps_button,
+    }
+    all_buttons = [upload_button, preload_button, draw_progressively_button, draw_solution_instantly_button, cancel_button, unload_button, *algorithm_buttons.values(), counters_button]
     all_stats_values = [algorithm_txt_value, exec_time_value, blocks_traversed_value, optimal_path_length_value]
 
     error_message: gui.Text = None
 
-    pygame.display.flip()
+    show_counters = False # Whether solves collect search counters and show them
+
+    dirty_rects.flip()
 
     '''
-    Algorithm traversal path outputs
+    Algorithm traversal path outputs: the waypoints of the last path (see `paths`)
     '''
 
-    explored_inds = []
-    optimal_path_inds = []
+    optimal_path = array('I')
+
+    '''
+    Incremental planner of the loaded maze, kept between instant solves. While `replanning`, the last solve was an
+    instant one of A*/Dijkstra's and moving the start/end point solves again right away, with the planner
+    '''
+    planner: PlannerWorker = None
+    replanning = False
+
+    '''
+    Running solve (app state TRAVERSING) and whether its result is drawn progressively. Cancelling it, or starting another
+    one, terminates its worker
+    '''
+    solve_job: SolveJob|PlannerJob = None
+    solve_progressively = False
 
     '''
     Maze drawing variables
     '''
     is_maze_drawing = False
     maze_animator: Generator[bool] = None # Generator for drawing
-    target_frame_rate = 60 # Default frame rate; frame rate ~ animation speed
+    animation: AnimationScheduler = None # Paces `maze_animator`; the arrow keys change its speed, space/enter skip it
 
     '''
     Loading maze thread and result (array because it is easiest way to deal with returning value from thread)
@@ -187,7 +298,10 @@ def main():
                     error_message.clear()
                     error_message = None
                 maze = maze_output
-                app_state, target_frame_rate = render_maze(maze=maze)
+                if planner:
+                    planner.stop()
+                planner = None
+                app_state = render_maze(maze=maze)
             else:
                 if error_message:
                     error_message.clear()  # Clear the previous message
@@ -200,11 +314,69 @@ def main():
             thread_load_maze = None
             load_maze_result.clear()
 
-        # Event Loop
-        for event in pygame.event.get():
+        # A result for a maze that was unloaded meanwhile has nothing left to be shown on
+        if solve_job and app_state == AppState.MAZE_NOT_LOADED:
+            solve_job.cancel()
+            solve_job = None
+
+        # If we are solving, show the time it has taken so far, or the result once the worker is done
+        if solve_job:
+            solve_result = solve_job.result()
+
+            if solve_result is None:
+                algorithm_txt_value.text = solve_job.name
+                exec_time_value.text = f"Solving... {solve_job.elapsed():.1f}s"
+                blocks_traversed_value.text = ""
+                optimal_path_length_value.text = ""
+            else:
+                solve_status, solve_output = solve_result
+
+                if solve_status: # If successful
+                    app_state = AppState.FINISHED
+                    # The planner answers the next instant solves, from where this one ended
+                    if replanning:
+                        planner = start_planner(maze=maze, algorithm=algorithm, planner=planner)
+                    optimal_path = solve_output[1]
+                    display_stats(solve_output=solve_output, cols=maze.cols, algorithm_name=solve_job.name, algorithm_value=algorithm_txt_value,
+                                  exec_time_value=exec_time_value, blocks_traversed_value=blocks_traversed_value,
+                                  optimal_path_length_value=optimal_path_length_value, counters_value=counters_value)
+
+                    # A progressive solve has been drawing its blocks as they streamed in
+                    if not solve_progressively:
+                        visualize_instantly(maze=maze, path=optimal_path)
+                else:
+                    app_state = AppState.MAZE_LOADED
+                    for stat in all_stats_values:
+                        stat.text = ""
+
+                    if error_message:
+                        error_message.clear()
+                    error_message = gui.create_error_message(screen=screen, error_message="ERROR: " + solve_output)
+
+                solve_job = None
+
+        # Event Loop. With nothing to animate, load or solve, sleep until the next event instead of spinning
+        if is_maze_drawing or thread_load_maze or solve_job:
+            events = pygame.event.get()
+        else:
+            events = [pygame.event.wait(IDLE_WAIT_MS)] + pygame.event.get()
+
+        cancel_requested = False
+
+        for event in events:
             if event.type == pygame.QUIT:
                 running = False
 
+            elif event.type == pygame.MOUSEMOTION:
+                for button in all_buttons:
+                    button.set_hovered(button.rect.collidepoint(event.pos))
+
+            elif event.type == pygame.KEYDOWN and is_maze_drawing and event.key in ANIMATION_KEYS:
+                ANIMATION_KEYS[event.key](animation)
+
+            elif event.type == pygame.KEYDOWN and solve_job and event.key == pygame.K_ESCAPE:
+                cancel_requested = True
+
             elif event.type == pygame.MOUSEBUTTONDOWN:
                 x, y = event.pos
 
@@ -232,29 +404,40 @@ def main():
                 elif unload_button.is_clicked((x, y)):
                     unload_button.clicked()
 
+                    # Nothing is left to show a running solve on
+                    if solve_job:
+                        solve_job.cancel()
+                        solve_job = None
+
                     # Clear maze of its data and visually remove 
                     if maze:
                         maze.clear()
 
                     # Empty algorithm path outputs
-                    explored_inds = []
-                    optimal_path_inds = []
+                    optimal_path = array('I')
+                    if planner:
+                        planner.stop()
+                    planner = None
+                    replanning = False
                     
                     # Clear the text from our result stats
                     for stat in all_stats_values:
                         stat.text = ""
+                    counters_value.text = ""
 
                     app_state = AppState.MAZE_NOT_LOADED
                     is_maze_drawing = False
                 
+                elif cancel_button.is_clicked((x, y)):
+                    cancel_button.clicked()
+                    cancel_requested = True
+
                 elif (draw_progressively_clicked or draw_solution_instantly_clicked) and algorithm != Algorithm_Choice.NONE and app_state != AppState.MAZE_NOT_LOADED:
                     if draw_progressively_clicked:
                         draw_progressively_button.clicked()
                     else:
                         draw_solution_instantly_button.clicked()
 
-                    algorithm_selected = Algorithms.a_star if algorithm == Algorithm_Choice.A_STAR else Algorithms.Dijkstra
-
                     # Clear any previous error message if there was one
                     if error_message:
                         error_message.clear()
@@ -269,60 +452,120 @@ def main():
                         error_message = gui.create_error_message(screen=screen, error_message="No end position in maze. Please right-click an open block.")
                         continue
                     
-                    app_state = AppState.FINISHED
+                    app_state = AppState.TRAVERSING
                     is_maze_drawing = False # Interrupt any current drawing
-                    maze.clear_path(explored_inds[1:]) # Remove any paths marked except start block
+                    # Remove any paths marked
+                    maze.reset_view()
+                    optimal_path = array('I')
 
-                    explored_inds, optimal_path_inds = execute_and_display_stats(maze=maze, algorithm_used=algorithm_selected, algorithm_value=algorithm_txt_value,exec_time_value=exec_time_value, 
-                                                                                    blocks_traversed_value=blocks_traversed_value, optimal_path_length_value=optimal_path_length_value)
+                    # A new solve replaces a running one
+                    if solve_job:
+                        solve_job.cancel()
 
-                    if draw_progressively_clicked:
-                        maze_animator = visualize_progressively(maze=maze, explored_inds=explored_inds, path_inds=optimal_path_inds)
-                        is_maze_drawing = True
-                    else:
-                        visualize_instantly(maze=maze, path_inds=optimal_path_inds)
+                    # Instant solutions of A*/Dijkstra's reuse the planner's search from the previous solve
+                    replanning = draw_solution_instantly_clicked and algorithm in INCREMENTAL_HEURISTICS
+                    solve_progressively = draw_progressively_clicked
+                    solve_job, planner = start_solve(maze=maze, algorithm=algorithm, instant=draw_solution_instantly_clicked, planner=planner, count=show_counters)
 
-                elif a_star_button.is_clicked((x,y)) and algorithm != Algorithm_Choice.A_STAR:
-                    a_star_button.clicked()
-                    algorithm = Algorithm_Choice.A_STAR
-                
-                elif dijkstras_button.is_clicked((x,y)) and algorithm != Algorithm_Choice.DIJKSTRAS:
-                    dijkstras_button.clicked()
-                    algorithm = Algorithm_Choice.DIJKSTRAS
+                    if solve_progressively:
+                        animation, maze_animator = animate_solve(maze=maze, solve_job=solve_job)
+                        is_maze_drawing = True
 
-                # Maze interaction: box clicks
+                # Algorithm buttons are only enabled while their algorithm is not the selected one
+                elif any(button.is_clicked((x,y)) for button in algorithm_buttons.values()):
+                    for choice, button in algorithm_buttons.items():
+                        if button.is_clicked((x,y)):
+                            button.clicked()
+                            algorithm = choice
+                            replanning = False # The planner answers for the algorithm of the last solve only
+
+                    # Switching algorithm mid-solve solves again with the new one
+                    if solve_job:
+                        solve_job.cancel()
+                        replanning = not solve_progressively and algorithm in INCREMENTAL_HEURISTICS
+                        solve_job, planner = start_solve(maze=maze, algorithm=algorithm, instant=not solve_progressively, planner=planner, count=show_counters)
+
+                        if solve_progressively:
+                            maze.reset_view()
+                            animation, maze_animator = animate_solve(maze=maze, solve_job=solve_job)
+                            is_maze_drawing = True
+
+                elif counters_button.is_clicked((x, y)):
+                    counters_button.clicked()
+
+                    show_counters = not show_counters
+                    if not show_counters:
+                        counters_value.clear()
+                    if show_counters and not counters_value.text:
+                        counters_value.text = "Counters are collected from the next solve on"
+
+                # Maze interaction: box clicks, locked while solving
                 elif maze and MAZE_PADDING_LEFT <= x <= MAZE_PADDING_LEFT + MAZE_SIZE and MAZE_PADDING_TOP <= y <= MAZE_PADDING_TOP + MAZE_SIZE\
-                        and app_state != AppState.FINISHED:
-                    maze.click_box(x, y, event.button)
+                        and not solve_job and (app_state != AppState.FINISHED or replanning):
+                    point_moved = maze.click_box(x, y, event.button)
+
+                    # Moving a point after an instant solve repairs the planner's search and shows the new path
+                    if replanning and point_moved:
+                        maze.clear_path(optimal_path)
+                        optimal_path = array('I')
+
+                        app_state = AppState.TRAVERSING
+                        solve_progressively = False
+                        solve_job, planner = start_solve(maze=maze, algorithm=algorithm, instant=True, planner=planner, count=show_counters)
+
+        # Cancelling drops the running solve and whatever it drew so far
+        if cancel_requested and solve_job:
+            solve_job.cancel()
+            solve_job = None
+            replanning = False
+            app_state = AppState.MAZE_LOADED
+            is_maze_drawing = False
+            maze.reset_view()
+
+            for stat in all_stats_values:
+                stat.text = ""
+            exec_time_value.text = "Cancelled"
 
         # enabling/disabling buttons based on state
         upload_button.set_enabled(app_state == AppState.MAZE_NOT_LOADED)
         preload_button.set_enabled(app_state == AppState.MAZE_NOT_LOADED)
         unload_button.set_enabled(app_state in (AppState.MAZE_LOADED, AppState.FINISHED))
+        cancel_button.set_enabled(solve_job is not None)
         draw_progressively_button.set_enabled(app_state != AppState.MAZE_NOT_LOADED)
         draw_solution_instantly_button.set_enabled(app_state != AppState.MAZE_NOT_LOADED)
-        dijkstras_button.set_enabled(algorithm == Algorithm_Choice.A_STAR and app_state != AppState.MAZE_NOT_LOADED)
-        a_star_button.set_enabled(algorithm == Algorithm_Choice.DIJKSTRAS and app_state != AppState.MAZE_NOT_LOADED)
+        for choice, button in algorithm_buttons.items():
+            button.set_enabled(algorithm != choice and app_state != AppState.MAZE_NOT_LOADED)
         # we can add more buttons and enable/disabled them whenever
 
         # maze_drawer is the generator called from visualize_progressively
         if is_maze_drawing:
-            is_maze_drawing = next(maze_animator)
+            # Profiled frame by frame; snapshotting the heap every frame would stall the animation
+            with profiling.phase("render traversal", allocations=False):
+                is_maze_drawing = next(maze_animator)
 
-        # Draw all buttons regardless of state
+        # Draw all buttons that changed
         for button in all_buttons: 
             button.draw()
         
+        # Widgets only paint what changed since their last draw
         for stat_values in all_stats_values:
-            stat_values.clear()
             stat_values.draw()
 
+        if show_counters:
+            counters_value.draw()
+
         if error_message:
             error_message.draw()
 
-        clock.tick(target_frame_rate)
+        clock.tick(ANIMATION_FRAME_RATE)
+
+        # Only what changed this frame reaches the display
+        dirty_rects.present()
 
-        pygame.display.flip()
+    if solve_job:
+        solve_job.cancel()
+    if planner:
+        planner.stop()
 
     pygame.quit()
     sys.exit()
@@ -0,0 +1,124 @@
+import heapq
+import os
+from array import array
+from itertools import chain
+from multiprocessing import Pool
+from grid import MazeGrid
+from AdjacencyList import SplicedGraph
+from Algorithms import UNREACHED
+import paths
+
+'''
+Batch queries: many (start, end) pairs against one loaded maze.
+The corridor graph is built once in the calling process and handed to every worker when the pool starts, so each
+query only splices its two points into the shared graph and searches it. The grid itself is never modified.
+'''
+
+# Queries handed to a worker at a time; large enough that pickling results back is not per-query overhead
+CHUNK_SIZE = 64
+
+# The maze each pool worker answers queries on, set once by `init_worker`
+worker_grid: MazeGrid|None = None
+
+def solve_batch(grid: MazeGrid, pairs: list[tuple[tuple[int, int], tuple[int, int]]], return_paths: bool = False,
+                processes: int|None = None) -> list:
+    '''
+    Answers every (start_coord, end_coord) pair in `pairs`, in order.
+    Returns a list of path lengths (steps from start to end, None when the end cannot be reached), or of
+    (length, path) tuples with `return_paths`, where path is the array('I') of cell indices like the solvers return.
+    `processes` defaults to the number of cores; with 1 the queries run in this process
+    '''
+    # Build the shared preprocessing once, before any worker exists
+    grid.corridor_graph()
+
+    processes = processes or os.cpu_count() or 1
+
+    if processes == 1 or len(pairs) <= CHUNK_SIZE:
+        return [solve_query(grid, start, end, return_paths) for start, end in pairs]
+
+    with Pool(processes, initializer=init_worker, initargs=(grid.snapshot(),)) as pool:
+        return pool.starmap(worker_query, ((start, end, return_paths) for start, end in pairs), chunksize=CHUNK_SIZE)
+
+def init_worker(grid: MazeGrid):
+    global worker_grid
+    worker_grid = grid
+
+def worker_query(start: tuple[int, int], end: tuple[int, int], return_paths: bool):
+    return solve_query(worker_grid, start, end, return_paths)
+
+def solve_query(grid: MazeGrid, start: tuple[int, int], end: tuple[int, int], return_paths: bool):
+    '''
+    Answers one query: a length, or (length, path) with `return_paths`
+    '''
+    for row, col in (start, end):
+        if not (0 <= row < grid.rows and 0 <= col < grid.cols) or grid.is_wall(row, col):
+            raise Exception(f"Query point {(row, col)} is not an open cell of the maze")
+
+    graph, start_id, end_id = grid.splice_terminals(start, end)
+    length, vertex_path = corridor_search(graph, start_id, end_id, grid.cols)
+
+    if not return_paths:
+        return length
+
+    # Expand the graph points of the path into every cell along it
+    return length, paths.expand(array('I', map(graph.cell, vertex_path)), grid.cols)
+
+def corridor_search(graph: SplicedGraph, start_id: int, end_id: int, cols: int) -> tuple[int|None, list[int]]:
+    '''
+    A* over the spliced corridor graph. Every edge is a straight corridor, so the Manhattan distance between two
+    vertices never exceeds the path length between them and the first time the end is popped its distance is final.
+    The packed arrays are read directly; only the few spliced vertices and edges go through the overlay.
+    Returns (distance, vertex path), or (None, []) if the end cannot be reached
+    '''
+    packed = graph.graph
+    offsets, targets, weights, vertex_cells = packed.offsets, packed.targets, packed.weights, packed.vertex_cells
+    base_vertices, extra_edges = graph.base_vertices, graph.extra_edges
+
+    vertices = graph.get_vertices()
+    end_row, end_col = divmod(graph.cell(end_id), cols)
+    start_row, start_col = divmod(graph.cell(start_id), cols)
+
+    g_scores = array('i', [UNREACHED]) * vertices
+    f_scores = array('i', [UNREACHED]) * vertices
+    parents = array('i', [-1]) * vertices
+    g_scores[start_id] = 0
+    f_scores[start_id] = abs(start_row - end_row) + abs(start_col - end_col)
+
+    # min heap of packed (f_score, vertex) entries
+    frontier = [f_scores[start_id] * vertices + start_id]
+    heappush, heappop = heapq.heappush, heapq.heappop
+
+    while frontier:
+        cur_f, cur = divmod(heappop(frontier), vertices)
+
+        if cur == end_id:
+            path = [cur]
+            while parents[cur] != -1:
+                cur = parents[cur]
+                path.append(cur)
+            path.reverse()
+
+            return g_scores[end_id], path
+
+        if cur_f > f_scores[cur]: # Stale entry; a shorter way here was found after it was pushed
+            continue
+
+        cur_g = g_scores[cur]
+        edges = extra_edges.get(cur, [])
+        if cur < base_vertices:
+            first, last = offsets[cur], offsets[cur + 1]
+            edges = chain(zip(targets[first:last], weights[first:last]), edges)
+
+        for neighbor, weight in edges:
+            new_g = cur_g + weight
+
+            if new_g < g_scores[neighbor]:
+                row, col = divmod(vertex_cells[neighbor] if neighbor < base_vertices else graph.cell(neighbor), cols)
+                new_f = new_g + abs(row - end_row) + abs(col - end_col)
+
+                g_scores[neighbor] = new_g
+                f_scores[neighbor] = new_f
+                parents[neighbor] = cur
+                heappush(frontier, new_f * vertices + neighbor)
+
+    return None, []
@@ -0,0 +1,114 @@
+'''
+Times the flat-index A* against the coordinate/dict based A* it replaced, and checks both explore the same cells.
+Run from the repository root: python -m benchmarks.astar [maze paths...]
+'''
+import argparse
+import heapq
+from time import perf_counter
+from grid import MazeGrid, WALL
+from maze_io import load_maze
+import Algorithms
+
+DEFAULT_MAZES = ["PreMade_Mazes/1000x1000_Maze.csv", "PreMade_Mazes/750x750_Maze.csv", "PreMade_Mazes/500x500_Maze1.csv"]
+REPEATS = 3
+
+def tuple_a_star(maze: MazeGrid):
+    '''
+    The previous A*: a dict of g-scores over every cell, a fresh neighbor list per pop and (f, (row, col)) heap entries
+    '''
+    start_time = perf_counter()
+
+    cells, rows, cols = maze.cells, maze.rows, maze.cols
+    start, end = maze.start_coord, maze.end_coord
+
+    g_scores = {(row, col): float('inf') for row in range(rows) for col in range(cols)}
+    g_scores[start] = 0
+
+    frontier = [(Algorithms.heuristic(start, end), start)]
+    predecessors = {}
+    explored = []
+    endFound = False
+
+    while frontier:
+        cur_f, cur_node = heapq.heappop(frontier)
+        explored.append(cur_node)
+
+        if cur_node == end:
+            endFound = True
+            break
+
+        if cur_f > g_scores[cur_node] + Algorithms.heuristic(cur_node, end):
+            continue
+
+        row, col = cur_node
+        nbors = []
+        if row > 0:
+            nbors.append((row - 1, col))
+        if row < rows - 1:
+            nbors.append((row + 1, col))
+        if col > 0:
+            nbors.append((row, col - 1))
+        if col < cols - 1:
+            nbors.append((row, col + 1))
+
+        for neighbor in nbors:
+            if cells[neighbor[0] * cols + neighbor[1]] == WALL:
+                continue
+
+            n_g = g_scores[cur_node] + 1
+            if n_g < g_scores[neighbor]:
+                g_scores[neighbor] = n_g
+                heapq.heappush(frontier, (n_g + Algorithms.heuristic(neighbor, end), neighbor))
+                predecessors[neighbor] = cur_node
+
+    solve_time = perf_counter() - start_time
+
+    if not endFound:
+        return explored, [], solve_time
+
+    final_path = [end]
+    node = end
+    while node in predecessors:
+        node = predecessors[node]
+        final_path.append(node)
+
+    return explored, list(reversed(final_path)), solve_time
+
+def best_run(solver, maze: MazeGrid):
+    '''
+    Best wall-clock time of `REPEATS` runs (including result conversion) and the last result
+    '''
+    best = float("inf")
+
+    for _ in range(REPEATS):
+        start_time = perf_counter()
+        result = solver(maze)
+        best = min(best, perf_counter() - start_time)
+
+    return best, result
+
+def same_cells(maze: MazeGrid, coords: list[tuple[int, int]], inds) -> bool:
+    '''
+    Whether the (row, col) coordinates of the tuple A* are the flat cell indices of the current one, in order
+    '''
+    return [maze.index(row, col) for row, col in coords] == list(inds)
+
+def main():
+    parser = argparse.ArgumentParser(description="Time the flat-index A* against the tuple A* it replaced")
+    parser.add_argument("mazes", nargs="*", default=DEFAULT_MAZES, help="maze files (default: %(default)s)")
+    args = parser.parse_args()
+    paths = args.mazes
+
+    print(f"{'maze':<40}{'tuple A*':>12}{'flat A*':>12}{'speedup':>10}  explored  path  same order")
+
+    for path in paths:
+        maze = load_maze(path)
+
+        old_time, (old_explored, old_path, _) = best_run(tuple_a_star, maze)
+        new_time, (new_explored, new_path, _) = best_run(Algorithms.a_star, maze)
+
+        print(f"{path:<40}{old_time * 1000:>10.1f}ms{new_time * 1000:>10.1f}ms{old_time / new_time:>9.1f}x"
+              f"  {len(new_explored):>8}  {len(new_path) - 1:>4}  {same_cells(maze, old_explored, new_explored) and same_cells(maze, old_path, new_path)}")
+
+if __name__ == "__main__":
+    main()
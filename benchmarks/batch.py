@@ -0,0 +1,58 @@
+'''
+Measures query throughput of `batch.solve_batch` for 1..N worker processes against the one-at-a-time way
+(move start/end, call `Algorithms.Dijkstra`) on seeded random pairs of open cells.
+Run from the repository root: python -m benchmarks.batch [maze path] [queries]
+'''
+import argparse
+import os
+import random
+from time import perf_counter
+from grid import OPEN
+from maze_io import load_maze
+import Algorithms
+import batch
+
+DEFAULT_MAZE = "PreMade_Mazes/1000x1000_Maze.csv"
+SEED = 42
+# The one-at-a-time baseline is slow; time it on a slice of the queries only
+BASELINE_QUERIES = 10
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure batch query throughput for 1..N worker processes")
+    parser.add_argument("maze", nargs="?", default=DEFAULT_MAZE, help="maze file (default: %(default)s)")
+    parser.add_argument("queries", nargs="?", type=int, default=500, help="random start/end pairs (default: %(default)s)")
+    args = parser.parse_args()
+    path, queries = args.maze, args.queries
+
+    maze = load_maze(path)
+    open_cells = [maze.coord(ind) for ind in range(maze.rows * maze.cols) if maze.cells[ind] == OPEN]
+    rng = random.Random(SEED)
+    pairs = [tuple(rng.sample(open_cells, 2)) for _ in range(queries)]
+
+    start = perf_counter()
+    maze.corridor_graph()
+    print(f"{path}: corridor graph built once in {perf_counter() - start:.3f}s, {queries} queries")
+
+    baseline = []
+    start = perf_counter()
+    for start_coord, end_coord in pairs[:BASELINE_QUERIES]:
+        maze.set_start(start_coord)
+        maze.set_end(end_coord)
+        baseline.append(len(Algorithms.Dijkstra(maze)[1]) - 1)
+    baseline_rate = BASELINE_QUERIES / (perf_counter() - start)
+    print(f"{'one at a time (Dijkstra)':<28}{baseline_rate:10.1f} queries/s")
+
+    processes = 1
+    while processes <= (os.cpu_count() or 1) * 2:
+        start = perf_counter()
+        lengths = batch.solve_batch(maze, pairs, processes=processes)
+        rate = queries / (perf_counter() - start)
+
+        if lengths[:BASELINE_QUERIES] != baseline:
+            raise RuntimeError("Batch lengths differ from Dijkstra")
+
+        print(f"{f'batch, {processes} process(es)':<28}{rate:10.1f} queries/s")
+        processes *= 2
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+'''
+Builds a contraction hierarchy and compares its queries against A* over the corridor graph (`batch.solve_query`)
+on seeded random pairs of open cells: vertices settled, time per query, and full unpacked paths.
+Run from the repository root: python -m benchmarks.contraction [maze path] [pairs]
+'''
+import argparse
+import random
+from time import perf_counter
+from grid import OPEN
+from maze_io import load_maze
+import batch
+import contraction
+
+DEFAULT_MAZE = "PreMade_Mazes/1000x1000_Maze.csv"
+SEED = 42
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare contraction hierarchy queries against A* over the corridor graph")
+    parser.add_argument("maze", nargs="?", default=DEFAULT_MAZE, help="maze file (default: %(default)s)")
+    parser.add_argument("pairs", nargs="?", type=int, default=50, help="random start/end pairs (default: %(default)s)")
+    args = parser.parse_args()
+    path, pairs = args.maze, args.pairs
+
+    maze = load_maze(path)
+    graph = maze.corridor_graph()
+
+    start = perf_counter()
+    hierarchy = contraction.build_hierarchy(maze)
+    build_time = perf_counter() - start
+
+    print(f"== {path}: {graph.get_vertices()} vertices, {graph.get_edges()} edges")
+    print(f"hierarchy built in {build_time:.2f}s, {hierarchy.get_shortcuts()} shortcuts")
+
+    open_cells = [maze.coord(ind) for ind in range(maze.rows * maze.cols) if maze.cells[ind] == OPEN]
+    rng = random.Random(SEED)
+    queries = [tuple(rng.sample(open_cells, 2)) for _ in range(pairs)]
+
+    settled = []
+    timings = {"A* length": 0.0, "CH length": 0.0, "A* path": 0.0, "CH path": 0.0}
+
+    for start_coord, end_coord in queries:
+        start = perf_counter()
+        length = batch.solve_query(maze, start_coord, end_coord, False)
+        timings["A* length"] += perf_counter() - start
+
+        start = perf_counter()
+        ch_length, _, ch_settled = contraction.query(hierarchy, maze, start_coord, end_coord, return_path=False)
+        timings["CH length"] += perf_counter() - start
+
+        start = perf_counter()
+        _, a_path = batch.solve_query(maze, start_coord, end_coord, True)
+        timings["A* path"] += perf_counter() - start
+
+        start = perf_counter()
+        _, ch_path, _ = contraction.query(hierarchy, maze, start_coord, end_coord)
+        timings["CH path"] += perf_counter() - start
+
+        if length != ch_length or len(a_path) != len(ch_path):
+            raise RuntimeError(f"Results differ for {start_coord} -> {end_coord}: A* {length}, CH {ch_length}")
+
+        settled.append(ch_settled)
+
+    print(f"CH settled per query: mean {sum(settled) / len(settled):.0f}, max {max(settled)}")
+    for name, total in timings.items():
+        print(f"{name:<10} {total / pairs * 1000:9.2f} ms/query")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+'''
+Generates one maze per algorithm, streams each to CSV and to the binary format, and loads both files back:
+carve time, write time and file size per format, load time per format, and the peak memory of generating and
+writing (tracemalloc, in a separate run since tracing slows carving down many times) next to the size of the cells.
+Run from the repository root: python -m benchmarks.generator [size] [loops]
+'''
+import argparse
+import os
+import tempfile
+import tracemalloc
+from time import perf_counter
+from maze_io import load_maze, stream_csv, stream_binary
+import generator
+
+DEFAULT_SIZE = 1001
+SEED = 42
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate, write and load back one maze per algorithm")
+    parser.add_argument("size", nargs="?", type=int, default=DEFAULT_SIZE, help="maze width and height (default: %(default)s)")
+    parser.add_argument("loops", nargs="?", type=float, default=0.0, help="fraction of dead ends opened into loops (default: %(default)s)")
+    args = parser.parse_args()
+    size, loops = args.size, args.loops
+
+    print(f"== {size}x{size} mazes, loops {loops}: {size * size / 2**20:.1f} MiB of cells")
+    print(f"{'algorithm':<13}{'carve s':>9}{'csv s':>8}{'csv MiB':>9}{'load s':>8}{'bin s':>8}{'load s':>8}{'peak MiB':>10}")
+
+    with tempfile.TemporaryDirectory() as directory:
+        csv_path = os.path.join(directory, "maze.csv")
+        binary_path = os.path.join(directory, "maze.maze")
+
+        for algorithm in generator.ALGORITHMS:
+            start = perf_counter()
+            passages = generator.carve(size, size, algorithm, SEED, loops)
+            carve_time = perf_counter() - start
+
+            start = perf_counter()
+            stream_csv(csv_path, size, generator.render_rows(passages, size, size))
+            csv_time = perf_counter() - start
+
+            start = perf_counter()
+            stream_binary(binary_path, size, size, *generator.end_points(size, size),
+                          generator.render_rows(passages, size, size))
+            binary_time = perf_counter() - start
+
+            del passages
+
+            tracemalloc.start()
+            generator.generate_file(binary_path, size, size, algorithm, SEED, loops)
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+
+            start = perf_counter()
+            csv_grid = load_maze(csv_path)
+            csv_load = perf_counter() - start
+
+            start = perf_counter()
+            binary_grid = load_maze(binary_path)
+            binary_load = perf_counter() - start
+
+            if bytes(csv_grid.cells) != bytes(binary_grid.cells):
+                raise RuntimeError(f"{algorithm}: CSV and binary files hold different mazes")
+            del csv_grid, binary_grid # release the mapping before the file is replaced
+
+            print(f"{algorithm:<13}{carve_time:>9.2f}{csv_time:>8.2f}{os.path.getsize(csv_path) / 2**20:>9.1f}"
+                  f"{csv_load:>8.2f}{binary_time:>8.2f}{binary_load:>8.3f}{peak / 2**20:>10.1f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+'''
+Times building the corridor graph from one vectorized classification pass (`MazeGrid.build_corridor_graph`)
+against the per-cell corridor walk it replaced, and checks both give the same packed graph. The build time is printed
+next to its target, tens of milliseconds for a million cells (TARGET_SECONDS) scaled to the maze's size, which it
+does not reach.
+Run from the repository root: python -m benchmarks.graph_build [maze paths...]
+'''
+import argparse
+from collections import deque
+from time import perf_counter
+from AdjacencyList import AdjacencyList
+from grid import MazeGrid, WALL
+from maze_io import load_maze
+
+# Build time the vectorized builder was meant to reach on a 1000x1000 maze (TARGET_CELLS), scaled by cell count
+TARGET_SECONDS = 0.05
+TARGET_CELLS = 1000 * 1000
+
+DEFAULT_MAZES = ["PreMade_Mazes/500x500_Maze1.csv", "PreMade_Mazes/750x750_Maze.csv", "PreMade_Mazes/1000x1000_Maze.csv"]
+
+# == The previous builder: classifies cells one at a time while walking every corridor == #
+def get_adjacent(grid: MazeGrid, start_point: tuple):
+    y,x = start_point
+    adjacents = list()
+    for ny, nx in ((y, x + 1), (y, x - 1), (y + 1, x), (y - 1, x)):
+        if (nx < 0 or ny < 0
+            or nx >= grid.cols or ny >= grid.rows
+            or grid.cells[ny * grid.cols + nx] == WALL):
+            continue
+        adjacents.append((ny, nx))
+    return adjacents
+
+def is_valid_graph_point(center: tuple, adjacents: list[tuple[int,int]]):
+    y,x = center
+
+    if len(adjacents) >= 3 or len(adjacents) == 1:
+        return True
+    if len(adjacents) == 2:
+        (uy, ux), (vy, vx) = adjacents
+        if ux - x + vx - x != 0 or uy - y + vy - y != 0:
+            return True
+    return False
+
+def walk_corridors(grid: MazeGrid, graph: AdjacencyList, start_point, bfs_queue: deque, visited: set):
+    start_y, start_x = start_point
+    for dy, dx in ((0, 1), (0, -1), (1, 0), (-1, 0)):
+        current_x = start_x + dx
+        current_y = start_y + dy
+        distance = 1
+        if (current_x < 0 or current_y < 0
+                or current_x >= grid.cols or current_y >= grid.rows
+                or grid.cells[current_y * grid.cols + current_x] == WALL):
+            continue
+
+        while True:
+            if is_valid_graph_point((current_y, current_x), get_adjacent(grid, (current_y, current_x))):
+                if (current_y,current_x) not in visited:
+                    visited.add((current_y,current_x))
+                    bfs_queue.append((current_y, current_x))
+
+                graph.add_connection((start_y, start_x), (current_y,current_x), distance)
+                break
+
+            next_x, next_y = current_x + dx, current_y + dy
+            if (next_x < 0 or next_y < 0
+                    or next_x >= grid.cols or next_y >= grid.rows
+                    or grid.cells[next_y * grid.cols + next_x] == WALL):
+                break
+
+            current_x, current_y = next_x, next_y
+            distance += 1
+
+def walked_adjacency(grid: MazeGrid) -> AdjacencyList:
+    '''
+    The corridor graph as the corridor walk built it: every corridor is walked from both of its ends
+    '''
+    graph = AdjacencyList()
+    visited = set()
+    q = deque()
+    for row in range(grid.rows):
+        for col in range(grid.cols):
+            if (grid.cells[row * grid.cols + col] == WALL or (row, col) in visited
+                    or not is_valid_graph_point((row, col), get_adjacent(grid, (row, col)))):
+                continue
+
+            visited.add((row, col))
+            q.append((row, col))
+            while q:
+                walk_corridors(grid, graph, q.popleft(), q, visited)
+
+    return graph
+
+def walked_graph(grid: MazeGrid):
+    return walked_adjacency(grid).finalize(grid.cols)
+
+def measure(path: str):
+    grid = load_maze(path)
+
+    start = perf_counter()
+    walked = walked_graph(grid)
+    walked_time = perf_counter() - start
+
+    start = perf_counter()
+    classified = grid.build_corridor_graph()
+    classified_time = perf_counter() - start
+
+    target = TARGET_SECONDS * grid.rows * grid.cols / TARGET_CELLS
+
+    for name in ("offsets", "targets", "weights", "steps", "vertex_cells"):
+        if getattr(walked, name) != getattr(classified, name):
+            raise RuntimeError(f"{path}: graphs differ in {name}")
+
+    print(f"{path:<40} V {classified.get_vertices():>7}  walked {walked_time:7.3f}s  "
+          f"classified {classified_time:7.3f}s (target {target:.3f}s, "
+          f"{'met' if classified_time <= target else 'missed'})  {walked_time / classified_time:6.1f}x")
+
+def main():
+    parser = argparse.ArgumentParser(description="Time the vectorized corridor graph build against the per-cell corridor walk")
+    parser.add_argument("mazes", nargs="*", default=DEFAULT_MAZES, help="maze files (default: %(default)s)")
+    args = parser.parse_args()
+    for path in args.mazes:
+        measure(path)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,46 @@
+'''
+Reports the memory per vertex and per edge of the corridor graph: the dict/tuple `AdjacencyList` the per-cell
+corridor walk built before the packed graph existed (`benchmarks.graph_build.walked_adjacency`, which lists every
+corridor from both of its ends), against the `CSRGraph` the solvers use.
+Run from the repository root: python -m benchmarks.graph_memory [maze paths...]
+'''
+import argparse
+import tracemalloc
+from maze_io import load_maze
+from benchmarks.graph_build import walked_adjacency
+
+DEFAULT_MAZES = ["PreMade_Mazes/500x500_Maze1.csv", "PreMade_Mazes/750x750_Maze.csv", "PreMade_Mazes/1000x1000_Maze.csv"]
+
+def measure(path: str):
+    '''
+    Prints vertex/edge counts and bytes for both graph forms of the maze at `path`
+    '''
+    maze = load_maze(path)
+    graph = maze.corridor_graph()
+
+    # Only what the graph keeps is counted: the walk's visited set and queue are gone once it returns
+    tracemalloc.start()
+    adjacency = walked_adjacency(maze)
+    adjacency_bytes = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    listed_edges = sum(len(connections) for connections in adjacency.graph.values())
+
+    vertices, edges = graph.get_vertices(), graph.get_edges()
+
+    print(f"== {path}")
+    print(f"vertices {vertices}, edges {edges} (adjacency list held {listed_edges} directed entries, CSR {len(graph.targets)})")
+    print(f"{'':<15}{'total':>12}{'B/vertex':>10}{'B/edge':>10}")
+    for name, total in (("AdjacencyList", adjacency_bytes), ("CSRGraph", graph.nbytes())):
+        print(f"{name:<15}{total:>12}{total / vertices:>10.1f}{total / edges:>10.1f}")
+    print(f"reduction: {adjacency_bytes / graph.nbytes():.1f}x")
+
+def main():
+    parser = argparse.ArgumentParser(description="Report the memory per vertex and per edge of the corridor graph")
+    parser.add_argument("mazes", nargs="*", default=DEFAULT_MAZES, help="maze files (default: %(default)s)")
+    args = parser.parse_args()
+    for path in args.mazes:
+        measure(path)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+'''
+Replays a seeded interactive session (the start dragged a few cells at a time, then the end, with occasional wall
+toggles) and compares the incremental planner's repairs against solving every step from scratch with A*:
+cells processed and time per solve, by kind of change.
+Run from the repository root: python -m benchmarks.incremental [maze path] [steps per phase]
+'''
+import argparse
+import random
+from grid import OPEN, WALL
+from maze_io import load_maze
+from incremental import IncrementalPlanner
+import Algorithms
+
+DEFAULT_MAZE = "PreMade_Mazes/1000x1000_Maze.csv"
+SEED = 42
+# Farthest a dragged point moves (in rows and in columns) between two solves
+DRAG_STEP = 5
+
+def drag(maze, coord, rng):
+    '''
+    An open cell near `coord` that is neither end point
+    '''
+    row, col = coord
+    nearby = [
+        (row + d_row, col + d_col) for d_row in range(-DRAG_STEP, DRAG_STEP + 1) for d_col in range(-DRAG_STEP, DRAG_STEP + 1)
+        if 0 <= row + d_row < maze.rows and 0 <= col + d_col < maze.cols
+    ]
+    nearby = [cell for cell in nearby if not maze.is_wall(*cell) and cell not in (maze.start_coord, maze.end_coord)]
+
+    return rng.choice(nearby) if nearby else coord
+
+def toggle_wall(maze, rng):
+    '''
+    Flips a random interior cell between wall and open
+    '''
+    while True:
+        cell = (rng.randrange(1, maze.rows - 1), rng.randrange(1, maze.cols - 1))
+        if cell not in (maze.start_coord, maze.end_coord):
+            break
+
+    maze.set_cell(*cell, OPEN if maze.is_wall(*cell) else WALL)
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare incremental planner repairs against solving every step from scratch")
+    parser.add_argument("maze", nargs="?", default=DEFAULT_MAZE, help="maze file (default: %(default)s)")
+    parser.add_argument("steps", nargs="?", type=int, default=10, help="steps per phase (default: %(default)s)")
+    args = parser.parse_args()
+    path, steps = args.maze, args.steps
+
+    maze = load_maze(path)
+    rng = random.Random(SEED)
+
+    open_cells = [maze.coord(ind) for ind in range(maze.rows * maze.cols) if maze.cells[ind] == OPEN]
+    start_coord, end_coord = rng.sample(open_cells, 2)
+    maze.set_start(start_coord)
+    maze.set_end(end_coord)
+
+    planner = IncrementalPlanner(maze)
+
+    # kind of change -> [solves, incremental cells, incremental time, A* cells, A* time]
+    totals = {}
+
+    def solve(kind):
+        explored, final_path, solve_time = planner.solve(maze)
+        a_explored, a_path, a_time = Algorithms.a_star(maze)
+
+        if len(final_path) != len(a_path):
+            raise RuntimeError(f"Path lengths differ after {kind}: incremental {len(final_path) - 1}, A* {len(a_path) - 1}")
+
+        total = totals.setdefault(kind, [0, 0, 0.0, 0, 0.0])
+        total[0] += 1
+        total[1] += len(explored)
+        total[2] += solve_time
+        total[3] += len(a_explored)
+        total[4] += a_time
+
+    solve("first solve")
+
+    for _ in range(steps):
+        maze.set_start(drag(maze, maze.start_coord, rng))
+        solve("start moved")
+
+    for _ in range(steps):
+        maze.set_end(drag(maze, maze.end_coord, rng))
+        solve("end moved")
+
+    for _ in range(steps):
+        toggle_wall(maze, rng)
+        solve("wall toggled")
+
+    print(f"== {path}: {steps} solves per change")
+    print(f"{'change':<14}{'incremental cells':>19}{'ms':>9}{'A* cells':>11}{'ms':>9}")
+    for kind, (solves, cells, inc_time, a_cells, a_time) in totals.items():
+        print(f"{kind:<14}{cells // solves:>19}{inc_time / solves * 1000:>9.1f}{a_cells // solves:>11}{a_time / solves * 1000:>9.1f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+'''
+Compares nodes expanded (heap pops) and solve time of Jump Point Search against A* on seeded random start/end pairs.
+Run from the repository root: python -m benchmarks.jps [maze path] [pairs]
+'''
+import argparse
+import heapq
+import random
+from grid import OPEN
+from maze_io import load_maze
+from grid import MazeGrid
+import Algorithms
+
+DEFAULT_MAZE = "PreMade_Mazes/250x250_maze_connected.csv"
+SEED = 42
+
+def count_pops(solver, maze):
+    '''
+    Runs `solver`, counting heap pops by wrapping `heapq.heappop` for the duration of the call
+    '''
+    pops = 0
+    real_heappop = heapq.heappop
+
+    def counting_heappop(heap):
+        nonlocal pops
+        pops += 1
+        return real_heappop(heap)
+
+    heapq.heappop = counting_heappop
+    try:
+        explored, path, solve_time = solver(maze)
+    finally:
+        heapq.heappop = real_heappop
+
+    return pops, len(path) - 1, solve_time
+
+def compare(maze, pairs: int):
+    '''
+    Prints pops for `pairs` random start/end pairs on `maze` and the totals for both solvers
+    '''
+    open_cells = [maze.coord(ind) for ind in range(maze.rows * maze.cols) if maze.cells[ind] == OPEN]
+    rng = random.Random(SEED)
+
+    totals = {"A*": [0, 0.0], "JPS": [0, 0.0]}
+
+    print(f"{'start':>12}{'end':>12}{'length':>8}{'A* pops':>10}{'JPS pops':>10}")
+
+    for _ in range(pairs):
+        start, end = rng.sample(open_cells, 2)
+        maze.set_start(start)
+        maze.set_end(end)
+
+        a_pops, a_length, a_time = count_pops(Algorithms.a_star, maze)
+        j_pops, j_length, j_time = count_pops(Algorithms.jump_point_search, maze)
+
+        if a_length != j_length:
+            raise RuntimeError(f"Path lengths differ for {start} -> {end}: A* {a_length}, JPS {j_length}")
+
+        totals["A*"][0] += a_pops
+        totals["A*"][1] += a_time
+        totals["JPS"][0] += j_pops
+        totals["JPS"][1] += j_time
+
+        print(f"{str(start):>12}{str(end):>12}{a_length:>8}{a_pops:>10}{j_pops:>10}")
+
+        # Put the cells back so the next pair starts from the loaded maze
+        maze.cells[maze.index(*start)] = OPEN
+        maze.cells[maze.index(*end)] = OPEN
+        maze.start_coord = maze.end_coord = (-1, -1)
+
+    for name, (pops, solve_time) in totals.items():
+        print(f"{name:<4} total pops {pops:>9}  total solve time {solve_time:.3f}s")
+    print(f"A* / JPS pops: {totals['A*'][0] / max(totals['JPS'][0], 1):.1f}x")
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare Jump Point Search against A* on random start/end pairs")
+    parser.add_argument("maze", nargs="?", default=DEFAULT_MAZE, help="maze file (default: %(default)s)")
+    parser.add_argument("pairs", nargs="?", type=int, default=20, help="random start/end pairs (default: %(default)s)")
+    args = parser.parse_args()
+    path, pairs = args.maze, args.pairs
+
+    print(f"== {path}")
+    compare(load_maze(path), pairs)
+
+    # An obstacle-free room of the same size: the case jump points are built for
+    room = load_maze(path)
+    room = MazeGrid(room.rows, room.cols, bytearray(room.rows * room.cols))
+    print(f"== open {room.rows}x{room.cols} room")
+    compare(room, pairs)
+
+if __name__ == "__main__":
+    main()
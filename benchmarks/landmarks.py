@@ -0,0 +1,74 @@
+'''
+Compares nodes expanded (cells popped) and solve time of A* with the landmark (ALT) heuristic against A* with
+Manhattan distance on seeded random start/end pairs, after building, saving and reloading the landmark index.
+Run from the repository root: python -m benchmarks.landmarks [maze path] [pairs] [landmarks]
+'''
+import argparse
+import os
+import random
+import tempfile
+from time import perf_counter
+from grid import OPEN
+from maze_io import load_maze
+from landmarks import build_landmarks, save_landmarks, load_landmarks, DEFAULT_LANDMARKS
+import Algorithms
+
+DEFAULT_MAZE = "PreMade_Mazes/1000x1000_Maze.csv"
+SEED = 42
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare A* with the landmark heuristic against A* with Manhattan distance")
+    parser.add_argument("maze", nargs="?", default=DEFAULT_MAZE, help="maze file (default: %(default)s)")
+    parser.add_argument("pairs", nargs="?", type=int, default=20, help="random start/end pairs (default: %(default)s)")
+    parser.add_argument("landmarks", nargs="?", type=int, default=DEFAULT_LANDMARKS, help="landmarks to build (default: %(default)s)")
+    args = parser.parse_args()
+    path, pairs, count = args.maze, args.pairs, args.landmarks
+
+    maze = load_maze(path)
+
+    start = perf_counter()
+    built = build_landmarks(maze, count)
+    build_time = perf_counter() - start
+
+    with tempfile.TemporaryDirectory() as directory:
+        index_path = os.path.join(directory, "maze.alt")
+        save_landmarks(built, index_path)
+        index = load_landmarks(index_path)
+
+        print(f"== {path}: {len(index.landmarks)} landmarks built in {build_time:.2f}s, "
+              f"{index.nbytes() / 2**20:.1f} MiB ({os.path.getsize(index_path)} bytes on disk)")
+
+        open_cells = [maze.coord(ind) for ind in range(maze.rows * maze.cols) if maze.cells[ind] == OPEN]
+        rng = random.Random(SEED)
+
+        totals = {"Manhattan": [0, 0.0], "ALT": [0, 0.0]}
+
+        print(f"{'start':>12}{'end':>12}{'length':>8}{'Manhattan':>11}{'ALT':>9}")
+
+        for _ in range(pairs):
+            start_coord, end_coord = rng.sample(open_cells, 2)
+            maze.set_start(start_coord)
+            maze.set_end(end_coord)
+
+            m_explored, m_path, m_time = Algorithms.a_star(maze)
+            l_explored, l_path, l_time = Algorithms.a_star_landmarks(maze, index)
+
+            if len(m_path) != len(l_path):
+                raise RuntimeError(f"Path lengths differ for {start_coord} -> {end_coord}: "
+                                   f"Manhattan {len(m_path) - 1}, ALT {len(l_path) - 1}")
+
+            totals["Manhattan"][0] += len(m_explored)
+            totals["Manhattan"][1] += m_time
+            totals["ALT"][0] += len(l_explored)
+            totals["ALT"][1] += l_time
+
+            print(f"{str(start_coord):>12}{str(end_coord):>12}{len(m_path) - 1:>8}{len(m_explored):>11}{len(l_explored):>9}")
+
+        del index # release the mapping before the directory is removed
+
+    for name, (expanded, solve_time) in totals.items():
+        print(f"{name:<10} total expanded {expanded:>9}  total solve time {solve_time:.3f}s")
+    print(f"Manhattan / ALT expanded: {totals['Manhattan'][0] / max(totals['ALT'][0], 1):.1f}x")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+'''
+Times the bulk CSV parser against the per-cell csv parser it replaced, on every file in `PreMade_Mazes/`.
+Run from the repository root: python -m benchmarks.loader
+'''
+import argparse
+import csv
+import os
+from time import perf_counter
+from constants import MAZE_SIZE
+from grid import OPEN, WALL, START, END
+from maze_io import maze_from_file
+
+MAZE_DIR = "PreMade_Mazes"
+REPEATS = 3
+
+def per_cell_maze_from_file(file):
+    '''
+    The previous loader: `csv.reader` over the lines twice and a `match` on every stripped, lowered cell
+    '''
+    lines = list(file)
+    rows = len(lines)
+
+    reader = csv.reader(lines)
+    cols = len(next(reader, []))
+
+    if rows < 2 or cols < 2 or rows != cols:
+        raise Exception(f"Maze must be square, at least 2x2. This maze has rows: {rows} cols: {cols}")
+    elif rows > MAZE_SIZE:
+        raise Exception(f"Maze cannot exceed maximum of {MAZE_SIZE}x{MAZE_SIZE}")
+
+    cells = bytearray(rows * cols)
+    start_coord = end_coord = (-1, -1)
+    starts = ends = 0
+
+    for row_ind, row in enumerate(csv.reader(lines)):
+        if len(row) != cols:
+            raise Exception(f"Every row must have {cols} blocks. Row {row_ind} has {len(row)}")
+
+        for col_ind, block_str in enumerate(row):
+            match (block_str.strip().lower()):
+                case ".":
+                    block_state = OPEN
+                case "#":
+                    block_state = WALL
+                case "s":
+                    block_state = START
+                    start_coord = (row_ind, col_ind)
+                    starts += 1
+                case "e":
+                    block_state = END
+                    end_coord = (row_ind, col_ind)
+                    ends += 1
+                case block_val:
+                    raise Exception(f"Unknown block value '{block_val}': row {row_ind} col {col_ind}")
+
+            cells[row_ind * cols + col_ind] = block_state
+
+    if starts > 1 or ends > 1:
+        raise Exception(f"No more than 1 start point or end point. This maze has starts: {starts}, ends: {ends}.")
+
+    return rows, cols, cells, start_coord, end_coord
+
+def best_time(loader, path: str):
+    '''
+    Best of `REPEATS` runs, plus the loader's result (or error message) for cross-checking
+    '''
+    best = float("inf")
+    result = None
+
+    for _ in range(REPEATS):
+        with open(path, "r") as maze_file:
+            start_time = perf_counter()
+            try:
+                result = loader(maze_file)
+            except Exception as load_exception:
+                result = str(load_exception)
+            best = min(best, perf_counter() - start_time)
+
+    return best, result
+
+def main():
+    argparse.ArgumentParser(description="Time the bulk CSV parser against the per-cell parser it replaced").parse_args()
+
+    print(f"{'maze':<36}{'per-cell':>12}{'bulk':>12}{'speedup':>10}  same result")
+
+    for file_name in sorted(os.listdir(MAZE_DIR)):
+        path = os.path.join(MAZE_DIR, file_name)
+
+        old_time, old_result = best_time(per_cell_maze_from_file, path)
+        new_time, new_result = best_time(lambda maze_file: maze_from_file(maze_file, max_size=MAZE_SIZE, square=True), path)
+
+        print(f"{file_name:<36}{old_time * 1000:>10.2f}ms{new_time * 1000:>10.2f}ms{old_time / new_time:>9.1f}x  {old_result == new_result}")
+
+if __name__ == "__main__":
+    main()
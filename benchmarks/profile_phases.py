@@ -0,0 +1,64 @@
+'''
+Profiles one maze headless, the way the GUI handles it: parsing it into the grid's cell buffer and the view buffer
+the maze surface reads from, drawing it, solving it and animating the traversal into an offscreen display, with
+every phase under `profiling`. Writes a profile dump per phase and
+summary.txt to the output directory (MAZE_PROFILE if set, ./profile otherwise) and prints the summary.
+Run from the repository root: python -m benchmarks.profile_phases maze.csv [--algorithm jps] [--output profile]
+'''
+import argparse
+import os
+
+# Render into an offscreen display unless a real one was asked for; must be set before pygame starts
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import pygame
+import Algorithms
+import profiling
+from animation import AnimationScheduler
+from app import visualize_progressively
+from constants import RES_WIDTH, RES_HEIGHT
+from maze import Maze
+from solve_worker import SolveJob
+
+SOLVERS = {
+    "astar": Algorithms.a_star_stream,
+    "dijkstra": Algorithms.Dijkstra_stream,
+    "bi-astar": Algorithms.a_star_bidirectional,
+    "bi-dijkstra": Algorithms.Dijkstra_bidirectional,
+    "jps": Algorithms.jump_point_search,
+}
+
+def main():
+    parser = argparse.ArgumentParser(description="Profile loading, graph building, solving and rendering one maze")
+    parser.add_argument("maze", help="maze CSV file with a start and an end point")
+    parser.add_argument("--algorithm", choices=SOLVERS, default="astar")
+    parser.add_argument("--output", default=profiling.environment_output() or profiling.DEFAULT_OUTPUT,
+                        help="directory for the profile dumps and summary")
+    parser.add_argument("--top", type=int, default=profiling.TOP_ENTRIES, help="functions and allocators listed per phase")
+    args = parser.parse_args()
+
+    profiling.enable(args.output, args.top)
+
+    pygame.init()
+    screen = pygame.display.set_mode((RES_WIDTH, RES_HEIGHT))
+
+    maze = Maze(open(args.maze, "r"), screen)
+    if maze.start_coord == (-1, -1) or maze.end_coord == (-1, -1):
+        raise Exception("Maze needs a start and an end point to be solved")
+
+    maze.draw()
+
+    # While profiling the job solves right away, under the solve phase, and keeps the explored batches to be drawn
+    solve_job = SolveJob(maze, SOLVERS[args.algorithm], args.algorithm, stream=True)
+
+    # The whole animation as one run in a single frame, where the GUI profiles it frame by frame
+    scheduler = AnimationScheduler(0, streaming=True)
+    scheduler.skip()
+    with profiling.phase("render traversal"):
+        for _ in visualize_progressively(maze, solve_job, scheduler):
+            pass
+
+    pygame.quit()
+
+if __name__ == "__main__":
+    main()
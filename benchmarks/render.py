@@ -0,0 +1,53 @@
+'''
+Times loading a maze into the GUI's `Maze` and full redraws of it (`Maze.draw`, then presenting the dirty area) into
+an offscreen display.
+Run from the repository root: python -m benchmarks.render [maze path] [redraws]
+'''
+import argparse
+import os
+from time import perf_counter
+
+# Render into an offscreen display unless a real one was asked for; must be set before pygame starts
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import pygame
+import dirty_rects
+from constants import RES_WIDTH, RES_HEIGHT
+from maze import Maze
+
+DEFAULT_MAZE = "PreMade_Mazes/1000x1000_Maze.csv"
+DEFAULT_REDRAWS = 20
+
+def main():
+    parser = argparse.ArgumentParser(description="Time loading a maze into the GUI and full redraws of it")
+    parser.add_argument("maze", nargs="?", default=DEFAULT_MAZE, help="maze file (default: %(default)s)")
+    parser.add_argument("redraws", nargs="?", type=int, default=DEFAULT_REDRAWS, help="timed full redraws (default: %(default)s)")
+    args = parser.parse_args()
+    maze_path, redraws = args.maze, args.redraws
+
+    pygame.init()
+    screen = pygame.display.set_mode((RES_WIDTH, RES_HEIGHT))
+
+    start = perf_counter()
+    maze = Maze(open(maze_path, "r"), screen)
+    load_time = perf_counter() - start
+
+    maze.draw() # warmup
+    dirty_rects.present()
+
+    samples = []
+    for _ in range(redraws):
+        start = perf_counter()
+        maze.draw()
+        dirty_rects.present()
+        samples.append(perf_counter() - start)
+    samples.sort()
+
+    print(f"== {maze_path}: {maze.rows}x{maze.cols}, block length {maze.block_length}")
+    print(f"  load          {load_time:.3f} s")
+    print(f"  full redraw   median {samples[len(samples) // 2] * 1000:.2f} ms  min {samples[0] * 1000:.2f} ms")
+
+    pygame.quit()
+
+if __name__ == "__main__":
+    main()
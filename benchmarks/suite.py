@@ -0,0 +1,333 @@
+'''
+Headless benchmark suite: every solver over every loadable maze in PreMade_Mazes/ plus seeded synthetic mazes.
+Each measurement is repeated after warmup runs with `perf_counter`, and the median and spread of load time, corridor
+graph build time, solve time and peak memory (tracemalloc) are written to a JSON file, along with the nodes expanded
+and search counters (`SearchStats`) of an extra untimed run of every solver. Solvers that preprocess the maze (the
+landmark index, the contraction hierarchy and the incremental planner's first search) have their preprocessing timed
+separately from their queries, with fewer repeats since it takes seconds on large mazes. Pass an earlier
+results file with --compare to list regressions; the exit status is 1 if there are any.
+Run from the repository root: python -m benchmarks.suite [--output results.json] [--compare baseline.json]
+'''
+import argparse
+import glob
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tracemalloc
+from array import array
+from datetime import datetime, timezone
+from time import perf_counter
+from grid import MazeGrid, OPEN_TABLE
+from maze_io import load_maze
+from generator import generate_maze
+from search_stats import SearchStats
+from landmarks import LandmarkIndex, build_landmarks
+from incremental import IncrementalPlanner
+import Algorithms
+import contraction
+
+RESULTS_VERSION = 2
+
+SOLVERS = {
+    "A*": Algorithms.a_star,
+    "Dijkstra's": Algorithms.Dijkstra,
+    "Bidirectional A*": Algorithms.a_star_bidirectional,
+    "Bidirectional Dijkstra's": Algorithms.Dijkstra_bidirectional,
+    "Jump Point Search": Algorithms.jump_point_search,
+}
+
+def landmarks_query(grid: MazeGrid, index: LandmarkIndex, stats: SearchStats|None = None) -> tuple[int|None, array]:
+    explored, final_path, _ = Algorithms.a_star_landmarks(grid, index, stats)
+    return len(explored), final_path
+
+def hierarchy_query(grid: MazeGrid, hierarchy: contraction.ContractionHierarchy,
+                    stats: SearchStats|None = None) -> tuple[int|None, array]:
+    # The hierarchy settles graph vertices, not cells
+    _, final_path, _ = contraction.query(hierarchy, grid, grid.start_coord, grid.end_coord, stats=stats)
+    return None, final_path
+
+def planner_build(grid: MazeGrid) -> tuple[IncrementalPlanner, tuple[int, int]|None]:
+    '''
+    An incremental planner with its first, full search done, and an open cell next to the start to drag it to
+    '''
+    planner = IncrementalPlanner(grid)
+    planner.solve(grid)
+
+    row, col = grid.start_coord
+    nearby = [(row - 1, col), (row + 1, col), (row, col - 1), (row, col + 1)]
+    nearby = [(n_row, n_col) for n_row, n_col in nearby if 0 <= n_row < grid.rows and 0 <= n_col < grid.cols
+              and not grid.is_wall(n_row, n_col) and (n_row, n_col) != grid.end_coord]
+
+    return planner, nearby[0] if nearby else None
+
+def planner_query(grid: MazeGrid, built: tuple[IncrementalPlanner, tuple[int, int]|None],
+                  stats: SearchStats|None = None) -> tuple[int|None, array]:
+    '''
+    The repairs of a drag: the start moves to the cell next to it and back, with a solve after each move.
+    `stats` counts the second repair
+    '''
+    planner, nearby = built
+    start = grid.start_coord
+
+    if nearby is not None:
+        grid.set_start(nearby)
+        planner.solve(grid)
+        grid.set_start(start)
+
+    explored, final_path, _ = planner.solve(grid, stats)
+    return len(explored), final_path
+
+# Solvers that preprocess the maze: name -> (build(grid), query(grid, built, stats)), the query returning
+# (cells explored or None, final path)
+INDEXED_SOLVERS = {
+    "A* with landmarks (ALT)": (build_landmarks, landmarks_query),
+    "Contraction hierarchy": (contraction.build_hierarchy, hierarchy_query),
+    "Incremental planner (D* Lite)": (planner_build, planner_query),
+}
+
+DEFAULT_SIZES = [101, 301, 1001]
+SEED = 42
+# (`generator` algorithm, loop density) of the synthetic mazes: a perfect maze, and a braided one where many routes
+# lead to the end
+SYNTHETIC_MAZES = [("backtracker", 0.0), ("prim", 0.25)]
+
+# A timing regresses when even its fastest repeat is slower than the earlier median by more than this fraction,
+# and slower than the earlier run's slowest repeat
+DEFAULT_THRESHOLD = 0.10
+# ...and by more than this many seconds; smaller differences are timer and scheduler noise
+MIN_REGRESSION_SECONDS = 0.001
+
+def summarize(samples: list[float]) -> dict:
+    return {
+        "median": statistics.median(samples),
+        "min": min(samples),
+        "max": max(samples),
+        "stdev": statistics.stdev(samples) if len(samples) > 1 else 0.0,
+        "samples": len(samples),
+    }
+
+def time_runs(run, repeats: int, warmup: int) -> tuple[dict, object]:
+    '''
+    Calls `run` `warmup` times untimed, then `repeats` times timed. Returns the timing summary and the last result
+    '''
+    for _ in range(warmup):
+        run()
+
+    samples = []
+    for _ in range(repeats):
+        start = perf_counter()
+        result = run()
+        samples.append(perf_counter() - start)
+
+    return summarize(samples), result
+
+def peak_memory(run) -> int:
+    '''
+    Peak bytes allocated by one call of `run`, traced separately from the timed runs since tracing slows them down
+    '''
+    tracemalloc.start()
+    try:
+        run()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+def benchmark_maze(load, repeats: int, warmup: int, build_repeats: int) -> dict:
+    '''
+    Results for one maze: how long it takes to load and to build its corridor graph, and every solver on it.
+    `load` returns a fresh `MazeGrid`. Preprocessing is timed `build_repeats` times without warmup
+    '''
+    load_time, grid = time_runs(load, repeats, warmup)
+    result = {
+        "rows": grid.rows,
+        "cols": grid.cols,
+        "load_time": load_time,
+        "load_peak_bytes": peak_memory(load),
+    }
+
+    # Mazes saved without end points get the first and last open cells, so every premade maze is solved
+    if grid.start_coord == (-1, -1) or grid.end_coord == (-1, -1):
+        open_cells = bytes(grid.cells).translate(OPEN_TABLE)
+        first, last = open_cells.find(1), open_cells.rfind(1)
+
+        if first == last:
+            result["skipped"] = "fewer than two open cells"
+            print(f"  skipped: {result['skipped']}")
+            return result
+
+        if grid.start_coord == (-1, -1):
+            grid.set_start(grid.coord(first if grid.end_coord != grid.coord(first) else last))
+        if grid.end_coord == (-1, -1):
+            grid.set_end(grid.coord(last if grid.start_coord != grid.coord(last) else first))
+        result["placed_end_points"] = True
+
+    result["start"], result["end"] = grid.start_coord, grid.end_coord
+
+    result["graph_build_time"], _ = time_runs(grid.build_corridor_graph, repeats, warmup)
+    result["graph_peak_bytes"] = peak_memory(grid.build_corridor_graph)
+
+    # Graph based solvers reuse the cached graph, so its build is not part of their solve times
+    grid.corridor_graph()
+
+    result["solvers"] = {}
+
+    def measure(solver_name: str, run, build_time: dict|None = None):
+        '''
+        Times `run(stats)`, which returns (cells explored or None, final path), and counts an extra run
+        '''
+        solve_time, _ = time_runs(lambda: run(None), repeats, warmup)
+
+        stats = SearchStats(solver_name)
+        cells_explored, final_path = run(stats)
+
+        measured = result["solvers"][solver_name] = {
+            "solve_time": solve_time,
+            "nodes_expanded": stats.nodes_expanded,
+            "cells_explored": cells_explored,
+            "path_length": len(final_path) - 1,
+            "peak_bytes": peak_memory(lambda: run(None)),
+            "counters": stats.to_dict(),
+        }
+        if build_time is not None:
+            measured["build_time"] = build_time
+
+        print(f"  {solver_name:<30}{solve_time['median'] * 1000:>10.2f} ms  ±{solve_time['stdev'] * 1000:.2f}"
+              f"{stats.nodes_expanded:>10} expanded"
+              + (f"  (built in {build_time['median']:.2f}s)" if build_time is not None else ""))
+
+    for solver_name, solver in SOLVERS.items():
+        def run(stats, solver=solver):
+            explored, final_path, _ = solver(grid, stats=stats)
+            return len(explored), final_path
+
+        measure(solver_name, run)
+
+    for solver_name, (build, query) in INDEXED_SOLVERS.items():
+        build_time, built = time_runs(lambda: build(grid), build_repeats, 0)
+        measure(solver_name, lambda stats: query(grid, built, stats), build_time)
+
+    return result
+
+def environment() -> dict:
+    try:
+        commit = subprocess.run(["git", "rev-parse", "HEAD"], capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+
+    return {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "processor": platform.processor(),
+        "commit": commit,
+        "date": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+    }
+
+def run_suite(maze_paths: list[str], sizes: list[int], repeats: int, warmup: int, build_repeats: int) -> dict:
+    mazes = {}
+
+    for path in maze_paths:
+        print(f"== {path}")
+        try:
+            load_maze(path)
+        except Exception as load_exception:
+            print(f"  skipped: {load_exception}")
+            mazes[path] = {"skipped": str(load_exception)}
+            continue
+
+        mazes[path] = benchmark_maze(lambda: load_maze(path), repeats, warmup, build_repeats)
+
+    for size in sizes:
+        for algorithm, loops in SYNTHETIC_MAZES:
+            name = f"synthetic {algorithm} loops {loops} {size}x{size} seed {SEED}"
+            print(f"== {name}")
+            mazes[name] = benchmark_maze(lambda: generate_maze(size, size, algorithm, SEED, loops), repeats, warmup,
+                                         build_repeats)
+
+    return {
+        "version": RESULTS_VERSION,
+        "environment": environment(),
+        "repeats": repeats,
+        "warmup": warmup,
+        "build_repeats": build_repeats,
+        "mazes": mazes,
+    }
+
+def compare(previous: dict, current: dict, threshold: float) -> list[str]:
+    '''
+    Differences between two results files that count as regressions: a time whose fastest repeat is now slower than
+    the previous median by more than `threshold` (and MIN_REGRESSION_SECONDS) and than the previous slowest repeat,
+    or a solver expanding a different number of nodes or cells or finding a path of different length (all deterministic)
+    '''
+    regressions = []
+
+    def check_time(label: str, old: dict, new: dict):
+        if new["min"] > max(old["median"] * (1 + threshold), old["max"], old["median"] + MIN_REGRESSION_SECONDS):
+            regressions.append(f"{label}: median {old['median'] * 1000:.2f} ms -> {new['median'] * 1000:.2f} ms "
+                               f"({new['median'] / old['median'] - 1:+.0%})")
+
+    for name, new_maze in current["mazes"].items():
+        old_maze = previous["mazes"].get(name)
+        if old_maze is None or "skipped" in old_maze or "skipped" in new_maze:
+            continue
+
+        check_time(f"{name} load", old_maze["load_time"], new_maze["load_time"])
+        check_time(f"{name} graph build", old_maze["graph_build_time"], new_maze["graph_build_time"])
+
+        for solver_name, new_solver in new_maze["solvers"].items():
+            old_solver = old_maze["solvers"].get(solver_name)
+            if old_solver is None:
+                continue
+
+            label = f"{name} {solver_name}"
+            check_time(label, old_solver["solve_time"], new_solver["solve_time"])
+            if "build_time" in old_solver and "build_time" in new_solver:
+                check_time(f"{label} build", old_solver["build_time"], new_solver["build_time"])
+
+            for metric in ("nodes_expanded", "cells_explored", "path_length"):
+                if old_solver[metric] != new_solver[metric]:
+                    regressions.append(f"{label}: {metric} {old_solver[metric]} -> {new_solver[metric]}")
+
+    return regressions
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark every solver over premade and synthetic mazes")
+    parser.add_argument("mazes", nargs="*", help="maze files (default: every file in PreMade_Mazes/)")
+    parser.add_argument("--sizes", type=int, nargs="*", default=DEFAULT_SIZES, help="synthetic maze sizes")
+    parser.add_argument("--repeats", type=int, default=5, help="timed runs per measurement")
+    parser.add_argument("--warmup", type=int, default=1, help="untimed runs before the timed ones")
+    parser.add_argument("--build-repeats", type=int, default=1, help="timed runs of each solver's preprocessing")
+    parser.add_argument("--output", default="benchmark_results.json", help="where to write the results")
+    parser.add_argument("--compare", help="earlier results file to check for regressions")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD, help="allowed median slowdown")
+    args = parser.parse_args()
+
+    if args.repeats < 1 or args.build_repeats < 1:
+        parser.error("--repeats and --build-repeats must be at least 1")
+
+    maze_paths = args.mazes or sorted(glob.glob(os.path.join("PreMade_Mazes", "*.csv")))
+    results = run_suite(maze_paths, args.sizes, args.repeats, args.warmup, args.build_repeats)
+
+    with open(args.output, "w") as results_file:
+        json.dump(results, results_file, indent=2)
+    print(f"Wrote {args.output}")
+
+    if args.compare:
+        with open(args.compare) as previous_file:
+            previous = json.load(previous_file)
+
+        if previous.get("version") != RESULTS_VERSION:
+            raise Exception(f"Cannot compare with results version {previous.get('version')}")
+
+        regressions = compare(previous, results, args.threshold)
+        for regression in regressions:
+            print(f"REGRESSION {regression}")
+        print(f"{len(regressions)} regressions against {args.compare}")
+
+        if regressions:
+            sys.exit(1)
+
+if __name__ == "__main__":
+    main()
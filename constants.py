@@ -5,6 +5,7 @@ MAZE_SIZE = 1000
 
 BUTTON_WIDTH = 200
 BUTTON_HEIGHT = 55
+PANEL_BUTTON_WIDTH = 180 # buttons panel holds two columns
 NUM_FONT = 20
 
 # Maze Padding
@@ -15,16 +16,23 @@ MAZE_PADDING_TOP = (RES_HEIGHT - MAZE_SIZE) // 2       # vertically centered
 RESULTS_PADDING_TOP = 600
 RESULT_GAP = 2
 
+# search counters formatting
+COUNTERS_PADDING_TOP = 515
+COUNTERS_HEIGHT = 68
+
 # error messages formatting
 
 ERROR_PADDING_TOP = 875
 ERROR_WIDTH = 350
 ERROR_HEIGHT = 102
 
-# Target frame rate (tick rate) relative to maze size
-# frame rate ~ draw rate
-SPEED_FACTOR = 0.10
-PERCENT_BLOCKS_DRAW = 0.0005
+# Progressive drawing: frame rate, seconds the whole traversal takes at normal speed, and the share of each frame
+# that drawing blocks may take (the scheduler draws fewer blocks per frame if they take longer)
+ANIMATION_FRAME_RATE = 60
+ANIMATION_SECONDS = 5.0
+ANIMATION_DRAW_SHARE = 0.5
+# Longest the main loop sleeps waiting for input while nothing is animating or loading (ms)
+IDLE_WAIT_MS = 500
 
 #==COLORS==# if you change a color, comment what color it is
 BLACK = (0, 0, 0)
@@ -0,0 +1,298 @@
+import heapq
+from array import array
+from grid import MazeGrid
+from AdjacencyList import CSRGraph
+from Algorithms import UNREACHED
+from search_stats import SearchStats
+import paths
+
+'''
+Contraction hierarchy over the corridor graph, for answering many queries on one maze.
+Vertices are contracted one at a time, least important first. Contracting a vertex removes it and adds a shortcut
+between two of its neighbors whenever the path through it is the only shortest path between them. Every vertex
+ends up with a rank (its contraction order), and a query only follows edges up the ranks from both ends: the two
+searches meet at the highest vertex of the shortest path and settle a small fraction of the graph.
+'''
+
+# `query` meeting marker for a start and end point spliced into the same corridor
+SHARED_CORRIDOR = -2
+
+# Witness searches stop after settling this many vertices; a missed witness only costs an unneeded shortcut
+WITNESS_SETTLE_LIMIT = 40
+
+class ContractionHierarchy:
+    '''
+    The upward graph of a contracted `CSRGraph`, in CSR form: the edges of vertex v lead to higher ranked vertices,
+    `up_targets[up_offsets[v]:up_offsets[v + 1]]` with lengths in `up_weights`. `up_middles` holds the contracted
+    vertex a shortcut skips, or -1 for an edge of the corridor graph
+    '''
+    def __init__(self, graph: CSRGraph, ranks: array, up_offsets: array, up_targets: array, up_weights: array,
+                 up_middles: array):
+        self.graph = graph
+        self.ranks = ranks
+        self.up_offsets = up_offsets
+        self.up_targets = up_targets
+        self.up_weights = up_weights
+        self.up_middles = up_middles
+
+    def get_shortcuts(self):
+        """returns number of shortcut edges"""
+        return sum(1 for middle in self.up_middles if middle != -1)
+
+    def middle_of(self, vertex_a: int, vertex_b: int) -> int:
+        '''
+        The vertex the upward edge between `vertex_a` and `vertex_b` skips, or -1 if it is a corridor edge
+        '''
+        lower, upper = (vertex_a, vertex_b) if self.ranks[vertex_a] < self.ranks[vertex_b] else (vertex_b, vertex_a)
+
+        for edge in range(self.up_offsets[lower], self.up_offsets[lower + 1]):
+            if self.up_targets[edge] == upper:
+                return self.up_middles[edge]
+
+        raise Exception(f"No upward edge between vertices {vertex_a} and {vertex_b}")
+
+    def unpack(self, vertex_a: int, vertex_b: int) -> list[int]:
+        '''
+        The corridor graph vertices along the edge vertex_a -> vertex_b, shortcuts replaced by the paths they skip.
+        The list starts after vertex_a and ends with vertex_b
+        '''
+        vertices = []
+        stack = [(vertex_a, vertex_b)]
+
+        while stack:
+            first, second = stack.pop()
+            middle = self.middle_of(first, second)
+
+            if middle == -1:
+                vertices.append(second)
+            else:
+                # first -> middle is unpacked before middle -> second
+                stack.append((middle, second))
+                stack.append((first, middle))
+
+        return vertices
+
+def build_hierarchy(grid: MazeGrid) -> ContractionHierarchy:
+    '''
+    Contracts the grid's corridor graph. Vertices are ordered by edge difference (shortcuts added minus edges
+    removed) plus the number of neighbors already contracted, which spreads contraction evenly over the maze.
+    Priorities are updated lazily: a popped vertex is re-evaluated and pushed back if it is no longer the minimum
+    '''
+    graph = grid.corridor_graph()
+    vertices = graph.get_vertices()
+
+    # Remaining graph: neighbor -> (distance, skipped vertex)
+    remaining = [
+        {graph.targets[edge]: (graph.weights[edge], -1) for edge in range(graph.offsets[vertex], graph.offsets[vertex + 1])}
+        for vertex in range(vertices)
+    ]
+    contracted_neighbors = [0] * vertices
+    ranks = array('I', [0]) * vertices
+    upward = [None] * vertices
+
+    queue = [(priority(remaining, contracted_neighbors, vertex), vertex) for vertex in range(vertices)]
+    heapq.heapify(queue)
+
+    rank = 0
+    while queue:
+        _, vertex = heapq.heappop(queue)
+
+        # Lazy update: contract only if the vertex is still (one of) the least important
+        current = priority(remaining, contracted_neighbors, vertex)
+        if queue and current > queue[0][0]:
+            heapq.heappush(queue, (current, vertex))
+            continue
+
+        neighbors = remaining[vertex]
+        for (source, target), distance in shortcuts_needed(remaining, vertex).items():
+            if distance < remaining[source].get(target, (UNREACHED, -1))[0]:
+                remaining[source][target] = (distance, vertex)
+                remaining[target][source] = (distance, vertex)
+
+        for neighbor in neighbors:
+            del remaining[neighbor][vertex]
+            contracted_neighbors[neighbor] += 1
+
+        ranks[vertex] = rank
+        rank += 1
+        upward[vertex] = neighbors # every remaining neighbor is contracted later, so ranks higher
+        remaining[vertex] = None
+
+    up_offsets = array('I', [0])
+    up_targets = array('I')
+    up_weights = array('I')
+    up_middles = array('i')
+
+    for vertex in range(vertices):
+        for target in sorted(upward[vertex]):
+            distance, middle = upward[vertex][target]
+            up_targets.append(target)
+            up_weights.append(distance)
+            up_middles.append(middle)
+        up_offsets.append(len(up_targets))
+
+    return ContractionHierarchy(graph, ranks, up_offsets, up_targets, up_weights, up_middles)
+
+def priority(remaining: list[dict], contracted_neighbors: list[int], vertex: int) -> int:
+    return len(shortcuts_needed(remaining, vertex)) - len(remaining[vertex]) + contracted_neighbors[vertex]
+
+def shortcuts_needed(remaining: list[dict], vertex: int) -> dict[tuple[int, int], int]:
+    '''
+    The shortcuts contracting `vertex` would add, as {(source, target): distance} with source < target.
+    A pair of neighbors needs one unless a witness search finds a path between them, avoiding `vertex`, that is no
+    longer than the path through it
+    '''
+    neighbors = list(remaining[vertex].items())
+    shortcuts = {}
+
+    for i, (source, (to_source, _)) in enumerate(neighbors):
+        targets = {target: to_source + to_target for target, (to_target, _) in neighbors[i + 1:]}
+        if not targets:
+            continue
+
+        witnesses = witness_search(remaining, source, vertex, max(targets.values()))
+
+        for target, through in targets.items():
+            if witnesses.get(target, UNREACHED) > through:
+                shortcuts[(min(source, target), max(source, target))] = through
+
+    return shortcuts
+
+def witness_search(remaining: list[dict], source: int, avoid: int, limit: int) -> dict[int, int]:
+    '''
+    Dijkstra from `source` over the remaining graph without `avoid`, up to distance `limit` and
+    WITNESS_SETTLE_LIMIT settled vertices. Returns the distances found
+    '''
+    distances = {source: 0}
+    frontier = [(0, source)]
+    settled = 0
+
+    while frontier and settled < WITNESS_SETTLE_LIMIT:
+        cur_dist, cur = heapq.heappop(frontier)
+
+        if cur_dist > limit:
+            break
+        if cur_dist > distances[cur]: # Already processed better path; skip
+            continue
+        settled += 1
+
+        for neighbor, (distance, _) in remaining[cur].items():
+            new_dist = cur_dist + distance
+
+            if neighbor != avoid and new_dist < distances.get(neighbor, UNREACHED):
+                distances[neighbor] = new_dist
+                heapq.heappush(frontier, (new_dist, neighbor))
+
+    return distances
+
+def query(hierarchy: ContractionHierarchy, grid: MazeGrid, start: tuple[int, int], end: tuple[int, int],
+          return_path: bool = True, stats: SearchStats|None = None) -> tuple[int|None, array, int]:
+    '''
+    Shortest path from `start` to `end` by two upward searches that meet at the path's highest ranked vertex.
+    Start/end points inside a corridor are spliced in like `Dijkstra` does and seed the searches at both ends of
+    their corridor. The path is unpacked and its corridors expanded into every cell (an array('I') of cell indices,
+    like the solvers return); without `return_path` only the length is found and path is empty. Fills the heap
+    counters of `stats` if one is given.
+    Returns (length, path, settled vertices), with (None, empty path, settled) when the end cannot be reached
+    '''
+    if hierarchy.graph is not grid.corridor_graph():
+        raise Exception("Contraction hierarchy was built for a different corridor graph")
+
+    graph, start_id, end_id = grid.splice_terminals(start, end)
+    base_vertices = graph.base_vertices
+
+    best = UNREACHED
+    meeting = None # Vertex where the searches met on the best path, or SHARED_CORRIDOR
+    if start_id == end_id:
+        best, meeting = 0, start_id
+
+    # Each search: distances and parents of the vertices it reached, seeded at its terminal's corridor ends
+    searches = []
+    for terminal, other in ((start_id, end_id), (end_id, start_id)):
+        distances = {terminal: 0}
+        parents = {terminal: -1}
+
+        if terminal >= base_vertices:
+            for neighbor, distance in graph.edges(terminal):
+                if neighbor == other: # Both points share a corridor
+                    if distance < best:
+                        best, meeting = distance, SHARED_CORRIDOR
+                elif distance < distances.get(neighbor, UNREACHED):
+                    distances[neighbor] = distance
+                    parents[neighbor] = terminal
+
+        frontier = [(distance, vertex) for vertex, distance in distances.items()]
+        heapq.heapify(frontier)
+        searches.append((distances, parents, frontier))
+
+    seeds = sum(len(frontier) for _, _, frontier in searches)
+    settled = pops = peak = 0
+    track = stats is not None
+    up_offsets, up_targets, up_weights = hierarchy.up_offsets, hierarchy.up_targets, hierarchy.up_weights
+
+    # Alternate the searches; stop once neither frontier can beat the best meeting found
+    while any(frontier and frontier[0][0] < best for _, _, frontier in searches):
+        if track:
+            peak = max(peak, len(searches[0][2]) + len(searches[1][2]))
+
+        for side, (distances, parents, frontier) in enumerate(searches):
+            if not frontier or frontier[0][0] >= best:
+                continue
+
+            cur_dist, cur = heapq.heappop(frontier)
+            pops += 1
+            if cur_dist > distances[cur]: # Already processed better path; skip
+                continue
+            settled += 1
+
+            other_distances = searches[1 - side][0]
+            if cur in other_distances and cur_dist + other_distances[cur] < best:
+                best, meeting = cur_dist + other_distances[cur], cur
+
+            if cur >= base_vertices: # Spliced terminals only have their corridor edges, already seeded
+                continue
+
+            for edge in range(up_offsets[cur], up_offsets[cur + 1]):
+                neighbor = up_targets[edge]
+                new_dist = cur_dist + up_weights[edge]
+
+                if new_dist < distances.get(neighbor, UNREACHED):
+                    distances[neighbor] = new_dist
+                    parents[neighbor] = cur
+                    heapq.heappush(frontier, (new_dist, neighbor))
+
+    if track:
+        stats.record_heap(seeds=seeds, pops=pops, stale=pops - settled,
+                          queued=len(searches[0][2]) + len(searches[1][2]), peak=peak)
+
+    if meeting is None:
+        return None, array('I'), settled
+    elif not return_path:
+        return best, array('I'), settled
+
+    if meeting == SHARED_CORRIDOR:
+        vertex_path = [start_id, end_id]
+    else:
+        # start ~> meeting from the forward parents, then meeting ~> end from the backward parents
+        forward_parents, backward_parents = searches[0][1], searches[1][1]
+        vertex_path = []
+        vertex = meeting
+        while vertex != -1:
+            vertex_path.append(vertex)
+            vertex = forward_parents[vertex]
+        vertex_path.reverse()
+
+        vertex = backward_parents[meeting]
+        while vertex != -1:
+            vertex_path.append(vertex)
+            vertex = backward_parents[vertex]
+
+    # Unpack shortcuts between corridor graph vertices; edges to spliced terminals are corridors already
+    unpacked = [vertex_path[0]]
+    for vertex_a, vertex_b in zip(vertex_path, vertex_path[1:]):
+        if vertex_a >= base_vertices or vertex_b >= base_vertices:
+            unpacked.append(vertex_b)
+        else:
+            unpacked.extend(hierarchy.unpack(vertex_a, vertex_b))
+
+    return best, paths.expand(array('I', map(graph.cell, unpacked)), grid.cols), settled
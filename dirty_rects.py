@@ -0,0 +1,103 @@
+import pygame
+from constants import RES_WIDTH, RES_HEIGHT
+
+'''
+Dirty-rectangle presentation: instead of flipping the whole window every frame, drawing code marks the screen areas
+it changed and `present` pushes only those to the display.
+The window is split into DIRTY_TILE px square tiles. A mark flags every tile it touches, and `present` merges the
+flagged tiles into a few rectangles (runs along each tile row, then equal runs on consecutive rows), so a frame costs
+about as much as the tiles it changed, however big the window is
+'''
+
+DIRTY_TILE = 32
+
+class DirtyRegion:
+    def __init__(self, width: int, height: int, tile: int = DIRTY_TILE):
+        self.width = width
+        self.height = height
+        self.tile = tile
+        self.tile_cols = (width + tile - 1) // tile
+        self.tiles: set[int] = set() # flagged tiles, `tile_row * tile_cols + tile_col`
+
+    def mark(self, rect: pygame.Rect):
+        x, y, width, height = rect
+        tile = self.tile
+
+        left, top = max(x, 0) // tile, max(y, 0) // tile
+        right, bottom = (min(x + width, self.width) - 1) // tile, (min(y + height, self.height) - 1) // tile
+
+        if left == right and top == bottom: # The usual case: one cell
+            self.tiles.add(top * self.tile_cols + left)
+            return
+
+        tile_cols = self.tile_cols
+        self.tiles.update(row * tile_cols + col for row in range(top, bottom + 1) for col in range(left, right + 1))
+
+    def rects(self) -> list[pygame.Rect]:
+        '''
+        The flagged tiles merged into rectangles
+        '''
+        tile, tile_cols = self.tile, self.tile_cols
+
+        # Runs of flagged tiles along each tile row: row -> [(first col, last col)]
+        runs: dict[int, list[tuple[int, int]]] = {}
+        for ind in sorted(self.tiles):
+            row, col = divmod(ind, tile_cols)
+            row_runs = runs.setdefault(row, [])
+
+            if row_runs and row_runs[-1][1] == col - 1:
+                row_runs[-1] = (row_runs[-1][0], col)
+            else:
+                row_runs.append((col, col))
+
+        merged = []
+        window = pygame.Rect(0, 0, self.width, self.height)
+
+        def close(span: tuple[int, int], top: int, bottom: int):
+            first, last = span
+            merged.append(pygame.Rect(first * tile, top * tile, (last - first + 1) * tile, (bottom - top + 1) * tile).clip(window))
+
+        # Runs spanning the same columns on consecutive rows become one rectangle: span -> its top row
+        open_spans: dict[tuple[int, int], int] = {}
+        prev_row = -2
+        for row, row_runs in runs.items():
+            continued = {}
+            for span in row_runs:
+                continued[span] = open_spans.pop(span) if prev_row == row - 1 and span in open_spans else row
+
+            for span, top in open_spans.items():
+                close(span, top, prev_row)
+
+            open_spans, prev_row = continued, row
+
+        for span, top in open_spans.items():
+            close(span, top, prev_row)
+
+        return merged
+
+    def present(self):
+        '''
+        Pushes the flagged areas of the screen buffer to the display
+        '''
+        if self.tiles:
+            pygame.display.update(self.rects())
+            self.tiles.clear()
+
+    def flip(self):
+        '''
+        Pushes the whole screen buffer, which covers anything flagged
+        '''
+        pygame.display.flip()
+        self.tiles.clear()
+
+# The window's region, marked by the widgets and the maze and presented once per frame by the main loop
+screen_region = DirtyRegion(RES_WIDTH, RES_HEIGHT)
+
+def mark(rect: pygame.Rect):
+    screen_region.mark(rect)
+
+def present():
+    screen_region.present()
+
+def flip():
+    screen_region.flip()
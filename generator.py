@@ -0,0 +1,294 @@
+import argparse
+import random
+from array import array
+from typing import Iterator
+from grid import MazeGrid, OPEN, WALL, START, END
+from maze_io import stream_csv, stream_binary
+
+'''
+Seedable procedural mazes for scale testing.
+Rooms sit on the odd rows and columns of the grid and walls fill everything else; carving opens the wall cell
+between two rooms. While a maze is carved, each room is one byte of passage bits in a flat `bytearray` (a quarter of
+the final cell count), and the cell rows are rendered from it one at a time, so a 10k x 10k maze can be streamed to
+a CSV or binary file without ever holding its 100M cells.
+
+Every algorithm carves a perfect maze (exactly one path between any two rooms). `loops` then braids it: that
+fraction of the dead ends get a wall opened to a neighboring room, which adds cycles and alternative routes.
+'''
+
+# Passage bits of a room: the wall to its right / below is open
+PASSAGE_RIGHT = 1
+PASSAGE_DOWN = 2
+
+# Passage bits -> cell code of the wall cell to the right / below a room
+RIGHT_TABLE = bytes(OPEN if bits & PASSAGE_RIGHT else WALL for bits in range(256))
+DOWN_TABLE = bytes(OPEN if bits & PASSAGE_DOWN else WALL for bits in range(256))
+
+def open_passage(passages: bytearray, room_cols: int, room_a: int, room_b: int):
+    '''
+    Opens the wall between two neighboring rooms
+    '''
+    if room_a > room_b:
+        room_a, room_b = room_b, room_a
+
+    passages[room_a] |= PASSAGE_DOWN if room_b - room_a == room_cols else PASSAGE_RIGHT
+
+def carve_backtracker(room_rows: int, room_cols: int, rng: random.Random) -> bytearray:
+    '''
+    Recursive backtracker (randomized depth-first search), iterative: walks to a random unvisited neighbor until
+    there is none, then backs up. Long winding corridors with few branches
+    '''
+    rooms = room_rows * room_cols
+    passages = bytearray(rooms)
+    visited = bytearray(rooms)
+    rand = rng.random
+
+    visited[0] = 1
+    stack = array('I', [0])
+
+    while stack:
+        room = stack[-1]
+        col = room % room_cols
+
+        # Unvisited neighbors: above, below, left, right
+        options = []
+        if room >= room_cols and not visited[room - room_cols]:
+            options.append(room - room_cols)
+        if room + room_cols < rooms and not visited[room + room_cols]:
+            options.append(room + room_cols)
+        if col > 0 and not visited[room - 1]:
+            options.append(room - 1)
+        if col < room_cols - 1 and not visited[room + 1]:
+            options.append(room + 1)
+
+        if not options:
+            stack.pop()
+            continue
+
+        next_room = options[int(rand() * len(options))]
+        open_passage(passages, room_cols, room, next_room)
+        visited[next_room] = 1
+        stack.append(next_room)
+
+    return passages
+
+def carve_prim(room_rows: int, room_cols: int, rng: random.Random) -> bytearray:
+    '''
+    Randomized Prim's: grows the maze from one room by connecting a random frontier room (a room next to the maze)
+    to a random neighbor already in it. Many short dead ends branching off everywhere
+    '''
+    rooms = room_rows * room_cols
+    passages = bytearray(rooms)
+    state = bytearray(rooms) # 0: untouched, 1: on the frontier, 2: in the maze
+    rand = rng.random
+
+    frontier = array('I')
+
+    def add_room(room: int):
+        state[room] = 2
+        col = room % room_cols
+
+        for neighbor, valid in ((room - room_cols, room >= room_cols), (room + room_cols, room + room_cols < rooms),
+                                (room - 1, col > 0), (room + 1, col < room_cols - 1)):
+            if valid and state[neighbor] == 0:
+                state[neighbor] = 1
+                frontier.append(neighbor)
+
+    add_room(0)
+
+    while frontier:
+        # Take a random frontier room out in O(1): swap it with the last one
+        pick = int(rand() * len(frontier))
+        room = frontier[pick]
+        frontier[pick] = frontier[-1]
+        frontier.pop()
+
+        col = room % room_cols
+        in_maze = [
+            neighbor for neighbor, valid in ((room - room_cols, room >= room_cols), (room + room_cols, room + room_cols < rooms),
+                                             (room - 1, col > 0), (room + 1, col < room_cols - 1))
+            if valid and state[neighbor] == 2
+        ]
+
+        open_passage(passages, room_cols, room, in_maze[int(rand() * len(in_maze))])
+        add_room(room)
+
+    return passages
+
+def carve_kruskal(room_rows: int, room_cols: int, rng: random.Random) -> bytearray:
+    '''
+    Randomized Kruskal's: goes through every wall between two rooms in random order and opens it if the rooms are
+    not connected yet (union-find with path halving). Evenly spread short dead ends.
+    Holds every wall (4 bytes each, about two per room) and a parent per room, the most memory of the three
+    '''
+    rooms = room_rows * room_cols
+    passages = bytearray(rooms)
+    parents = array('I', range(rooms))
+
+    # Wall ids: room * 2 for the wall to its right, room * 2 + 1 for the wall below it
+    walls = array('I', (
+        room * 2 + side for room in range(rooms) for side in (0, 1)
+        if (side == 0 and room % room_cols < room_cols - 1) or (side == 1 and room + room_cols < rooms)
+    ))
+    rng.shuffle(walls)
+
+    def find(room: int) -> int:
+        while parents[room] != room:
+            parents[room] = parents[parents[room]]
+            room = parents[room]
+        return room
+
+    for wall in walls:
+        room, side = divmod(wall, 2)
+        neighbor = room + (room_cols if side else 1)
+
+        root_a, root_b = find(room), find(neighbor)
+        if root_a != root_b:
+            parents[root_a] = root_b
+            passages[room] |= PASSAGE_DOWN if side else PASSAGE_RIGHT
+
+    return passages
+
+ALGORITHMS = {
+    "backtracker": carve_backtracker,
+    "prim": carve_prim,
+    "kruskal": carve_kruskal,
+}
+
+def braid(passages: bytearray, room_rows: int, room_cols: int, loops: float, rng: random.Random):
+    '''
+    Opens one more wall at a `loops` fraction of the dead ends, preferring a neighbor that is a dead end as well so
+    one opening removes two of them
+    '''
+    rooms = room_rows * room_cols
+    rand = rng.random
+
+    def degree(room: int) -> int:
+        bits = passages[room]
+        count = (bits & PASSAGE_RIGHT) + (bits >> 1)
+        if room % room_cols > 0 and passages[room - 1] & PASSAGE_RIGHT:
+            count += 1
+        if room >= room_cols and passages[room - room_cols] & PASSAGE_DOWN:
+            count += 1
+        return count
+
+    for room in range(rooms):
+        if degree(room) != 1 or rand() >= loops:
+            continue
+
+        col = room % room_cols
+        closed = [
+            neighbor for neighbor, valid, is_open in (
+                (room - room_cols, room >= room_cols, room >= room_cols and passages[room - room_cols] & PASSAGE_DOWN),
+                (room + room_cols, room + room_cols < rooms, passages[room] & PASSAGE_DOWN),
+                (room - 1, col > 0, col > 0 and passages[room - 1] & PASSAGE_RIGHT),
+                (room + 1, col < room_cols - 1, passages[room] & PASSAGE_RIGHT),
+            )
+            if valid and not is_open
+        ]
+        if not closed:
+            continue
+
+        dead_ends = [neighbor for neighbor in closed if degree(neighbor) == 1]
+        options = dead_ends or closed
+        open_passage(passages, room_cols, room, options[int(rand() * len(options))])
+
+def room_counts(rows: int, cols: int) -> tuple[int, int]:
+    if rows < 3 or cols < 3 or (rows - 1) // 2 * ((cols - 1) // 2) < 2:
+        raise Exception(f"Maze is too small for two rooms: rows: {rows} cols: {cols}")
+
+    return (rows - 1) // 2, (cols - 1) // 2
+
+def carve(rows: int, cols: int, algorithm: str = "backtracker", seed: int|None = None, loops: float = 0.0) -> bytearray:
+    '''
+    Passage bits of every room of a `rows` x `cols` maze. Even sizes get a wall row/column more on the far side
+    '''
+    if algorithm not in ALGORITHMS:
+        raise Exception(f"Unknown maze algorithm '{algorithm}'. Choose from: {', '.join(ALGORITHMS)}")
+    elif not 0.0 <= loops <= 1.0:
+        raise Exception(f"Loop density must be between 0 and 1, got {loops}")
+
+    room_rows, room_cols = room_counts(rows, cols)
+    rng = random.Random(seed)
+
+    passages = ALGORITHMS[algorithm](room_rows, room_cols, rng)
+    if loops > 0:
+        braid(passages, room_rows, room_cols, loops, rng)
+
+    return passages
+
+def end_points(rows: int, cols: int) -> tuple[tuple[int, int], tuple[int, int]]:
+    '''
+    Start in the top left room, end in the bottom right one
+    '''
+    room_rows, room_cols = room_counts(rows, cols)
+
+    return (1, 1), (2 * room_rows - 1, 2 * room_cols - 1)
+
+def render_rows(passages: bytearray, rows: int, cols: int) -> Iterator[bytes]:
+    '''
+    The cell codes of the maze, one row at a time, top to bottom
+    '''
+    room_rows, room_cols = room_counts(rows, cols)
+    (start_row, start_col), (end_row, end_col) = end_points(rows, cols)
+
+    wall_row = bytes([WALL]) * cols
+    yield wall_row
+
+    for room_row in range(room_rows):
+        band = passages[room_row * room_cols:(room_row + 1) * room_cols]
+
+        # Rooms and the walls between them
+        row = bytearray(wall_row)
+        row[1:2 * room_cols:2] = bytes([OPEN]) * room_cols
+        row[2:2 * room_cols - 1:2] = band[:-1].translate(RIGHT_TABLE)
+
+        if 2 * room_row + 1 == start_row:
+            row[start_col] = START
+        if 2 * room_row + 1 == end_row:
+            row[end_col] = END
+        yield bytes(row)
+
+        # Walls below the rooms
+        if room_row < room_rows - 1:
+            row = bytearray(wall_row)
+            row[1:2 * room_cols:2] = band.translate(DOWN_TABLE)
+            yield bytes(row)
+
+    for _ in range(rows - 2 * room_rows):
+        yield wall_row
+
+def generate_maze(rows: int, cols: int, algorithm: str = "backtracker", seed: int|None = None,
+                  loops: float = 0.0) -> MazeGrid:
+    '''
+    Generates a maze straight into a `MazeGrid`
+    '''
+    passages = carve(rows, cols, algorithm, seed, loops)
+    start_coord, end_coord = end_points(rows, cols)
+
+    return MazeGrid(rows, cols, bytearray(b"".join(render_rows(passages, rows, cols))), start_coord, end_coord)
+
+def generate_file(path: str, rows: int, cols: int, algorithm: str = "backtracker", seed: int|None = None,
+                  loops: float = 0.0):
+    '''
+    Generates a maze and streams it to `path`: the binary format for .maze files, CSV otherwise (like `load_maze`)
+    '''
+    passages = carve(rows, cols, algorithm, seed, loops)
+
+    if path.endswith(".maze"):
+        stream_binary(path, rows, cols, *end_points(rows, cols), render_rows(passages, rows, cols))
+    else:
+        stream_csv(path, cols, render_rows(passages, rows, cols))
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Generate a maze file (.maze for the binary format, CSV otherwise)")
+    parser.add_argument("path")
+    parser.add_argument("rows", type=int)
+    parser.add_argument("cols", type=int)
+    parser.add_argument("--algorithm", choices=ALGORITHMS, default="backtracker")
+    parser.add_argument("--seed", type=int)
+    parser.add_argument("--loops", type=float, default=0.0, help="fraction of dead ends opened into loops (0 to 1)")
+    args = parser.parse_args()
+
+    generate_file(args.path, args.rows, args.cols, args.algorithm, args.seed, args.loops)
+    print(f"Wrote {args.rows}x{args.cols} {args.algorithm} maze to {args.path}")
@@ -0,0 +1,342 @@
+from enum import Enum
+from array import array
+from itertools import compress
+from AdjacencyList import AdjacencyList, CSRGraph, SplicedGraph
+import profiling
+
+class BlockState(Enum):
+    OPEN = 0            # Denotes traversable block
+    WALL = 1            # Denotes non-traversable block
+    INTERSECTION = 2    # Denotes traversable block with divergent paths
+    START = 3           # Denotes the starting (source) block
+    END = 4             # Denotes the end (target) block
+    EXPLORED = 5        # Denotes whether the block has been explored
+    FINAL = 6           # Denotes blocks in the final (shortest) path to the end
+
+# Raw cell codes stored in `MazeGrid.cells` (plain ints are much cheaper to compare than enum members)
+OPEN = BlockState.OPEN.value
+WALL = BlockState.WALL.value
+START = BlockState.START.value
+END = BlockState.END.value
+
+# Bits of a cell in `MazeGrid.classify_cells`: which neighbors are open, and whether the cell itself is
+NEIGHBOR_RIGHT = 1
+NEIGHBOR_LEFT = 2
+NEIGHBOR_DOWN = 4
+NEIGHBOR_UP = 8
+NEIGHBOR_SELF = 16
+
+# Cell code -> 1 for cells a path can cross, 0 for walls
+OPEN_TABLE = bytes(0 if code == WALL else 1 for code in range(256))
+
+'''
+Neighbor bits -> the bits themselves for graph points, 0 for anything else.
+A graph point is an open cell that is an intersection (3+ open neighbors), a dead end (1 open neighbor) or a turn
+(2 open neighbors that are not opposite each other). Start/end points are not graph points, so moving them never
+changes the graph (see `MazeGrid.splice_terminals`)
+'''
+GRAPH_POINT_TABLE = bytearray(256)
+for bits in range(32):
+    open_neighbors = bin(bits & ~NEIGHBOR_SELF).count("1")
+    straight = (bits & ~NEIGHBOR_SELF) in (NEIGHBOR_LEFT | NEIGHBOR_RIGHT, NEIGHBOR_UP | NEIGHBOR_DOWN)
+
+    if bits & NEIGHBOR_SELF and open_neighbors > 0 and not straight:
+        GRAPH_POINT_TABLE[bits] = bits
+GRAPH_POINT_TABLE = bytes(GRAPH_POINT_TABLE)
+
+class MazeGrid:
+    '''
+    Headless maze model. Every cell state is stored row-major in one contiguous `bytearray`
+    (cell (row, col) lives at `row * cols + col`), so solvers can run without pygame.
+    '''
+    def __init__(self, rows: int, cols: int, cells: bytearray, start_coord: tuple[int, int] = (-1, -1),
+                 end_coord: tuple[int, int] = (-1, -1)):
+        self.rows = rows
+        self.cols = cols
+        self.cells = cells
+
+        # has no start or end coordinate by default
+        self.start_coord = start_coord
+        self.end_coord = end_coord
+
+        # Graph points include: intersections, turns & dead ends. Start/end points are spliced in per query
+        # Adjacency list form of the graph, only filled by `create_graph`
+        self.graph_points = AdjacencyList()
+        # Packed corridor graph, built on first use by `corridor_graph` and dropped whenever a wall changes
+        self.graph_cache : CSRGraph|None = None
+        # Scan tables of Jump Point Search, built on first use by `jump_tables` and dropped with the graph
+        self.jump_cache: tuple[bytes, bytes, bytes, bytes]|None = None
+
+    # == Cell access == #
+    def index(self, row: int, col: int) -> int:
+        return row * self.cols + col
+
+    def coord(self, index: int) -> tuple[int, int]:
+        return divmod(index, self.cols)
+
+    def state(self, row: int, col: int) -> int:
+        '''
+        Raw cell code (a `BlockState` value) at (row, col)
+        '''
+        return self.cells[row * self.cols + col]
+
+    def is_wall(self, row: int, col: int) -> bool:
+        return self.cells[row * self.cols + col] == WALL
+
+    def set_cell(self, row: int, col: int, code: int):
+        '''
+        Writes the raw cell code at (row, col). Adding or removing a wall changes the corridors, so the cached graph
+        is dropped; moving start/end points over open cells keeps it
+        '''
+        ind = row * self.cols + col
+
+        if (self.cells[ind] == WALL) != (code == WALL):
+            self.graph_cache = None
+            self.jump_cache = None
+
+        self.cells[ind] = code
+
+    def set_start(self, coord: tuple[int, int]):
+        '''
+        Moves the start point to `coord`, returning the old start cell to OPEN
+        '''
+        if self.start_coord != (-1, -1):
+            self.set_cell(*self.start_coord, OPEN)
+
+        self.set_cell(*coord, START)
+        self.start_coord = coord
+
+    def set_end(self, coord: tuple[int, int]):
+        '''
+        Moves the end point to `coord`, returning the old end cell to OPEN
+        '''
+        if self.end_coord != (-1, -1):
+            self.set_cell(*self.end_coord, OPEN)
+
+        self.set_cell(*coord, END)
+        self.end_coord = coord
+
+    def snapshot(self) -> "MazeGrid":
+        '''
+        A copy that can be pickled to worker processes: memory-mapped cells are copied into a `bytearray`, and the
+        cached corridor graph and jump tables come along if they were built already
+        '''
+        copy = MazeGrid(self.rows, self.cols, bytearray(self.cells), self.start_coord, self.end_coord)
+        copy.graph_cache = self.graph_cache
+        copy.jump_cache = self.jump_cache
+
+        return copy
+
+    # == Graph construction == #
+    def open_lanes(self) -> tuple[int, int]:
+        '''
+        The grid as one big int with an 8-bit lane per cell (row-major), 1 for open cells. A closed padding lane ends
+        every row, so shifted rows never wrap into each other. Returns (lanes, lanes per row)
+        '''
+        rows, cols = self.rows, self.cols
+
+        open_cells = bytes(self.cells).translate(OPEN_TABLE)
+        padded = b"\0".join(open_cells[row * cols:(row + 1) * cols] for row in range(rows)) + b"\0"
+
+        return int.from_bytes(padded, "little"), cols + 1
+
+    def neighbor_lanes(self) -> tuple[int, int]:
+        '''
+        The `NEIGHBOR_*` bits of every cell, as the lanes of one big int laid out like `open_lanes`. Shifting the open
+        lanes by one lane or one row lines every cell up with a neighbor, so the bits of all cells come out of 5 shifts
+        and ORs. Returns (neighbor lanes, lanes per row); bits may spill past the last row, into lanes no cell has
+        '''
+        lanes, width = self.open_lanes()
+        row_shift = 8 * width
+
+        neighbors = ((lanes << 4) # the cell itself
+                     | (lanes >> 8) # right
+                     | (lanes << 8) << 1 # left
+                     | (lanes >> row_shift) << 2 # down
+                     | (lanes << row_shift) << 3) # up
+
+        return neighbors, width
+
+    def classify_cells(self) -> bytes:
+        '''
+        Classifies every cell of the grid at once. Returns one byte per cell (row-major): the cell's `NEIGHBOR_*` bits
+        if it is a graph point, 0 otherwise.
+
+        Each cell is an 8-bit lane of one big int (`neighbor_lanes`), and one `bytes.translate` through
+        `GRAPH_POINT_TABLE` keeps the graph points.
+        '''
+        rows, cols = self.rows, self.cols
+        neighbors, width = self.neighbor_lanes()
+
+        points = neighbors.to_bytes((rows + 1) * width + 1, "little")[:rows * width].translate(GRAPH_POINT_TABLE)
+
+        return b"".join(points[row * width:row * width + cols] for row in range(rows))
+
+    def jump_tables(self) -> tuple[bytes, bytes, bytes, bytes]:
+        '''
+        Tables for the straight scans of `Algorithms.jump_point_search`, one byte per cell, built once and cached until
+        a wall changes. Returns (neighbors, right, left, vertical):
+            - neighbors (row-major): the `NEIGHBOR_*` bits of every cell, so no scan starts into a wall
+            - right / left (row-major): 1 for walls, and for cells with a forced neighbor when moving right / left
+              (an open cell above or below whose diagonal neighbor behind is a wall)
+            - vertical (column-major, cell (row, col) at `col * rows + row`, so a column is one run of bytes): 1 for
+              walls, and for cells with an open left or right neighbor, the only cells a vertical jump can end at
+        A scan is then one `bytes.find` / `rfind` per stop instead of a test per cell. Built like `classify_cells`
+        '''
+        if self.jump_cache is not None:
+            return self.jump_cache
+
+        rows, cols = self.rows, self.cols
+        neighbors, width = self.neighbor_lanes()
+        lane_count = rows * width
+        all_lanes = int.from_bytes(b"\1" * lane_count, "little")
+        neighbors &= int.from_bytes(b"\x1f" * lane_count, "little")
+
+        walls = ((neighbors >> 4) & all_lanes) ^ all_lanes # padding lanes included
+        up = (neighbors >> 3) & all_lanes
+        down = (neighbors >> 2) & all_lanes
+        sides = (neighbors | (neighbors >> 1)) & all_lanes
+
+        # Shifting `up` / `down` by one lane gives the same of the cell behind: the diagonal neighbor
+        right = walls | (up & ~(up << 8)) | (down & ~(down << 8))
+        left = walls | (up & ~(up >> 8)) | (down & ~(down >> 8))
+
+        neighbors, right, left, vertical = (table.to_bytes(lane_count, "little")
+                                            for table in (neighbors, right, left, walls | sides))
+
+        self.jump_cache = (b"".join(neighbors[row * width:row * width + cols] for row in range(rows)),
+                           b"".join(right[row * width:row * width + cols] for row in range(rows)),
+                           b"".join(left[row * width:row * width + cols] for row in range(rows)),
+                           b"".join(vertical[col::width] for col in range(cols)))
+
+        return self.jump_cache
+
+    def corridor_graph(self) -> CSRGraph:
+        '''
+        The packed corridor graph of the whole grid. Built once and cached until a wall changes (`set_cell`)
+        '''
+        if self.graph_cache is None:
+            with profiling.phase("graph build"):
+                self.graph_cache = self.build_corridor_graph()
+
+        return self.graph_cache
+
+    def build_corridor_graph(self) -> CSRGraph:
+        '''
+        Builds the `CSRGraph` straight from `classify_cells`, visiting only the graph points and walking no corridor.
+        Every cell between two graph points is a straight corridor cell, so a graph point with an open right (down)
+        neighbor is joined to the next graph point in its row (column), at a distance of the cells between them.
+        The target was tens of milliseconds on the 1000x1000 premade maze; it measures 0.3-0.45s there. The
+        classification takes about 12ms of that, and the rest is pairing the graph points and packing their edges,
+        one point at a time (see `python -m benchmarks.graph_build`)
+        '''
+        rows, cols = self.rows, self.cols
+        points = self.classify_cells()
+
+        vertex_cells = array('I', compress(range(rows * cols), points))
+        vertex_of = dict(zip(vertex_cells, range(len(vertex_cells))))
+
+        # Pair every graph point with the next one down its column
+        below = {}
+        for col in range(cols):
+            column = [row * cols + col for row in compress(range(rows), points[col::cols])]
+            below.update((upper, lower) for upper, lower in zip(column, column[1:]) if points[upper] & NEIGHBOR_DOWN)
+        above = {lower: upper for upper, lower in below.items()}
+
+        # Vertex numbers follow cell order, so the neighbors of a vertex sort as up, left, right, down.
+        # Each edge also keeps the direction of its corridor, so solvers can list its cells without walking it
+        offsets = [0]
+        targets = []
+        weights = []
+        steps = []
+
+        for vertex, cell in enumerate(vertex_cells):
+            bits = points[cell]
+
+            if bits & NEIGHBOR_UP:
+                targets.append(vertex_of[above[cell]])
+                weights.append((cell - above[cell]) // cols)
+                steps.append(-cols)
+            if bits & NEIGHBOR_LEFT:
+                targets.append(vertex - 1)
+                weights.append(cell - vertex_cells[vertex - 1])
+                steps.append(-1)
+            if bits & NEIGHBOR_RIGHT:
+                targets.append(vertex + 1)
+                weights.append(vertex_cells[vertex + 1] - cell)
+                steps.append(1)
+            if bits & NEIGHBOR_DOWN:
+                targets.append(vertex_of[below[cell]])
+                weights.append((below[cell] - cell) // cols)
+                steps.append(cols)
+
+            offsets.append(len(targets))
+
+        return CSRGraph(array('I', offsets), array('I', targets), array('I', weights), array('i', steps), vertex_cells)
+
+    def create_graph(self):
+        '''
+            Fills the adjacency list (`graph_points`) with the corridor graph, for inspection with `print_list`.
+            Solvers use the packed `corridor_graph` instead
+        '''
+        graph = self.corridor_graph()
+        self.graph_points = AdjacencyList()
+
+        for vertex in range(graph.get_vertices()):
+            for edge in range(graph.offsets[vertex], graph.offsets[vertex + 1]):
+                neighbor = graph.targets[edge]
+
+                if neighbor > vertex: # add_connection stores both directions
+                    self.graph_points.add_connection(self.coord(graph.vertex_cells[vertex]),
+                                                     self.coord(graph.vertex_cells[neighbor]), graph.weights[edge])
+
+    def splice_terminals(self, start_coord: tuple[int, int]|None = None,
+                         end_coord: tuple[int, int]|None = None) -> tuple[SplicedGraph, int|None, int|None]:
+        '''
+        Returns the cached corridor graph with the start and end points spliced in, and their vertex numbers
+        (None for a point that is not placed). `start_coord`/`end_coord` default to the maze's own points; passing
+        them queries other pairs without touching the grid.
+        A point on a graph point is that vertex. Any other open cell lies inside a straight corridor, so it becomes
+        a temporary vertex joined to whatever graph point (or other start/end point) ends the corridor on each side
+        '''
+        graph = SplicedGraph(self.corridor_graph())
+        terminals = []
+
+        for coord in (start_coord or self.start_coord, end_coord or self.end_coord):
+            if coord == (-1, -1):
+                terminals.append(None)
+                continue
+
+            cell = self.index(*coord)
+            vertex = graph.vertex_at(cell)
+            terminals.append(graph.add_vertex(cell) if vertex is None else vertex)
+
+        for vertex in terminals:
+            if vertex is not None and vertex >= graph.base_vertices:
+                self.splice_corridor(graph, vertex)
+
+        start_id, end_id = terminals
+        return graph, start_id, end_id
+
+    def splice_corridor(self, graph: SplicedGraph, vertex: int):
+        '''
+        Connects the temporary `vertex` to the first vertex of `graph` in each of the 4 directions
+        '''
+        start_y, start_x = self.coord(graph.cell(vertex))
+        # 0s are there so only either the x or y coordinate is changed in one loop
+        dx = [1, -1, 0, 0]  # right, left
+        dy = [0, 0, 1, -1]  # down, up
+        for i in range(4):
+            current_x, current_y = start_x + dx[i], start_y + dy[i]
+            distance = 1
+
+            while (0 <= current_x < self.cols and 0 <= current_y < self.rows
+                    and self.cells[current_y * self.cols + current_x] != WALL):
+                neighbor = graph.vertex_at(current_y * self.cols + current_x)
+
+                if neighbor is not None:
+                    graph.add_connection(vertex, neighbor, distance, dy[i] * self.cols + dx[i])
+                    break
+
+                current_x, current_y = current_x + dx[i], current_y + dy[i]
+                distance += 1
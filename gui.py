@@ -1,8 +1,13 @@
 import pygame
 from pygame.font import Font
 from constants import *
+import dirty_rects
 
 class Text:
+    '''
+    Retained text box: the wrapped lines are rendered once per text change, and `draw` only paints when the text
+    changed or the box was cleared since it last did
+    '''
     def __init__(self, screen: pygame.Surface, text_color: pygame.Color, font_size: int,
                  rect: pygame.Rect, text: str = "", bg_color=(WHITE), 
                  font_path=None, center_text=True):
@@ -27,6 +32,17 @@ class Text:
         else:
             self.text_center = None
 
+    @property
+    def text(self) -> str:
+        return self._text
+
+    @text.setter
+    def text(self, text: str):
+        if getattr(self, "_text", None) != text:
+            self._text = text
+            self.line_surfaces = None # rendered again by the next draw
+            self.needs_draw = True
+
     def wrap_text(self):
         """Split self.text into multiple lines that fit in self.rect width."""
         words = self.text.split(" ")
@@ -47,31 +63,37 @@ class Text:
         return lines
 
     def draw(self):
-        """Draw the text (wrapped) inside the rect."""
+        """Draw the text (wrapped) inside the rect, if it changed since the last draw."""
+        if not self.needs_draw:
+            return
+
         # Draw background and border
         pygame.draw.rect(self.screen, pygame.Color("gray20"), self.rect)
         pygame.draw.rect(self.screen, pygame.Color("gray20"), self.rect, 2)
 
         # Render wrapped lines
-        lines = self.wrap_text()
+        if self.line_surfaces is None:
+            self.line_surfaces = [self.font.render(line, True, self.text_color) for line in self.wrap_text()]
         line_height = self.font.get_linesize()
 
-        total_height = len(lines) * line_height
-        y_offset = self.rect.y + ((self.rect.height - (line_height * len(lines))) // 2 if self.center_text else 5)
+        y_offset = self.rect.y + ((self.rect.height - (line_height * len(self.line_surfaces))) // 2 if self.center_text else 5)
 
-        for line in lines:
-            text_surface = self.font.render(line, True, self.text_color)
-            text_rect = text_surface.get_rect()
-            text_rect.x = self.rect.x + 5
-            text_rect.y = y_offset
-            self.screen.blit(text_surface, text_rect)
+        for text_surface in self.line_surfaces:
+            self.screen.blit(text_surface, (self.rect.x + 5, y_offset))
             y_offset += line_height
 
+        dirty_rects.mark(self.rect)
+        self.needs_draw = False
+
     def clear(self):
         pygame.draw.rect(self.screen, self.bg_color, self.rect)
+        dirty_rects.mark(self.rect)
+        self.needs_draw = True # the next draw paints it again
 
 class Button:
-
+    '''
+    Retained button: `draw` only paints when its enabled or hover state changed since it last did
+    '''
     def __init__(self, screen: pygame.surface, bg_color: pygame.Color, text_color: pygame.Color,
                  font_size: int, rect: pygame.Rect, text: str = "", font_path=None):
         self.screen = screen
@@ -89,19 +111,38 @@ class Button:
         self.text_rect = self.text_surface.get_rect(center=(self.rect.centerx, self.rect.centery)) # Center the text
 
         self.enabled = True
+        self.hovered = False
         self.disabled_bg_color = bg_color - pygame.Color(80, 80, 80)
+        self.hover_bg_color = bg_color + pygame.Color(30, 30, 30)
+
+        self.needs_draw = True
 
     def draw(self):
-        if self.enabled:
-            color = self.bg_color
-        else:
+        if not self.needs_draw:
+            return
+
+        if not self.enabled:
             color = self.disabled_bg_color
+        elif self.hovered:
+            color = self.hover_bg_color
+        else:
+            color = self.bg_color
 
         pygame.draw.rect(self.screen, color, self.rect)
         self.screen.blit(self.text_surface, self.text_rect)
+
+        dirty_rects.mark(self.rect)
+        self.needs_draw = False
     
     def set_enabled(self, enabled: bool):
-        self.enabled = enabled
+        if enabled != self.enabled:
+            self.enabled = enabled
+            self.needs_draw = True
+
+    def set_hovered(self, hovered: bool):
+        if hovered != self.hovered:
+            self.hovered = hovered
+            self.needs_draw = True
 
     def is_enabled(self):
         return self.enabled
@@ -114,14 +155,14 @@ class Button:
         dimmed_color = tuple(max(c-50,0) for c in self.bg_color)
         pygame.draw.rect(self.screen, dimmed_color, self.rect)
         self.screen.blit(self.text_surface, self.text_rect)
-        pygame.display.flip()
+        pygame.display.update(self.rect)
         
         pygame.time.delay(100)
 
-        pygame.draw.rect(self.screen, self.bg_color, self.rect)
-        self.screen.blit(self.text_surface, self.text_rect)
+        self.needs_draw = True
+        self.draw()
 
-        pygame.display.flip()
+        pygame.display.update(self.rect)
 
     def is_clicked(self, pos):
         return self.enabled and self.rect.collidepoint(pos)
@@ -132,32 +173,40 @@ class Button:
 def create_buttons(screen):
     '''
     Creates buttons in bulk, can add new buttons, just make sure to add it to return statement
+    Buttons sit in two columns: maze and drawing controls on the left, algorithm choices on the right
     '''
 
     # === Load custom font ===
     font_path = "fot-yuruka-std.ttf"
 
     # Position to the right of the maze
-    panel_x = MAZE_PADDING_LEFT + MAZE_SIZE + 40
-    button_width = BUTTON_WIDTH
+    panel_x = MAZE_PADDING_LEFT + MAZE_SIZE + 30
+    button_width = PANEL_BUTTON_WIDTH
     button_height = BUTTON_HEIGHT
+    column_gap = 10
 
+    # (title, color, gap after, column)
     button_list = [
-        ("Upload Maze", LIGHT_SKY_BLUE, 10),
-        ("Use Pre-made", LIGHT_SKY_BLUE, 40),
-        ("Draw Traversal", LIGHT_SKY_BLUE, 10),
-        ("Show solution", LIGHT_SKY_BLUE, 10),
-        ("Unload Maze", RED, 30),
-        ("A*", RED, 10),
-        ("Dijkstra's", RED, 0),
+        ("Upload Maze", LIGHT_SKY_BLUE, 10, 0),
+        ("Use Pre-made", LIGHT_SKY_BLUE, 15, 0),
+        ("Draw Traversal", LIGHT_SKY_BLUE, 10, 0),
+        ("Show solution", LIGHT_SKY_BLUE, 10, 0),
+        ("Cancel Solve", RED, 10, 0),
+        ("Unload Maze", RED, 10, 0),
+        ("A*", RED, 10, 1),
+        ("Dijkstra's", RED, 10, 1),
+        ("Bi-A*", RED, 10, 1),
+        ("Bi-Dijkstra's", RED, 10, 1),
+        ("JPS", RED, 10, 1),
+        ("Counters", LIGHT_SKY_BLUE, 10, 1),
     ]
 
-    # Calculate total height to center them vertically
-    total_height = 0
+    # Calculate the tallest column's height to center them vertically
+    column_heights = [0, 0]
     for item in button_list:
-        label, color, gap_after = item
-        total_height += button_height + gap_after
-    total_height -= button_list[-1][2]  # removing last gap just in case
+        label, color, gap_after, column = item
+        column_heights[column] += button_height + gap_after
+    total_height = max(column_heights) - 10  # removing last gap just in case
 
     # Start Y so the whole group is centered
     panel_y = (RES_HEIGHT - total_height) // 2 - 200
@@ -165,7 +214,7 @@ def create_buttons(screen):
     # Buttons panel styling
     container_padding_x = 20
     container_padding_y = 20
-    container_width = button_width + container_padding_x * 2
+    container_width = button_width * 2 + column_gap + container_padding_x * 2
     container_height = total_height + container_padding_y * 2
 
     container_rect = pygame.Rect(
@@ -179,23 +228,23 @@ def create_buttons(screen):
 
     # Create all buttons
     buttons = []
-    current_y = panel_y
+    current_y = [panel_y, panel_y]
     for item in button_list:
-        button_title, color, gap_after = item
+        button_title, color, gap_after, column = item
         # Create the Button object with custom font path
         new_button = Button(
             screen=screen,
             bg_color=pygame.Color(color),
             text_color=pygame.Color(WHITE),
             font_size=NUM_FONT,
-            rect=pygame.Rect(panel_x, current_y, button_width, button_height),
+            rect=pygame.Rect(panel_x + column * (button_width + column_gap), current_y[column], button_width, button_height),
             text=button_title,
             font_path=font_path   # <-- Added custom font
         )
         buttons.append(new_button)
 
         # Move down for the next button
-        current_y += button_height + gap_after
+        current_y[column] += button_height + gap_after
 
     return tuple(buttons)
 
@@ -288,3 +337,24 @@ def create_results(screen: pygame.Surface):
         results.append(result_text)
 
     return results
+
+def create_counters(screen: pygame.Surface):
+    '''
+    Search counters of the last solve, shown between the buttons and the results panel while toggled on
+    '''
+    counters_rect = pygame.Rect(
+        MAZE_PADDING_LEFT + MAZE_SIZE + 10,
+        COUNTERS_PADDING_TOP,
+        PANEL_BUTTON_WIDTH * 2 + 50,
+        COUNTERS_HEIGHT
+    )
+
+    return Text(
+        screen=screen,
+        text_color=pygame.Color(WHITE),
+        font_path="fot-yuruka-std.ttf",
+        font_size=NUM_FONT - 6,
+        rect=counters_rect,
+        bg_color=pygame.Color(WHITE),
+        center_text=False
+    )
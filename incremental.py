@@ -0,0 +1,300 @@
+import heapq
+from array import array
+from time import time
+from grid import MazeGrid, OPEN_TABLE
+from Algorithms import UNREACHED
+from search_stats import SearchStats
+import paths
+
+'''
+Incremental replanning (D* Lite) for a maze whose start, end and walls change between solves.
+A search is rooted at one end point and runs toward the other: g[cell] is the cell's distance to the root as last
+computed and rhs[cell] its one-step lookahead, 1 + the smallest g of its open neighbors. Cells where the two differ
+are queued. A solve only processes queued cells until the target is settled, so after a change it repairs the part
+of the previous search that the change touched instead of searching again from scratch:
+    - the target moving only shifts the heuristic; the key modifier `km` keeps the old queue entries usable
+    - a cell turning into a wall or back is a lookahead change of the cell and its neighbors
+The root moving changes every distance, so it restarts the search. `IncrementalPlanner` keeps one search rooted at
+the end and one at the start, and answers each solve with the one whose root stayed put.
+'''
+
+# Cells compared at a time when looking for walls that changed; equal chunks are skipped with one comparison
+WALL_SCAN_CHUNK = 4096
+
+def changed_cells(old: bytes, new: bytes) -> list[int]:
+    '''
+    Indices where two equally long `OPEN_TABLE` translations of a grid's cells differ: the cells that turned into
+    walls or back
+    '''
+    if old == new:
+        return []
+
+    changed = []
+    for chunk in range(0, len(new), WALL_SCAN_CHUNK):
+        new_chunk = new[chunk:chunk + WALL_SCAN_CHUNK]
+        old_chunk = old[chunk:chunk + WALL_SCAN_CHUNK]
+
+        if new_chunk != old_chunk:
+            changed.extend(chunk + offset for offset, (new_open, old_open) in enumerate(zip(new_chunk, old_chunk))
+                           if new_open != old_open)
+
+    return changed
+
+class IncrementalSearch:
+    '''
+    D* Lite search state rooted at the flat cell index `root`. `plan` settles the search for a target, reusing
+    everything computed for earlier targets and walls. With `use_heuristic` queued cells are ordered by their
+    Manhattan distance to the target as well (A*), without it by distance to the root alone (Dijkstra's)
+    '''
+    def __init__(self, grid: MazeGrid, root: int, use_heuristic: bool = True):
+        self.grid = grid
+        self.root = root
+        self.use_heuristic = use_heuristic
+        self.size = grid.rows * grid.cols
+
+        # The walls the search state was computed for: 1 for open cells, 0 for walls
+        self.open_cells = bytearray(bytes(grid.cells).translate(OPEN_TABLE))
+
+        self.target = -1
+        self.target_row, self.target_col = -1, -1
+        self.km = 0
+        self.g_scores = array('i', [UNREACHED]) * self.size
+        self.rhs_scores = array('i', [UNREACHED]) * self.size
+        self.rhs_scores[root] = 0
+        self.frontier = [] # min heap of packed (key, cell) entries, see `packed_key`
+
+    def heuristic(self, cell: int) -> int:
+        if not self.use_heuristic:
+            return 0
+
+        row, col = divmod(cell, self.grid.cols)
+
+        return abs(row - self.target_row) + abs(col - self.target_col)
+
+    def packed_key(self, cell: int) -> int:
+        '''
+        The D* Lite key (min(g, rhs) + h + km, min(g, rhs)) of `cell`, packed with the cell into one int so heap
+        entries compare by key and then by cell. Both distances are below `size`
+        '''
+        g_score, rhs_score = self.g_scores[cell], self.rhs_scores[cell]
+        distance = g_score if g_score < rhs_score else rhs_score
+        size = self.size
+
+        return ((distance + self.heuristic(cell) + self.km) * size + distance) * size + cell
+
+    def neighbors(self, cell: int) -> list[int]:
+        '''
+        Open neighbors of `cell`: above, below, left, right
+        '''
+        cols, open_cells = self.grid.cols, self.open_cells
+        found = []
+
+        if cell >= cols and open_cells[cell - cols]:
+            found.append(cell - cols)
+        if cell + cols < self.size and open_cells[cell + cols]:
+            found.append(cell + cols)
+
+        col = cell % cols
+        if col > 0 and open_cells[cell - 1]:
+            found.append(cell - 1)
+        if col < cols - 1 and open_cells[cell + 1]:
+            found.append(cell + 1)
+
+        return found
+
+    def update_cell(self, cell: int):
+        '''
+        Recomputes the lookahead of `cell` and queues it if it no longer agrees with its g-score.
+        Stale heap entries are not removed; `compute_shortest_path` skips them when popped
+        '''
+        g_scores = self.g_scores
+
+        if cell != self.root:
+            best = UNREACHED
+            if self.open_cells[cell]:
+                for neighbor in self.neighbors(cell):
+                    if g_scores[neighbor] < best:
+                        best = g_scores[neighbor]
+            self.rhs_scores[cell] = best + 1 if best != UNREACHED else UNREACHED
+
+        if g_scores[cell] != self.rhs_scores[cell]:
+            heapq.heappush(self.frontier, self.packed_key(cell))
+
+    def compute_shortest_path(self, stats: SearchStats|None = None) -> array:
+        '''
+        Processes queued cells in key order until the target is settled. Returns the cells processed, in order.
+        Fills the heap counters of `stats` if one is given; entries queued before this call count as its seeds
+        '''
+        g_scores, rhs_scores, frontier = self.g_scores, self.rhs_scores, self.frontier
+        size, target, root = self.size, self.target, self.root
+        heappush, heappop = heapq.heappush, heapq.heappop
+        explored = array('I')
+
+        seeds = len(frontier)
+        pops = peak = 0
+        track = stats is not None
+
+        while frontier:
+            if frontier[0] // size >= self.packed_key(target) // size and g_scores[target] == rhs_scores[target]:
+                break
+
+            if track and len(frontier) > peak:
+                peak = len(frontier)
+
+            pops += 1
+            entry = heappop(frontier)
+            cur = entry % size
+            cur_g = g_scores[cur]
+            cur_rhs = rhs_scores[cur]
+
+            if cur_g == cur_rhs: # Settled since this entry was pushed
+                continue
+
+            key = entry // size
+            current_key = self.packed_key(cur) // size
+            if key < current_key: # Target moved since the entry was pushed; queue again under the larger key
+                heappush(frontier, current_key * size + cur)
+                continue
+            elif key > current_key: # Superseded by a newer entry with a smaller key
+                continue
+
+            explored.append(cur)
+
+            if cur_g > cur_rhs:
+                # Overconsistent: a shorter way to the root was found, which can only shorten the neighbors' lookahead
+                g_scores[cur] = cur_rhs
+                through = cur_rhs + 1
+
+                for neighbor in self.neighbors(cur):
+                    if neighbor != root and through < rhs_scores[neighbor]:
+                        rhs_scores[neighbor] = through
+                        heappush(frontier, self.packed_key(neighbor))
+            else:
+                # Underconsistent: the old way got longer or was cut. Neighbors whose lookahead went through this
+                # cell are recomputed, and so is the cell itself
+                g_scores[cur] = UNREACHED
+                through = cur_g + 1
+
+                for neighbor in self.neighbors(cur):
+                    if rhs_scores[neighbor] == through:
+                        self.update_cell(neighbor)
+                self.update_cell(cur)
+
+        if track:
+            stats.record_heap(seeds=seeds, pops=pops, stale=pops - len(explored), queued=len(frontier), peak=peak)
+            stats.corridor_cells = stats.nodes_expanded
+
+        return explored
+
+    def sync_walls(self):
+        '''
+        Finds the cells of the grid that turned into walls or back since the last plan and updates their lookahead
+        and their neighbors'
+        '''
+        current = bytes(self.grid.cells).translate(OPEN_TABLE)
+        changed = changed_cells(self.open_cells, current)
+        self.open_cells[:] = current
+
+        for cell in changed:
+            self.update_cell(cell)
+            for neighbor in self.neighbors(cell):
+                self.update_cell(neighbor)
+
+    def plan(self, target: int, stats: SearchStats|None = None) -> tuple[array, list[int]]:
+        '''
+        Settles the search for `target` under the grid's current walls, filling `stats` if one is given.
+        Returns the cells processed, in order, and the shortest path from `target` to the root ([] if there is none)
+        '''
+        self.sync_walls()
+
+        if self.target == -1:
+            self.target = target
+            self.target_row, self.target_col = divmod(target, self.grid.cols)
+            heapq.heappush(self.frontier, self.packed_key(self.root))
+
+        elif target != self.target:
+            # Keys already queued were computed with the old target's heuristic, which can drop by at most the
+            # distance the target moved; raising every new key by that much keeps the old ones comparable
+            new_row, new_col = divmod(target, self.grid.cols)
+            if self.use_heuristic:
+                self.km += abs(self.target_row - new_row) + abs(self.target_col - new_col)
+            self.target = target
+            self.target_row, self.target_col = new_row, new_col
+
+        explored = self.compute_shortest_path(stats)
+
+        path = []
+        if self.g_scores[target] != UNREACHED:
+            # Walk downhill: every step goes to the open neighbor closest to the root
+            g_scores = self.g_scores
+            cur = target
+            path.append(cur)
+
+            while cur != self.root:
+                cur = min(self.neighbors(cur), key=g_scores.__getitem__)
+                path.append(cur)
+
+        return explored, path
+
+class IncrementalPlanner:
+    '''
+    Search state kept between solves of one maze: a search rooted at the end, which repairs cheaply when the start
+    moves, and one rooted at the start for when the end moves. `solve` reads the grid's current start, end and
+    walls and answers with a search whose root is still in place, restarting one only when both roots moved
+    '''
+    def __init__(self, grid: MazeGrid, use_heuristic: bool = True):
+        self.grid = grid
+        self.use_heuristic = use_heuristic
+
+        self.from_end: IncrementalSearch|None = None
+        self.from_start: IncrementalSearch|None = None
+        self.last_used: IncrementalSearch|None = None
+
+    def solve(self, maze: MazeGrid, stats: SearchStats|None = None, corridors: bool = False):
+        '''
+        Repairs a search for the maze's current start, end and walls. Fills `stats` if one is given, counting only
+        this solve's repair work.
+        Returns:
+            explored: array('I') of the cell indices processed by this solve, in order
+            final_path: array('I') of the cell indices in the shortest path, or its waypoints with `corridors`
+                (see `paths`)
+            solve_time: time taken to solve
+        '''
+        if maze is not self.grid:
+            raise Exception("Incremental planner was created for a different maze")
+        elif maze.start_coord == (-1, -1) or maze.end_coord == (-1, -1):
+            raise Exception("Maze needs a start and an end point to plan a path")
+
+        start_time = time()
+
+        start = maze.index(*maze.start_coord)
+        end = maze.index(*maze.end_coord)
+
+        end_rooted = self.from_end is not None and self.from_end.root == end
+        start_rooted = self.from_start is not None and self.from_start.root == start
+
+        # Prefer the search used last: while one point is dragged around, the other one is its root
+        if end_rooted and (not start_rooted or self.last_used is self.from_end):
+            search = self.from_end
+        elif start_rooted:
+            search = self.from_start
+        elif self.last_used is not None and self.last_used is self.from_end:
+            # Both points moved: restart the search that was not in use, so the one dragged last keeps its state
+            search = self.from_start = IncrementalSearch(maze, start, self.use_heuristic)
+        else:
+            search = self.from_end = IncrementalSearch(maze, end, self.use_heuristic)
+        self.last_used = search
+
+        if search is self.from_end:
+            explored, final_path = search.plan(start, stats)
+        else:
+            explored, final_path = search.plan(end, stats)
+            final_path.reverse()
+        final_path = array('I', final_path)
+
+        solve_time = time() - start_time
+
+        if stats is not None:
+            stats.search_time = solve_time
+
+        return explored, paths.encode(final_path, maze.cols) if corridors else final_path, solve_time
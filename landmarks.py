@@ -0,0 +1,209 @@
+import mmap
+import os
+import struct
+import sys
+import zlib
+from array import array
+from grid import MazeGrid, WALL, OPEN_TABLE
+
+'''
+ALT (A*, Landmarks, Triangle inequality) heuristic index.
+A few landmark cells are picked and the exact maze distance from each landmark to every cell is stored. For any
+landmark L, |dist(L, goal) - dist(L, cell)| <= dist(cell, goal), so the largest of these bounds is an admissible
+heuristic that follows the corridors, unlike Manhattan distance which ignores the walls.
+
+Binary index format (little endian):
+    magic b"ALTI", u16 version, u16 landmark count, u32 rows, u32 cols, u32 crc32 of the wall layout
+followed by the landmark cells (u32 each) and then one i32 distance per cell for every landmark, row-major
+'''
+INDEX_MAGIC = b"ALTI"
+INDEX_VERSION = 1
+INDEX_HEADER = struct.Struct("<4sHHIII")
+
+# Distance of cells a landmark cannot reach (walls and other regions of the maze)
+NO_PATH = -1
+
+DEFAULT_LANDMARKS = 8
+# Landmarks used per query: the ones giving the best bound between start and end
+ACTIVE_LANDMARKS = 4
+
+class LandmarkIndex:
+    '''
+    Landmark cells and their distance arrays for one maze layout. `distances[i][cell]` is the number of steps from
+    `landmarks[i]` to the flat cell index `cell`, or NO_PATH
+    '''
+    def __init__(self, rows: int, cols: int, landmarks: array, distances: list, fingerprint: int):
+        self.rows = rows
+        self.cols = cols
+        self.landmarks = landmarks
+        self.distances = distances
+        self.fingerprint = fingerprint
+
+    def matches(self, grid: MazeGrid) -> bool:
+        '''
+        Whether the index was built for `grid`'s walls (start/end points may have moved since)
+        '''
+        return (grid.rows, grid.cols) == (self.rows, self.cols) and wall_fingerprint(grid) == self.fingerprint
+
+    def goal_bounds(self, start: int, goal: int) -> list[tuple]:
+        '''
+        The (distances, distance to goal) pairs of the ACTIVE_LANDMARKS landmarks that bound the start -> goal
+        distance best. Feed them to `heuristic`
+        '''
+        bounds = []
+        for distances in self.distances:
+            to_goal, to_start = distances[goal], distances[start]
+
+            if to_goal != NO_PATH and to_start != NO_PATH:
+                bounds.append((abs(to_goal - to_start), distances, to_goal))
+
+        bounds.sort(key=lambda bound: bound[0], reverse=True)
+
+        return [(distances, to_goal) for _, distances, to_goal in bounds[:ACTIVE_LANDMARKS]]
+
+    def nbytes(self):
+        """returns the bytes held by the distance arrays"""
+        return sum(len(distances) * distances.itemsize for distances in self.distances)
+
+def heuristic(cell: int, bounds: list[tuple]) -> int:
+    '''
+    Triangle inequality lower bound on the steps from `cell` to the goal of `bounds` (from `goal_bounds`)
+    '''
+    best = 0
+
+    for distances, to_goal in bounds:
+        to_cell = distances[cell]
+        if to_cell != NO_PATH:
+            bound = to_goal - to_cell if to_goal > to_cell else to_cell - to_goal
+            if bound > best:
+                best = bound
+
+    return best
+
+def wall_fingerprint(grid: MazeGrid) -> int:
+    return zlib.crc32(bytes(grid.cells).translate(OPEN_TABLE))
+
+def bfs_distances(grid: MazeGrid, source: int) -> array:
+    '''
+    Steps from the flat cell index `source` to every cell, level by level; NO_PATH where it cannot reach
+    '''
+    cells, cols = grid.cells, grid.cols
+    size = grid.rows * cols
+
+    distances = array('i', [NO_PATH]) * size
+    distances[source] = 0
+
+    frontier = [source]
+    steps = 0
+    while frontier:
+        steps += 1
+        next_frontier = []
+
+        for cur in frontier:
+            # Neighbors: above, below, left, right
+            neighbor = cur - cols
+            if neighbor >= 0 and distances[neighbor] == NO_PATH and cells[neighbor] != WALL:
+                distances[neighbor] = steps
+                next_frontier.append(neighbor)
+
+            neighbor = cur + cols
+            if neighbor < size and distances[neighbor] == NO_PATH and cells[neighbor] != WALL:
+                distances[neighbor] = steps
+                next_frontier.append(neighbor)
+
+            col = cur % cols
+            if col > 0 and distances[cur - 1] == NO_PATH and cells[cur - 1] != WALL:
+                distances[cur - 1] = steps
+                next_frontier.append(cur - 1)
+
+            if col < cols - 1 and distances[cur + 1] == NO_PATH and cells[cur + 1] != WALL:
+                distances[cur + 1] = steps
+                next_frontier.append(cur + 1)
+
+        frontier = next_frontier
+
+    return distances
+
+def build_landmarks(grid: MazeGrid, count: int = DEFAULT_LANDMARKS) -> LandmarkIndex:
+    '''
+    Picks `count` landmarks by farthest point selection: the first is the cell farthest from the first open cell,
+    every next one the cell farthest from all landmarks so far. Landmarks spread to the far ends of the maze, where
+    their bounds are tightest. Only the region of the first open cell gets landmarks; elsewhere the bound is 0
+    '''
+    size = grid.rows * grid.cols
+    first_open = bytes(grid.cells).translate(OPEN_TABLE).find(1)
+
+    if first_open == -1:
+        raise Exception("Maze has no open cells to place landmarks on")
+
+    landmarks = array('I')
+    distances = []
+
+    # Steps from the nearest landmark so far; starts as the steps from the first open cell
+    nearest = bfs_distances(grid, first_open)
+
+    for _ in range(count):
+        landmark = max(range(size), key=nearest.__getitem__)
+        if nearest[landmark] <= 0: # Every reachable cell is a landmark already
+            break
+
+        landmarks.append(landmark)
+        distances.append(bfs_distances(grid, landmark))
+
+        nearest = array('i', map(min, nearest, distances[-1]) if len(distances) > 1 else distances[-1])
+
+    return LandmarkIndex(grid.rows, grid.cols, landmarks, distances, wall_fingerprint(grid))
+
+# == Persistence == #
+def save_landmarks(index: LandmarkIndex, path: str):
+    with open(path, "wb") as index_file:
+        index_file.write(INDEX_HEADER.pack(INDEX_MAGIC, INDEX_VERSION, len(index.landmarks), index.rows, index.cols,
+                                           index.fingerprint))
+        index_file.write(index.landmarks.tobytes())
+        for distances in index.distances:
+            index_file.write(distances.tobytes())
+
+def load_landmarks(path: str) -> LandmarkIndex:
+    '''
+    Memory-maps a saved index; distance arrays are views into the mapping, read lazily as queries touch them
+    '''
+    with open(path, "rb") as index_file:
+        file_size = os.fstat(index_file.fileno()).st_size
+
+        if file_size < INDEX_HEADER.size:
+            raise Exception(f"Landmark index is too small to hold a header ({file_size} bytes)")
+
+        mapped = mmap.mmap(index_file.fileno(), 0, access=mmap.ACCESS_READ)
+
+    magic, version, count, rows, cols, fingerprint = INDEX_HEADER.unpack_from(mapped)
+
+    if magic != INDEX_MAGIC:
+        raise Exception(f"Not a landmark index file (magic {magic!r})")
+    elif version != INDEX_VERSION:
+        raise Exception(f"Unsupported landmark index version {version}")
+    elif file_size != INDEX_HEADER.size + 4 * count + 4 * count * rows * cols:
+        raise Exception(f"Landmark index is truncated: {file_size} bytes for {count} landmarks of {rows}x{cols}")
+
+    view = memoryview(mapped)
+    offset = INDEX_HEADER.size
+    landmarks = array('I', view[offset:offset + 4 * count].cast('I'))
+    offset += 4 * count
+
+    distances = []
+    for _ in range(count):
+        distances.append(view[offset:offset + 4 * rows * cols].cast('i'))
+        offset += 4 * rows * cols
+
+    return LandmarkIndex(rows, cols, landmarks, distances, fingerprint)
+
+if __name__ == "__main__":
+    from maze_io import load_maze
+
+    if len(sys.argv) not in (3, 4):
+        print("usage: python landmarks.py <maze file> <index file> [landmarks]")
+        sys.exit(1)
+
+    grid = load_maze(sys.argv[1])
+    index = build_landmarks(grid, int(sys.argv[3]) if len(sys.argv) == 4 else DEFAULT_LANDMARKS)
+    save_landmarks(index, sys.argv[2])
+    print(f"Wrote {len(index.landmarks)} landmarks for {grid.rows}x{grid.cols} maze to {sys.argv[2]}")
@@ -1,32 +1,51 @@
-import csv
 import pygame
 import _io
-from AdjacencyList import AdjacencyList
 from constants import *
-from collections import deque
-from block import Block, BlockState
-
-class Maze:
+from grid import MazeGrid, BlockState, OPEN
+from maze_io import maze_from_file
+import profiling
+import dirty_rects
+import paths
+from array import array
+
+# Display-only states painted over open cells; the grid itself never holds them
+EXPLORED = BlockState.EXPLORED.value
+FINAL = BlockState.FINAL.value
+
+# Cell state (a `BlockState` value) -> color: the palette of the maze's 8-bit view surface
+STATE_COLORS = {
+    BlockState.OPEN: PATH_COLOR,
+    BlockState.WALL: WALL_COLOR,
+    BlockState.INTERSECTION: INTERSECTION_COLOR,
+    BlockState.START: START_COLOR,
+    BlockState.END: END_COLOR,
+    BlockState.EXPLORED: EXPLORED_COLOR,
+    BlockState.FINAL: FINAL_PATH_COLOR,
+}
+PALETTE = [WALL_COLOR] * 256
+for block_state, color in STATE_COLORS.items():
+    PALETTE[block_state.value] = color
+
+# Display state -> translation table of grid cells showing that state over open cells only
+OVERLAYS = {state: bytes(state if code == OPEN else code for code in range(256)) for state in (EXPLORED, FINAL)}
+
+class Maze(MazeGrid):
     def __init__(self, maze_file: _io.TextIOWrapper, screen: pygame.Surface):
         '''
         Construct maze from file handle. Appends `self` to result list for threading support
+        The cell data lives in the headless `MazeGrid`; `view` is what each cell shows on screen, one state byte per
+        cell. An 8-bit surface reads straight from it through `PALETTE`, so a full redraw is one scale and one blit
         '''
-        self.screen = screen
-        
-        # has no start or end coordinate by default
-        self.start_coord = (-1,-1)
-        self.end_coord = (-1,-1)
-        
-        # Default grid data and block length
-        self.block_length = 0
-        self.cols = 0
-        self.rows = 0
+        with profiling.phase("load"):
+            super().__init__(*maze_from_file(maze_file, max_size=MAZE_SIZE, square=True))
+            maze_file.close()
 
-        self.maze_array = self.maze_from_file(maze_file)
-        maze_file.close()
+            self.screen = screen
+            self.block_length = MAZE_SIZE // self.rows
 
-        # Graph points include: intersections, turns, dead ends, & start/end points
-        self.graph_points = AdjacencyList()
+            self.view = bytearray(self.cells)
+            self.view_surface = pygame.image.frombuffer(self.view, (self.cols, self.rows), "P")
+            self.view_surface.set_palette(PALETTE)
 
     def create_maze(maze_file: _io.TextIOWrapper, screen: pygame.Surface, result_list: list):
         '''
@@ -41,239 +60,113 @@ class Maze:
 
         result_list.append((True, new_maze))
 
-    def redraw_blocks(self, blocks: list[Block]):
-        blocks_updating = [block.rect for block in blocks]
+    def cell_rect(self, row: int, col: int) -> pygame.Rect:
+        return pygame.Rect(MAZE_PADDING_LEFT + col * self.block_length, MAZE_PADDING_TOP + row * self.block_length,
+                           self.block_length, self.block_length)
 
-        pygame.display.update(blocks_updating)
-
-    def draw(self):
-        '''
-        Loads all the maze blocks into the screen buffer. Renders the changes after loading all blocks
-        '''
-        for row in self.maze_array:
-            for block in row:
-                block.draw()
-        
-        pygame.display.flip()
-    
-    def clear(self):
-        '''
-        Clears maze data, draws a white square to cover Maze window, and updates display
-        '''
-        self.maze_array = None
-        pygame.draw.rect(
-            surface=self.screen,
-            color=WHITE,
-            rect=(MAZE_PADDING_LEFT, MAZE_PADDING_TOP, MAZE_SIZE, MAZE_SIZE)
-        )
-    
-    def clear_path(self, block_inds: list[tuple[int, int]]):
+    def paint_cell(self, row: int, col: int, state: int):
         '''
-        Refreshes the blocks at the given indices `block_inds`. (Returns the given blocks path back to OPEN block state)
-        This also visually updates the blocks.
+        Shows (row, col) as `state` (a `BlockState` value) and draws it into the screen buffer; it reaches the display
+        with the next `dirty_rects.present`
         '''
-        for row, col in block_inds:
-            cur_block = self.maze_array[row][col]
+        self.view[row * self.cols + col] = state
 
-            if (row, col) == self.start_coord:
-                cur_block.set_state(BlockState.START)
-            elif (row, col) == self.end_coord:
-                cur_block.set_state(BlockState.END)
-            else:
-                cur_block.set_state(BlockState.OPEN)
-            
-            cur_block.draw()
+        rect = self.cell_rect(row, col)
+        self.screen.fill(PALETTE[state], rect)
+        dirty_rects.mark(rect)
 
-    def maze_from_file(self, file: _io.TextIOWrapper) -> list[list[Block]]:
-        maze = []
-
-        lines = list(file)
-        self.rows = len(lines)
-        
-        reader = csv.reader(lines)
-        self.cols = len(next(reader))
-
-        min_maze = 2
-        max_maze = MAZE_SIZE
-
-        if self.rows < 2 or self.cols < 2 or self.rows != self.cols:
-            raise Exception(f"Maze must be square, at least 2x2. This maze has rows: {self.rows} cols: {self.cols}")
-        elif self.rows > max_maze:
-            raise Exception(f"Maze cannot exceed maximum of {max_maze}x{max_maze}")
-        
-        self.block_length = MAZE_SIZE // self.rows
-        
-        starts = 0
-        ends = 0
-        
-        for row_ind, row in enumerate(csv.reader(lines)):
-            maze_row = []
+    def paint_cells(self, block_inds: array, state: int):
+        '''
+        Shows the open blocks among the cell indices `block_inds` as `state` (walls, the start and the end keep theirs),
+        like `paint_cell`
+        '''
+        view, cells, cols = self.view, self.cells, self.cols
+        fill, mark, color = self.screen.fill, dirty_rects.mark, PALETTE[state]
+        length = self.block_length
 
-            for col_ind, block_str in enumerate(row):
-                block_val = block_str.strip().lower()
+        for ind in block_inds:
+            if cells[ind] == OPEN:
+                view[ind] = state
+                row, col = divmod(ind, cols)
+                mark(fill(color, (MAZE_PADDING_LEFT + col * length, MAZE_PADDING_TOP + row * length, length, length)))
 
-                match (block_val):
-                    case ".":
-                        block_state = BlockState.OPEN
+    def paint_path(self, waypoints: array, state: int):
+        '''
+        Shows the open blocks of the path `waypoints` encodes (see `paths`) as `state`, a whole corridor at a time
+        '''
+        overlay, cells = OVERLAYS[state], self.cells
+        for first, last in zip(waypoints, waypoints[1:]):
+            corridor = paths.corridor_slice(first, last, self.cols)
+            self.view[corridor] = cells[corridor].translate(overlay)
+            self.draw_corridor(first, last)
 
-                    case "#":
-                        block_state = BlockState.WALL
+    def clear_path(self, waypoints: array):
+        '''
+        Returns the blocks of the path `waypoints` encodes (see `paths`) to their grid state, a whole corridor at a time.
+        The grid only ever holds OPEN/WALL/START/END, so it is the state to return to
+        '''
+        for first, last in zip(waypoints, waypoints[1:]):
+            corridor = paths.corridor_slice(first, last, self.cols)
+            self.view[corridor] = self.cells[corridor]
+            self.draw_corridor(first, last)
 
-                    case "s":
-                        block_state = BlockState.START
-                        self.start_coord = (row_ind,col_ind)
-                        starts += 1
-                        
-                    case "e":
-                        block_state = BlockState.END
-                        self.end_coord = (row_ind, col_ind)
-                        ends += 1
+    def draw_corridor(self, first: int, last: int):
+        '''
+        Draws the view's straight run of blocks from cell index `first` to `last` into the screen buffer
+        '''
+        row, col = divmod(min(first, last), self.cols)
+        last_row, last_col = divmod(max(first, last), self.cols)
+        self.draw_area(pygame.Rect(col, row, last_col - col + 1, last_row - row + 1))
 
-                    case _:
-                        raise Exception(f"Unknown block value '{block_val}': row {row_ind} col {col_ind}")
-                
-                cur_block = Block(self.block_length, block_state, row_ind, col_ind, self.screen)
-                maze_row.append(cur_block)
-            
-            maze.append(maze_row)
-        
-        if starts > 1 or ends > 1:
-            raise Exception(f"No more than 1 start point or end point. This maze has starts: {starts}, ends: {ends}.")
+    def draw_area(self, area: pygame.Rect):
+        '''
+        Draws the view's blocks in `area` (in blocks) into the screen buffer, scaled up to the block size
+        '''
+        surface = self.view_surface.subsurface(area)
+        if self.block_length > 1:
+            surface = pygame.transform.scale(surface, (area.width * self.block_length, area.height * self.block_length))
 
-        return maze
-    
-    # returns in (x,y) format
-    def get_adjacent(self, start_point: tuple):
-        y,x = start_point
-        # 0s are there so only either the x or y coordinate is changed in one loop
-        dx = [1, -1, 0, 0]  # right, left
-        dy = [0, 0, 1, -1]  # down, up
-        adjacents = list()
-        for i in range(4):
-            nx = x + dx[i]
-            ny = y + dy[i]
-            # if the "adjacent" node is out of bounds or a wall, ignore this nx, ny
-            if (nx < 0 or ny < 0
-                or nx >= self.cols or ny >= self.rows
-                or self.maze_array[ny][nx].state == BlockState.WALL):
-                continue
-            adjacents.append((ny, nx))
-        return adjacents
+        dirty_rects.mark(self.screen.blit(surface, (MAZE_PADDING_LEFT + area.x * self.block_length,
+                                                    MAZE_PADDING_TOP + area.y * self.block_length)))
 
-    def is_valid_graph_point(self, center: tuple, adjacents : list[tuple[int,int]]):
+    def draw(self):
         '''
-            a valid graph point is either a start/end point, intersection, turn, or dead-end
-            A coordinate has an intersection if it has more than 3 neighbors
-            A coordinate has a turn if its only TWO neighbors have a different x and y coordinate
+        Draws the whole view into the screen buffer, scaled up to the block size, and marks the maze area dirty
         '''
-        y,x = center
-
-        if self.maze_array[y][x].state == BlockState.START or self.maze_array[y][x].state == BlockState.END: # coordinate is a start/end point
-            return True
-        if len(adjacents) >= 3 or len(adjacents) == 1: # coordinate (x,y) is an intersection or a deadend
-            return True
-        if len(adjacents) == 2:
-            adjacent1 ,adjacent2 = adjacents[0],adjacents[1]
-            if adjacent1 == adjacent2: # guard against duplicate adjacent points
-                return False
-            uy, ux = adjacent1
-            vy, vx = adjacent2
-            dx1, dy1 = ux - x, uy - y # represents the change of direction from the first adjacent point
-            dx2, dy2 = vx - x, vy - y # represents the change of direction from the second adjacent point
-            # if at least one either of the changes of direction != 0, that means the line is not straight/ is a turn
-            if dx1 + dx2 != 0 or dy1 +dy2 != 0:
-                return True
-        return False
+        with profiling.phase("render maze"):
+            self.draw_area(pygame.Rect(0, 0, self.cols, self.rows))
     
-    """
-        After some thought, and based on what counts as graph points now, a "walk" the corridor approach seems better,
-        where the algorithm will walk a path in a single direction until it reaches an valid graph point for all 4 directions
-    """
-    def walk_corridors(self, start_point, bfs_queue : deque[tuple], visited: set[tuple]):
+    def clear(self):
         '''
-            Will only walk through the corridors in all 4 directions of valid graph_points
-            when it gets to a valid graph point, it will add it to the graph
+        Clears maze data, draws a white square to cover Maze window, and updates display
         '''
-        start_y, start_x = start_point
-        # 0s are there so only either the x or y coordinate is changed in one loop
-        dx = [1, -1, 0, 0]  # right, left
-        dy = [0, 0, 1, -1]  # down, up
-        for i in range(4):
-            # (0,-1) up | (0, 1) down |(-1,0) left |(1,0) right |
-            current_x = start_x + dx[i]
-            current_y = start_y + dy[i]
-            distance = 1
-            # Safeguard for unwalkable coordinates
-            if (current_x < 0 or current_y < 0
-                    or current_x >= self.cols or current_y >= self.rows
-                    or self.maze_array[current_y][current_x].state == BlockState.WALL):
-                continue
-            
-            while True:
-                # to check if it is a valid graph point
-                current_adjacents = self.get_adjacent((current_y, current_x))
-                if (self.is_valid_graph_point((current_y, current_x), current_adjacents)):
-                    # For BFS traversal
-                    
-                    # Do not add to collections if we've already visited it
-                    if (current_y,current_x) not in visited:
-                        visited.add((current_y,current_x))
-                        bfs_queue.append((current_y, current_x))
-
-                    # Add this edge (most imediate neighbor in the direction) and break to next direction
-                    self.graph_points.add_connection(
-                        (start_y, start_x),
-                        (current_y,current_x),
-                        distance)
-
-                    break
-
-                # Moves through a corridor in the same direction
-                next_x, next_y = current_x + dx[i], current_y + dy[i]
-                # if the adjacent coordiante is out of bounds or a wall, break while loop
-                if (next_x < 0 or next_y < 0
-                        or next_x >= self.cols or next_y >= self.rows
-                        or self.maze_array[next_y][next_x].state == BlockState.WALL):
-                    break
-
-                # goes onto the next block in the corridor
-                current_x, current_y = next_x, next_y
-                distance += 1
-
-
-    def create_graph(self):
+        self.view_surface = None
+        self.view = None
+        dirty_rects.mark(pygame.draw.rect(
+            surface=self.screen,
+            color=WHITE,
+            rect=(MAZE_PADDING_LEFT, MAZE_PADDING_TOP, MAZE_SIZE, MAZE_SIZE)
+        ))
+    
+    def reset_view(self):
         '''
-            Looks for all the intersection points of the maze to be added to the adjacency list
-            Done by walking through every corridor of the maze in a singular direction until it hits an intersection
-            Will use a BFS approach
+        Shows every block as its grid state again, dropping any paths painted over the maze, and redraws it
         '''
-        start_y, start_x = self.start_coord # (y,x)
-        # Keeps track of Visited & ensures that each corridor is walked exaclty once
-        # fixed spacing issue
-        visited = set()
-        visited.add((start_y,start_x))
-
-        # stored as (y, x)
-        q = deque()
-        q.append((start_y,start_x))
-        while q:
-            # ux, uy is the "center" point, or current
-            uy, ux = q.popleft()
-            # BFS additional steps done in this method
-            self.walk_corridors((uy,ux),q,visited)
-
+        self.view[:] = self.cells
+        self.draw()
 
     # == Visuals == #
     def click_box(self, x, y, event_type):
         '''
         event_type: 1 = left click,
                     3 = right click
+        Returns whether the click moved the start or end point
         '''
 
         # if you load a maze, then unload it, then you click on the empty area where the maze was, 
         # the program crashes without this next if statement - Andres
-        if self.maze_array is None:
-            return
+        if self.view is None:
+            return False
 
         # the following gives us the proper padded coordinates:
         x -= MAZE_PADDING_LEFT
@@ -281,7 +174,7 @@ class Maze:
 
         if not (0 <= x < self.cols * self.block_length and 
                 0 <= y < self.rows * self.block_length):
-            return
+            return False
         
         # get the block object from the respective coordinate
         maze_x = int(x // self.block_length)
@@ -289,30 +182,32 @@ class Maze:
 
         if not (0 <= maze_x < self.cols and 
                 0 <= maze_y < self.rows):
-            return
+            return False
 
-        clicked_box = self.maze_array[maze_y][maze_x]
-
-        if clicked_box.state == BlockState.WALL:
+        if self.is_wall(maze_y, maze_x):
             print("clicked on wall")
-            return
-        
+            return False
+
         if event_type == 1:  # left click
-            if self.start_coord != (-1, -1):
-                old_y, old_x = self.start_coord
-                self.maze_array[old_y][old_x].state = BlockState.OPEN
-                self.maze_array[old_y][old_x].draw()
-            
-            clicked_box.state = BlockState.START
-            clicked_box.draw()
-            self.start_coord = (maze_y, maze_x)
+            old_coord = self.start_coord
+            if old_coord == (maze_y, maze_x):
+                return False
+            self.set_start((maze_y, maze_x))
 
         elif event_type == 3:  # right click
-            if self.end_coord != (-1, -1):
-                old_y, old_x = self.end_coord
-                self.maze_array[old_y][old_x].state = BlockState.OPEN
-                self.maze_array[old_y][old_x].draw()
+            old_coord = self.end_coord
+            if old_coord == (maze_y, maze_x):
+                return False
+            self.set_end((maze_y, maze_x))
+
+        else:
+            return False
+
+        # Refresh the blocks of the old and new positions from the grid
+        for row, col in (old_coord, (maze_y, maze_x)):
+            if (row, col) == (-1, -1):
+                continue
+
+            self.paint_cell(row, col, self.state(row, col))
 
-            clicked_box.state = BlockState.END
-            clicked_box.draw()
-            self.end_coord = (maze_y, maze_x)
+        return True
@@ -0,0 +1,277 @@
+import csv
+import _io
+import mmap
+import os
+import struct
+import sys
+from itertools import islice
+from typing import Iterable
+from grid import MazeGrid, OPEN, WALL, START, END
+
+# Byte -> cell code lookup for the bulk parser. Anything that is not a cell character maps to INVALID
+INVALID = 0xFF
+CELL_TABLE = bytearray([INVALID]) * 256
+for chars, code in ((b".", OPEN), (b"#", WALL), (b"sS", START), (b"eE", END)):
+    for char in chars:
+        CELL_TABLE[char] = code
+CELL_TABLE = bytes(CELL_TABLE)
+
+# Cell code -> the character the CSV format stores for it
+CHAR_TABLE = bytearray(b"?") * 256
+for char, code in ((b".", OPEN), (b"#", WALL), (b"s", START), (b"e", END)):
+    CHAR_TABLE[code] = char[0]
+CHAR_TABLE = bytes(CHAR_TABLE)
+
+# Padding that csv fields may carry around their value (`str.strip` in the per-cell parser)
+FIELD_PADDING = b" \t\r\x0b\x0c"
+
+'''
+Binary maze format (little endian):
+    magic b"MAZE", u16 version, u16 reserved, u32 rows, u32 cols, i32 start row, i32 start col, i32 end row, i32 end col
+followed by rows * cols cell codes, one byte each, row-major (the exact layout of `MazeGrid.cells`)
+'''
+BINARY_MAGIC = b"MAZE"
+BINARY_VERSION = 1
+BINARY_HEADER = struct.Struct("<4sHHIIiiii")
+
+# Rows converted per batch when streaming a CSV into the binary format
+CONVERT_BATCH_ROWS = 1024
+
+def maze_from_file(file: _io.TextIOWrapper, max_size: int|None = None,
+                   square: bool = False) -> tuple[int, int, bytearray, tuple[int, int], tuple[int, int]]:
+    '''
+    Parses a CSV maze into a flat cell array.
+    Returns (rows, cols, cells, start_coord, end_coord); missing start/end points are (-1, -1)
+    `max_size` and `square` apply the limits of the GUI, which can only draw square mazes up to `MAZE_SIZE`
+
+    The whole file is handled as bytes: padding is deleted, the field layout is checked with one strided slice
+    and the cell characters are mapped to cell codes with a single `bytes.translate`.
+    '''
+    data = file.buffer.read() if hasattr(file, "buffer") else file.read().encode()
+
+    lines = data.split(b"\n")
+    if lines[-1] == b"": # A trailing newline does not start another row
+        lines.pop()
+
+    rows = len(lines)
+    cols = count_columns(lines[0]) if rows > 0 else 0
+
+    min_maze = 2
+
+    if square and (rows < min_maze or cols < min_maze or rows != cols):
+        raise Exception(f"Maze must be square, at least 2x2. This maze has rows: {rows} cols: {cols}")
+    elif rows < min_maze or cols < min_maze:
+        raise Exception(f"Maze must be at least 2x2. This maze has rows: {rows} cols: {cols}")
+    elif max_size is not None and max(rows, cols) > max_size:
+        raise Exception(f"Maze cannot exceed maximum of {max_size}x{max_size}")
+
+    codes = rows_to_codes(lines, cols)
+
+    starts = codes.count(START)
+    ends = codes.count(END)
+
+    if starts > 1 or ends > 1:
+        raise Exception(f"No more than 1 start point or end point. This maze has starts: {starts}, ends: {ends}.")
+
+    start_coord = divmod(codes.find(START), cols) if starts else (-1, -1)
+    end_coord = divmod(codes.find(END), cols) if ends else (-1, -1)
+
+    return rows, cols, bytearray(codes), start_coord, end_coord
+
+def count_columns(line: bytes) -> int:
+    line = line.translate(None, FIELD_PADDING)
+
+    return line.count(b",") + 1 if line else 0
+
+def rows_to_codes(lines: list[bytes], cols: int, first_row: int = 0) -> bytes:
+    '''
+    Converts raw CSV rows (without their newline) into cell codes.
+    `first_row` is the row number of `lines[0]`, used for error messages
+    '''
+    # A well formed maze is lines of `cols` single character fields: every odd byte is a separator
+    text = b"\n".join(lines).translate(None, FIELD_PADDING)
+    separators = (b"," * (cols - 1) + b"\n") * len(lines)
+
+    if len(text) != 2 * len(lines) * cols - 1 or text[1::2] != separators[:-1]:
+        locate_csv_error(lines, cols, first_row)
+
+    codes = text[0::2].translate(CELL_TABLE)
+
+    bad_ind = codes.find(INVALID)
+    if bad_ind != -1:
+        row_ind, col_ind = divmod(bad_ind, cols)
+        raise Exception(f"Unknown block value '{chr(text[2 * bad_ind]).lower()}': row {first_row + row_ind} col {col_ind}")
+
+    return codes
+
+def locate_csv_error(lines: list[bytes], cols: int, first_row: int = 0):
+    '''
+    Slow path for malformed rows: walks them field by field to raise the same precise error the per-cell
+    parser would have raised
+    '''
+    text_lines = [line.decode(errors="replace") for line in lines]
+
+    for row_ind, row in enumerate(csv.reader(text_lines), start=first_row):
+        for col_ind, block_str in enumerate(row):
+            block_val = block_str.strip().lower()
+
+            if block_val not in (".", "#", "s", "e"):
+                raise Exception(f"Unknown block value '{block_val}': row {row_ind} col {col_ind}")
+
+        if len(row) != cols:
+            raise Exception(f"Every row must have {cols} blocks. Row {row_ind} has {len(row)}")
+
+    raise Exception("Maze file is malformed")
+
+def load_maze(path: str) -> MazeGrid:
+    '''
+    Loads a headless `MazeGrid` from a CSV or binary (.maze) file path
+    '''
+    if path.endswith(".maze"):
+        return load_binary(path)
+
+    with open(path, "r") as maze_file:
+        return MazeGrid(*maze_from_file(maze_file))
+
+# == Binary format == #
+def load_binary(path: str) -> MazeGrid:
+    '''
+    Memory-maps a binary maze. The grid's cells are a view straight into the mapping, so nothing is parsed or
+    copied; pages are read lazily as solvers touch them. The mapping is copy-on-write: moving the start/end
+    edits the grid in memory but never the file
+    '''
+    with open(path, "rb") as maze_file:
+        file_size = os.fstat(maze_file.fileno()).st_size
+
+        if file_size < BINARY_HEADER.size:
+            raise Exception(f"Binary maze is too small to hold a header ({file_size} bytes)")
+
+        mapped = mmap.mmap(maze_file.fileno(), 0, access=mmap.ACCESS_COPY)
+
+    magic, version, _, rows, cols, start_row, start_col, end_row, end_col = BINARY_HEADER.unpack_from(mapped)
+
+    if magic != BINARY_MAGIC:
+        raise Exception(f"Not a binary maze file (magic {magic!r})")
+    elif version != BINARY_VERSION:
+        raise Exception(f"Unsupported binary maze version {version}")
+    elif file_size < BINARY_HEADER.size + rows * cols:
+        raise Exception(f"Binary maze is truncated: expected {rows * cols} cells, found {file_size - BINARY_HEADER.size}")
+
+    cells = memoryview(mapped)[BINARY_HEADER.size:BINARY_HEADER.size + rows * cols]
+
+    # The CSV parser finds the end points in the cells; here the header names them, so they must match the cells
+    for name, (row, col), code in (("start", (start_row, start_col), START), ("end", (end_row, end_col), END)):
+        if (row, col) == (-1, -1):
+            continue
+        elif not (0 <= row < rows and 0 <= col < cols):
+            raise Exception(f"Binary maze {name} point ({row}, {col}) is outside the {rows}x{cols} maze")
+        elif cells[row * cols + col] != code:
+            raise Exception(f"Binary maze {name} point ({row}, {col}) is not a {name} block")
+
+    return MazeGrid(rows, cols, cells, (start_row, start_col), (end_row, end_col))
+
+def save_binary(grid: MazeGrid, path: str):
+    '''
+    Writes `grid` in the binary maze format
+    '''
+    with open(path, "wb") as maze_file:
+        maze_file.write(BINARY_HEADER.pack(BINARY_MAGIC, BINARY_VERSION, 0, grid.rows, grid.cols,
+                                           *grid.start_coord, *grid.end_coord))
+        maze_file.write(grid.cells)
+
+def stream_csv(path: str, cols: int, rows: Iterable[bytes]):
+    '''
+    Writes a CSV maze one row of cell codes at a time, so the maze never has to exist as a whole
+    '''
+    line = bytearray(b",") * (2 * cols)
+    line[-1] = ord("\n")
+
+    with open(path, "wb") as maze_file:
+        for row in rows:
+            line[0::2] = row.translate(CHAR_TABLE)
+            maze_file.write(line)
+
+def stream_binary(path: str, row_count: int, cols: int, start_coord: tuple[int, int], end_coord: tuple[int, int],
+                  rows: Iterable[bytes]):
+    '''
+    Writes a binary maze one row of cell codes at a time. The end points go in the header, so they must be known up front
+    '''
+    with open(path, "wb") as maze_file:
+        maze_file.write(BINARY_HEADER.pack(BINARY_MAGIC, BINARY_VERSION, 0, row_count, cols, *start_coord, *end_coord))
+        for row in rows:
+            maze_file.write(row)
+
+def csv_to_binary(csv_path: str, binary_path: str) -> tuple[int, int]:
+    '''
+    Converts a CSV maze into the binary format, streaming `CONVERT_BATCH_ROWS` rows at a time so the CSV is
+    never held in memory as a whole. Non-square mazes and mazes beyond the GUI's size limit are allowed.
+    Returns (rows, cols)
+    '''
+    with open(csv_path, "rb") as csv_file, open(binary_path, "wb") as binary_file:
+        try:
+            rows, cols, start_coord, end_coord = stream_csv_codes(csv_file, binary_file)
+        except Exception:
+            binary_file.close()
+            os.remove(binary_path) # Do not leave a half written maze behind
+            raise
+
+        binary_file.seek(0)
+        binary_file.write(BINARY_HEADER.pack(BINARY_MAGIC, BINARY_VERSION, 0, rows, cols, *start_coord, *end_coord))
+
+    return rows, cols
+
+def stream_csv_codes(csv_file: _io.BufferedReader, binary_file: _io.BufferedWriter):
+    '''
+    Writes the header placeholder and the cell codes of `csv_file` to `binary_file`.
+    Returns (rows, cols, start_coord, end_coord)
+    '''
+    rows = 0
+    cols = 0
+    start_coord = (-1, -1)
+    end_coord = (-1, -1)
+    starts = 0
+    ends = 0
+
+    binary_file.write(bytes(BINARY_HEADER.size)) # Placeholder; start/end are only known at the end
+
+    while True:
+        batch = [line.rstrip(b"\n") for line in islice(csv_file, CONVERT_BATCH_ROWS)]
+        if not batch:
+            break
+
+        if rows == 0:
+            cols = count_columns(batch[0])
+
+            if cols < 2:
+                raise Exception(f"Maze must be at least 2x2. This maze has cols: {cols}")
+
+        codes = rows_to_codes(batch, cols, first_row=rows)
+
+        batch_starts = codes.count(START)
+        batch_ends = codes.count(END)
+
+        if batch_starts:
+            start_coord = divmod(rows * cols + codes.find(START), cols)
+        if batch_ends:
+            end_coord = divmod(rows * cols + codes.find(END), cols)
+
+        starts += batch_starts
+        ends += batch_ends
+        rows += len(batch)
+
+        binary_file.write(codes)
+
+    if rows < 2:
+        raise Exception(f"Maze must be at least 2x2. This maze has rows: {rows} cols: {cols}")
+    elif starts > 1 or ends > 1:
+        raise Exception(f"No more than 1 start point or end point. This maze has starts: {starts}, ends: {ends}.")
+
+    return rows, cols, start_coord, end_coord
+
+if __name__ == "__main__":
+    if len(sys.argv) != 3:
+        print("usage: python maze_io.py <maze.csv> <maze.maze>")
+        sys.exit(1)
+
+    rows, cols = csv_to_binary(sys.argv[1], sys.argv[2])
+    print(f"Wrote {rows}x{cols} maze to {sys.argv[2]}")
@@ -0,0 +1,63 @@
+from array import array
+
+'''
+Compact explored and path results.
+Solvers hand out cells as `array('I')`s of flat indices (`row * cols + col`, like `MazeGrid.cells`): 4 bytes a cell,
+where a list of (row, col) tuples takes about 100.
+A path can also be run-length encoded by its corridors: only its waypoints are kept (its first and last cell and
+cells in between where it may turn), every two consecutive ones sharing a row or column, so each pair stands for the
+straight run of cells between them. Graph-based solvers know their paths this way already, as the graph points they
+went through.
+'''
+
+def corridor(first: int, last: int, cols: int) -> range:
+    '''
+    Cells of the straight run from `first` to `last` (in one row or column), both included, in order
+    '''
+    step = 1 if first // cols == last // cols else cols
+    if last < first:
+        step = -step
+
+    return range(first, last + step, step)
+
+def corridor_slice(first: int, last: int, cols: int) -> slice:
+    '''
+    The cells of `corridor(first, last, cols)` as an ascending slice of a row-major buffer
+    '''
+    low, high = min(first, last), max(first, last)
+
+    return slice(low, high + 1, 1 if low // cols == high // cols else cols)
+
+def expand(waypoints: array, cols: int) -> array:
+    '''
+    Every cell of the path `waypoints` encodes, in order
+    '''
+    path = array('I', waypoints[:1])
+    for first, last in zip(waypoints, waypoints[1:]):
+        path.extend(corridor(first, last, cols)[1:])
+
+    return path
+
+def encode(path: array, cols: int) -> array:
+    '''
+    Run-length encodes a path of adjacent cells by its corridors: its waypoints are its ends and the cells where it turns
+    '''
+    if len(path) < 3:
+        return array('I', path)
+
+    waypoints = array('I', path[:1])
+    step = path[1] - path[0]
+    for i in range(1, len(path) - 1):
+        next_step = path[i + 1] - path[i]
+        if next_step != step:
+            waypoints.append(path[i])
+            step = next_step
+    waypoints.append(path[-1])
+
+    return waypoints
+
+def cell_count(waypoints: array, cols: int) -> int:
+    '''
+    Number of cells in the path `waypoints` encodes, without expanding it
+    '''
+    return len(waypoints[:1]) + sum(len(corridor(first, last, cols)) - 1 for first, last in zip(waypoints, waypoints[1:]))
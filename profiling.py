@@ -0,0 +1,209 @@
+import atexit
+import cProfile
+import os
+import pstats
+import tracemalloc
+from collections import Counter
+from contextlib import contextmanager, nullcontext
+from time import perf_counter
+
+'''
+Profiling mode: the load, graph build, solve and render phases run under cProfile and tracemalloc, and every phase
+gets a profile dump (open with `python -m pstats` or snakeviz) plus a summary of its slowest functions and biggest
+allocators, printed and written to summary.txt when the program exits.
+Turn it on with the MAZE_PROFILE environment variable, set to the output directory (or 1 for ./profile):
+    MAZE_PROFILE=profile python app.py
+or profile one headless run of a maze file: python -m benchmarks.profile_phases maze.csv --algorithm jps
+Without it `phase` hands out a no-op context and nothing is traced.
+
+Allocations are only traced while a phase runs, so a snapshot holds what the phase allocated rather than the whole
+heap (a loaded maze's cell and view buffers are a byte per cell each) and the program runs at full speed between
+phases.
+Phases may nest (the graph is built inside a solve); a phase's time is then exclusive of the phases inside it, while
+its memory includes theirs. Phases are entered one thread at a time, like the GUI's loading thread and main loop do.
+'''
+
+PROFILE_ENV = "MAZE_PROFILE"
+DEFAULT_OUTPUT = "profile"
+# Functions and allocating lines listed per phase in the summary
+TOP_ENTRIES = 10
+
+class PhaseRecord:
+    '''
+    Everything measured for one phase name, over all of its runs
+    '''
+    def __init__(self, name: str):
+        self.name = name
+        self.profile = cProfile.Profile()
+        self.runs = 0
+        self.wall_time = 0.0
+        self.peak = 0 # most bytes traced above the start of a run
+        self.allocations = Counter() # "file:line" -> bytes still allocated when runs ended
+
+        # State of the current run
+        self.resumed = 0.0
+        self.start_memory = 0
+        self.run_peak = 0
+
+class PhaseProfiler:
+    def __init__(self, output_dir: str, top: int = TOP_ENTRIES):
+        self.output_dir = output_dir
+        self.top = top
+        self.phases: dict[str, PhaseRecord] = {}
+        self.active: list[PhaseRecord] = [] # phases entered and not left yet, innermost last
+
+    @contextmanager
+    def phase(self, name: str, allocations: bool = True):
+        '''
+        Profiles the body as a run of phase `name`. Runs of the same name add up.
+        Allocations are attributed from a snapshot of the traced memory at the end, which takes a while when the phase
+        allocated a lot; phases entered once per frame pass `allocations=False`
+        '''
+        record = self.phases.get(name)
+        if record is None:
+            record = self.phases[name] = PhaseRecord(name)
+
+        if record in self.active: # Re-entered from inside itself; the outer run covers it
+            yield
+            return
+
+        self.pause(perf_counter())
+
+        if not self.active:
+            tracemalloc.start()
+
+        # An outer phase's allocations are traced already; they are told apart by a snapshot taken now
+        before = take_snapshot() if allocations and self.active else None
+        record.start_memory = record.run_peak = tracemalloc.get_traced_memory()[0]
+        tracemalloc.reset_peak()
+
+        self.active.append(record)
+        record.resumed = perf_counter()
+        record.profile.enable()
+        try:
+            yield
+        finally:
+            record.profile.disable()
+            record.wall_time += perf_counter() - record.resumed
+            record.runs += 1
+            self.active.pop()
+
+            peak = max(record.run_peak, tracemalloc.get_traced_memory()[1])
+            record.peak = max(record.peak, peak - record.start_memory)
+
+            if allocations:
+                after = take_snapshot()
+
+                if before is None:
+                    for stat in after.statistics("lineno"):
+                        record.allocations[str(stat.traceback[0])] += stat.size
+                else:
+                    for stat in after.compare_to(before, "lineno"):
+                        if stat.size_diff > 0:
+                            record.allocations[str(stat.traceback[0])] += stat.size_diff
+
+            if not self.active:
+                tracemalloc.stop()
+            else:
+                # Memory of the inner phase is memory of the outer one as well
+                outer = self.active[-1]
+                outer.run_peak = max(outer.run_peak, peak)
+                tracemalloc.reset_peak()
+                outer.resumed = perf_counter()
+                outer.profile.enable()
+
+    def pause(self, now: float):
+        '''
+        Stops the innermost active phase's clock and profile while another phase runs inside it
+        '''
+        if not self.active:
+            return
+
+        outer = self.active[-1]
+        outer.profile.disable()
+        outer.wall_time += now - outer.resumed
+        outer.run_peak = max(outer.run_peak, tracemalloc.get_traced_memory()[1])
+
+    def report(self) -> str:
+        '''
+        Writes a profile dump per phase and summary.txt to the output directory. Returns the summary
+        '''
+        os.makedirs(self.output_dir, exist_ok=True)
+        lines = []
+
+        for record in self.phases.values():
+            if record.runs == 0:
+                continue
+
+            dump_path = os.path.join(self.output_dir, record.name.replace(" ", "_") + ".prof")
+            record.profile.dump_stats(dump_path)
+
+            lines.append(f"== {record.name}: {record.runs} run(s), {record.wall_time:.4f}s, "
+                         f"peak {record.peak / 2**20:.2f} MiB traced ({dump_path})")
+
+            lines.append("  slowest functions (own time, with callees, calls):")
+            entries = pstats.Stats(record.profile).stats.items()
+            for (file, line, function), (_, calls, own_time, total_time, _) in sorted(entries, key=lambda entry: entry[1][2], reverse=True)[:self.top]:
+                lines.append(f"    {own_time:9.4f}s {total_time:9.4f}s {calls:>11,}  {os.path.basename(file)}:{line}({function})")
+
+            if record.allocations:
+                lines.append("  biggest allocators (bytes still held at the end of the phase):")
+                for location, size in record.allocations.most_common(self.top):
+                    lines.append(f"    {size / 2**20:9.2f} MiB  {location}")
+            else:
+                lines.append("  allocations not traced")
+
+        summary = "\n".join(lines)
+        with open(os.path.join(self.output_dir, "summary.txt"), "w") as summary_file:
+            summary_file.write(summary + "\n")
+
+        return summary
+
+def take_snapshot() -> tracemalloc.Snapshot:
+    '''
+    Heap snapshot without the profiler's own allocations
+    '''
+    return tracemalloc.take_snapshot().filter_traces((
+        tracemalloc.Filter(False, tracemalloc.__file__),
+        tracemalloc.Filter(False, __file__),
+    ))
+
+# The active profiler; None while profiling is off
+profiler: PhaseProfiler|None = None
+
+def enable(output_dir: str = DEFAULT_OUTPUT, top: int = TOP_ENTRIES) -> PhaseProfiler:
+    '''
+    Turns profiling on; the report is written when the program exits. If it is on already, only the output
+    directory and summary length change
+    '''
+    global profiler
+
+    if profiler is None:
+        profiler = PhaseProfiler(output_dir, top)
+        atexit.register(lambda: print(profiler.report()))
+    else:
+        profiler.output_dir, profiler.top = output_dir, top
+
+    return profiler
+
+def phase(name: str, allocations: bool = True):
+    '''
+    Context for one run of a phase: profiled while profiling is on, a no-op otherwise
+    '''
+    if profiler is None:
+        return nullcontext()
+
+    return profiler.phase(name, allocations)
+
+def environment_output() -> str|None:
+    '''
+    Output directory asked for by MAZE_PROFILE, None when it is not set
+    '''
+    value = os.environ.get(PROFILE_ENV)
+    if not value:
+        return None
+
+    return DEFAULT_OUTPUT if value == "1" else value
+
+if environment_output():
+    enable(environment_output())
@@ -0,0 +1,54 @@
+import json
+
+class SearchStats:
+    '''
+    Counters of one solver run. Pass an instance as a solver's `stats` argument and the solver fills it in; without
+    one the solvers skip everything but a few counters they keep anyway, so collecting costs next to nothing.
+    Most counts are derived when the search ends (every heap entry was either popped or is still queued) rather
+    than counted one by one:
+        heap_pushes / heap_pops: heap entries pushed and popped, including the searches' seeds
+        stale_pops: popped entries skipped because a shorter way to their node was found after they were pushed
+        edge_relaxations: neighbors or edges whose distance an expansion improved
+        peak_frontier: most entries queued at once (both heaps together for bidirectional searches)
+        nodes_expanded: nodes taken off the heap and expanded (cells, graph vertices or jump points)
+        corridor_cells: grid cells those expansions cover; graph and jump point solvers expand whole corridors
+        graph_build_time: seconds spent building the corridor graph during the run (0 when it was cached)
+        search_time: seconds of the rest of the run
+    '''
+    def __init__(self, solver: str = ""):
+        self.solver = solver
+        self.heap_pushes = 0
+        self.heap_pops = 0
+        self.stale_pops = 0
+        self.edge_relaxations = 0
+        self.peak_frontier = 0
+        self.nodes_expanded = 0
+        self.corridor_cells = 0
+        self.graph_build_time = 0.0
+        self.search_time = 0.0
+
+    def record_heap(self, seeds: int, pops: int, stale: int, queued: int, peak: int):
+        '''
+        Fills the heap counters of a search that pushed `seeds` entries before its loop, popped `pops` entries of
+        which `stale` were skipped and ended with `queued` entries left. Every push past the seeds improved a node
+        '''
+        self.heap_pops = pops
+        self.stale_pops = stale
+        self.heap_pushes = pops + queued
+        self.edge_relaxations = self.heap_pushes - seeds
+        self.peak_frontier = peak
+        self.nodes_expanded = pops - stale
+
+    def to_dict(self) -> dict:
+        return dict(vars(self))
+
+    def to_json(self, indent: int|None = None) -> str:
+        return json.dumps(self.to_dict(), indent=indent)
+
+    def summary(self) -> str:
+        '''
+        One line for the GUI results panel
+        '''
+        return (f"Pushes {self.heap_pushes:,}  Pops {self.heap_pops:,}  Stale {self.stale_pops:,}  "
+                f"Relaxed {self.edge_relaxations:,}  Peak frontier {self.peak_frontier:,}  "
+                f"Corridor cells {self.corridor_cells:,}  Graph {self.graph_build_time:.4f}s  Search {self.search_time:.4f}s")
@@ -0,0 +1,332 @@
+import multiprocessing
+import queue
+import signal
+from array import array
+from collections import deque
+from inspect import isgeneratorfunction
+from time import perf_counter
+from typing import Callable
+from grid import MazeGrid, OPEN_TABLE
+from incremental import IncrementalPlanner, changed_cells
+from search_stats import SearchStats
+from Algorithms import STREAM_BATCH
+import profiling
+
+'''
+Solves that run beside the GUI's main loop instead of inside it.
+A `SolveJob` runs its solver in a worker process (a thread would hold the GIL the main loop needs to keep drawing) on
+a snapshot of the grid. The result comes back through a queue that the main loop polls once per frame, like the
+maze loading thread's result list, and cancelling a job kills its process.
+A job with `stream` also sends the explored cells, in batches, while the solver runs: streaming solvers (like
+`Algorithms.a_star_stream`) hand them out as they search, others once they are done. The queue holds a few batches
+at most, so a solver that gets ahead of whoever takes the batches waits for them, and the explored cells never pile
+up on either side. The result itself only counts them, and holds the path by its corridors (see `paths`).
+An incremental planner stays in one `PlannerWorker` process for as long as its maze is loaded: its search state
+would cost more to send back and forth than its repairs save, so a solve only sends what changed on the grid.
+'''
+
+# Batches of explored cells the queue holds before a worker has to wait for them to be taken
+STREAM_QUEUE_BATCHES = 8
+
+class SolveJob:
+    def __init__(self, grid: MazeGrid, solver: Callable, name: str, count: bool = False, stream: bool = False):
+        '''
+        Starts solving `grid` with `solver`: any solver taking `maze` and `stats`, or a streaming solver. `count`
+        collects search counters, `stream` sends the explored cells (see `next_batch`). While profiling the solve
+        runs right here instead, so the solve phase is measured.
+        The grid's walls must not change while the job runs; the corridor graph a worker builds is kept for later solves
+        '''
+        self.grid = grid
+        self.name = name
+        self.started = perf_counter()
+
+        self.process: multiprocessing.Process|None = None
+        self.results = None
+        self.pending: deque[array] = deque() # batches received and not taken yet
+        self.output: tuple[bool, tuple|str]|None = None
+
+        stats = SearchStats(name) if count else None
+
+        if profiling.profiler is not None:
+            with profiling.phase("solve"):
+                self.output = solve(grid, solver, stats, self.pending.append if stream else None)
+            return
+
+        self.results = multiprocessing.Queue(STREAM_QUEUE_BATCHES)
+        self.process = multiprocessing.Process(target=run_worker, args=(grid.snapshot(), solver, stats, stream, self.results),
+                                               daemon=True)
+        self.process.start()
+
+    def elapsed(self) -> float:
+        return perf_counter() - self.started
+
+    def receive(self):
+        '''
+        Takes the next message of the worker off the queue, if one arrived
+        '''
+        if self.output is not None:
+            return
+
+        # Checked before polling: a worker that is gone by now has sent everything it ever will
+        alive = self.process.is_alive()
+        try:
+            kind, payload = self.results.get_nowait()
+        except queue.Empty:
+            if not alive:
+                self.output = (False, f"Solver stopped unexpectedly (exit code {self.process.exitcode})")
+                self.process.join()
+            return
+
+        if kind == "explored":
+            self.pending.append(payload)
+        else:
+            self.output = payload
+            self.process.join()
+
+    def next_batch(self) -> array|None:
+        '''
+        The next batch of explored cell indices of a streaming job, in order. None when no batch is waiting: more may
+        come while `streamed` is False
+        '''
+        if not self.pending:
+            self.receive()
+
+        return self.pending.popleft() if self.pending else None
+
+    def streamed(self) -> bool:
+        '''
+        Whether every explored batch has been taken and the result is in
+        '''
+        return self.output is not None and not self.pending
+
+    def result(self) -> tuple[bool, tuple|str]|None:
+        '''
+        None while the solve runs (and, when streaming, until every batch is taken). Then
+        (successful: bool, OUTPUT: (explored_count, final_path, solve_time, stats)|str), the output being an error
+        message when it failed and final_path the waypoints of the path
+        '''
+        # A streaming job keeps at most one batch it read here waiting for `next_batch`
+        if not self.pending:
+            self.receive()
+
+        if not self.streamed():
+            return None
+
+        successful, output = self.output
+        if not successful:
+            return self.output
+
+        explored_count, final_path, solve_time, stats, graph = output
+        if graph is not None and self.grid.graph_cache is None:
+            self.grid.graph_cache = graph
+
+        return True, (explored_count, final_path, solve_time, stats)
+
+    def cancel(self):
+        '''
+        Stops the solve; its result is dropped
+        '''
+        if self.process is None:
+            return
+
+        # Killed rather than terminated: the worker may not have dropped SDL's SIGTERM handler yet (see `run_worker`)
+        self.process.kill()
+        self.process.join()
+        # The worker may have died halfway through sending, so the queue is abandoned rather than drained
+        self.results.cancel_join_thread()
+        self.results.close()
+
+class PlannerWorker:
+    def __init__(self, grid: MazeGrid, use_heuristic: bool = True):
+        '''
+        Starts a worker process holding an `IncrementalPlanner` of a copy of `grid`, which plans for the grid's
+        current start and end right away, in the background, so that the first `solve` already repairs a search.
+        While profiling the planner is kept right here instead
+        '''
+        self.grid = grid
+        self.use_heuristic = use_heuristic
+
+        # What the worker's copy of the grid has: its walls as `OPEN_TABLE` translated cells, and its points
+        self.sent_walls = bytes(grid.cells).translate(OPEN_TABLE)
+        self.sent_points = (grid.start_coord, grid.end_coord)
+        self.requests_sent = 0
+
+        self.planner: IncrementalPlanner|None = None
+        self.process: multiprocessing.Process|None = None
+
+        if profiling.profiler is not None:
+            self.planner = IncrementalPlanner(grid, use_heuristic)
+            return
+
+        self.requests = multiprocessing.Queue()
+        self.results = multiprocessing.Queue()
+        self.process = multiprocessing.Process(target=run_planner, args=(grid.snapshot(), use_heuristic, self.requests,
+                                                                          self.results), daemon=True)
+        self.process.start()
+
+        if grid.start_coord != (-1, -1) and grid.end_coord != (-1, -1):
+            self.send(stats=None) # its result is never read
+
+    def send(self, stats: SearchStats|None) -> int:
+        '''
+        Asks the worker to solve for the grid as it is now, sending only what changed since the last request.
+        Returns the request's number
+        '''
+        grid = self.grid
+        walls = bytes(grid.cells).translate(OPEN_TABLE)
+
+        # Cell codes to copy: the cells that turned into walls or back, and those the points left and moved to
+        changed = {cell: grid.cells[cell] for cell in changed_cells(self.sent_walls, walls)}
+        for coord in (*self.sent_points, grid.start_coord, grid.end_coord):
+            if coord != (-1, -1):
+                changed[grid.index(*coord)] = grid.state(*coord)
+
+        self.sent_walls = walls
+        self.sent_points = (grid.start_coord, grid.end_coord)
+
+        self.requests_sent += 1
+        self.requests.put((self.requests_sent, grid.start_coord, grid.end_coord, list(changed.items()), stats))
+
+        return self.requests_sent
+
+    def solve(self, name: str, count: bool = False) -> "PlannerJob":
+        '''
+        Starts a planner solve of the grid's current start, end and walls; `count` collects search counters
+        '''
+        stats = SearchStats(name) if count else None
+
+        if self.planner is not None:
+            job = PlannerJob(self, 0, name)
+            with profiling.phase("solve"):
+                job.output = strip_output(solve(self.grid, self.planner.solve, stats))
+            return job
+
+        return PlannerJob(self, self.send(stats), name)
+
+    def receive(self, request: int) -> tuple[bool, tuple|str]|None:
+        '''
+        The result of request number `request` if it arrived; results of earlier requests are dropped
+        '''
+        alive = self.process.is_alive()
+        while True:
+            try:
+                number, output = self.results.get_nowait()
+            except queue.Empty:
+                if not alive:
+                    return False, f"Planner stopped unexpectedly (exit code {self.process.exitcode})"
+                return None
+
+            if number == request:
+                return strip_output(output)
+
+    def running(self) -> bool:
+        '''
+        Whether the planner can still solve: `stop` (or cancelling one of its jobs) ends it for good
+        '''
+        return self.planner is not None or self.process is not None
+
+    def stop(self):
+        '''
+        Kills the worker along with the planner's search; whatever it was solving is dropped
+        '''
+        if self.process is None:
+            return
+
+        self.process.kill()
+        self.process.join()
+        for worker_queue in (self.requests, self.results):
+            worker_queue.cancel_join_thread()
+            worker_queue.close()
+        self.process = None
+
+class PlannerJob:
+    '''
+    One solve of a `PlannerWorker`, with the same `result` as a `SolveJob`. Cancelling it stops the worker
+    '''
+    def __init__(self, worker: PlannerWorker, request: int, name: str):
+        self.worker = worker
+        self.request = request
+        self.name = name
+        self.started = perf_counter()
+        self.output: tuple[bool, tuple|str]|None = None
+
+    def elapsed(self) -> float:
+        return perf_counter() - self.started
+
+    def result(self) -> tuple[bool, tuple|str]|None:
+        if self.output is None:
+            self.output = self.worker.receive(self.request)
+
+        return self.output
+
+    def cancel(self):
+        self.worker.stop()
+
+def strip_output(output: tuple[bool, tuple|str]) -> tuple[bool, tuple|str]:
+    '''
+    The result of `solve` without the graph it built: planner solves never build one
+    '''
+    successful, payload = output
+
+    return (True, payload[:4]) if successful else output
+
+def solve(grid: MazeGrid, solver: Callable, stats: SearchStats|None,
+          send_explored: Callable|None = None) -> tuple[bool, tuple|str]:
+    '''
+    Runs `solver`, handing the explored cells to `send_explored` in batches if given. Returns (successful,
+    (explored_count, final_path, solve_time, stats, built graph or None)|error message), with the final path by its
+    corridors
+    '''
+    built_graph = grid.graph_cache is None
+
+    try:
+        if isgeneratorfunction(solver):
+            stream = solver(maze=grid, stats=stats, corridors=True)
+            explored_count = 0
+            while True:
+                try:
+                    batch = next(stream)
+                except StopIteration as done:
+                    final_path, solve_time = done.value
+                    break
+
+                explored_count += len(batch)
+                if send_explored:
+                    send_explored(batch)
+        else:
+            explored, final_path, solve_time = solver(maze=grid, stats=stats, corridors=True)
+            explored_count = len(explored)
+            if send_explored:
+                for i in range(0, explored_count, STREAM_BATCH):
+                    send_explored(explored[i:i + STREAM_BATCH])
+    except Exception as solve_exception:
+        return False, str(solve_exception)
+
+    return True, (explored_count, final_path, solve_time, stats, grid.graph_cache if built_graph else None)
+
+def run_worker(grid: MazeGrid, solver: Callable, stats: SearchStats|None, stream: bool,
+               results: multiprocessing.Queue):
+    # A forked worker inherits SDL's handler, which turns SIGTERM into a quit event instead of stopping the process,
+    # and multiprocessing terminates workers still running when the program exits
+    signal.signal(signal.SIGTERM, signal.SIG_DFL)
+
+    send_explored = (lambda batch: results.put(("explored", batch))) if stream else None
+    results.put(("result", solve(grid, solver, stats, send_explored)))
+
+def run_planner(grid: MazeGrid, use_heuristic: bool, requests: multiprocessing.Queue, results: multiprocessing.Queue):
+    '''
+    Worker loop of a `PlannerWorker`: applies each request's changes to its copy of the grid and solves with the
+    planner, until it is killed
+    '''
+    signal.signal(signal.SIGTERM, signal.SIG_DFL) # see `run_worker`
+
+    planner = IncrementalPlanner(grid, use_heuristic)
+
+    while True:
+        number, start_coord, end_coord, changed, stats = requests.get()
+
+        for cell, code in changed:
+            grid.set_cell(*grid.coord(cell), code)
+        grid.start_coord, grid.end_coord = start_coord, end_coord
+
+        results.put((number, solve(grid, planner.solve, stats)))